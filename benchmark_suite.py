@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Suite benchmark yang dapat direproduksi untuk membangun indeks dan latensi query.
+
+Untuk setiap kombinasi bahasa, ukuran korpus, dan set opsi, suite ini membuat
+korpus sintetis (CSV) lalu mengukur di proses Python terpisah:
+- waktu memuat dataset, throughput preprocessing, dan waktu vektorisasi
+- waktu membangun indeks dan ukuran indeks per model (bow, tfidf, bm25)
+- latensi satu query (p50/p95/p99) dan throughput batch melalui `search_documents`
+- puncak memori proses (RSS) dan memori yang ditahan cache
+
+Hasil ditulis sebagai JSON dan dapat dibandingkan dengan hasil sebelumnya:
+
+    python benchmark_suite.py --sizes 1000 10000 --output hasil.json
+    python benchmark_suite.py --sizes 1000 10000 --baseline hasil.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Kosakata sintetis per bahasa (termasuk stopwords agar preprocessing bekerja seperti pada teks nyata)
+CORPUS_WORDS = {
+    'id': [
+        'yang', 'dan', 'di', 'ke', 'dari', 'untuk', 'dengan', 'pada', 'adalah', 'ini', 'itu', 'akan',
+        'teknologi', 'kecerdasan', 'buatan', 'mesin', 'pembelajaran', 'data', 'bisnis', 'analisis',
+        'prediksi', 'akurat', 'bahasa', 'pemrograman', 'jaringan', 'saraf', 'komputer', 'manusia',
+        'informasi', 'sistem', 'pencarian', 'dokumen', 'pemerintah', 'ekonomi', 'pasar', 'harga',
+        'masyarakat', 'pendidikan', 'kesehatan', 'layanan', 'transportasi', 'pengemudi', 'aplikasi',
+        'pengguna', 'pembayaran', 'digital', 'kebijakan', 'pemilihan', 'politik', 'partai', 'berita'
+    ],
+    'en': [
+        'the', 'and', 'of', 'to', 'in', 'for', 'with', 'on', 'is', 'this', 'that', 'will',
+        'technology', 'intelligence', 'artificial', 'machine', 'learning', 'data', 'business', 'analysis',
+        'prediction', 'accurate', 'language', 'programming', 'network', 'neural', 'computer', 'human',
+        'information', 'system', 'search', 'document', 'government', 'economy', 'market', 'price',
+        'society', 'education', 'health', 'service', 'transport', 'driver', 'application',
+        'user', 'payment', 'digital', 'policy', 'election', 'politics', 'party', 'news'
+    ]
+}
+
+# Set opsi preprocessing yang dibandingkan (use_spacy=False agar hasil tidak bergantung pada model spaCy)
+OPTION_SETS = {
+    'default': {'use_spacy': False, 'apply_stemming': True, 'tokenizer': 'nltk'},
+    'fast': {'use_spacy': False, 'apply_stemming': True, 'tokenizer': 'fast'},
+    'nostem': {'use_spacy': False, 'apply_stemming': False, 'tokenizer': 'fast'}
+}
+
+MODELS = ('bow', 'tfidf', 'bm25')
+
+# Arah perbandingan metrik terhadap baseline: 'lower' = semakin kecil semakin baik
+METRIC_DIRECTIONS = {
+    'load_seconds': 'lower',
+    'preprocess_docs_per_second': 'higher',
+    'vectorize_seconds': 'lower',
+    'build_seconds': 'lower',
+    'index_bytes': 'lower',
+    'query_p50_ms': 'lower',
+    'query_p95_ms': 'lower',
+    'query_p99_ms': 'lower',
+    'batch_queries_per_second': 'higher',
+    'peak_rss_bytes': 'lower',
+    'cache_bytes': 'lower'
+}
+
+
+# Jumlah dokumen yang dibuat dan ditulis sekaligus (membatasi memori untuk korpus 1M dokumen)
+GENERATE_CHUNK_SIZE = 100000
+
+
+def rare_word_count(n_docs):
+    """
+    Jumlah kata langka di kosakata sintetis, tumbuh sublinear dengan ukuran korpus.
+    """
+    return max(1000, int(20 * n_docs ** 0.6))
+
+
+def generate_corpus(n_docs, language, seed=42, min_words=20, max_words=120, n_rare_words=None):
+    """
+    Membuat dokumen sintetis dengan distribusi kata mirip Zipf: kosakata umum bahasa
+    ditambah kata langka yang jumlahnya tumbuh dengan ukuran korpus.
+    """
+    rng = np.random.default_rng(seed)
+    if n_rare_words is None:
+        n_rare_words = rare_word_count(n_docs)
+    prefix = 'kata' if language == 'id' else 'word'
+    vocabulary = np.array(CORPUS_WORDS[language] + [f"{prefix}{i}" for i in range(n_rare_words)])
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1) ** 1.05
+    weights /= weights.sum()
+
+    lengths = rng.integers(min_words, max_words + 1, size=n_docs)
+    words = vocabulary[rng.choice(len(vocabulary), size=int(lengths.sum()), p=weights)]
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return [' '.join(words[offsets[i]:offsets[i + 1]]) for i in range(n_docs)]
+
+
+def generate_queries(language, n_queries, seed=7):
+    """
+    Membuat query sintetis dari 1-4 kata umum (tanpa stopwords) dengan seed tetap.
+    """
+    rng = np.random.default_rng(seed)
+    content_words = CORPUS_WORDS[language][12:]
+    return [
+        ' '.join(rng.choice(content_words, size=rng.integers(1, 5), replace=False))
+        for _ in range(n_queries)
+    ]
+
+
+def write_corpus(filepath, n_docs, language, seed=42):
+    """
+    Menulis korpus sintetis ke CSV dengan kolom 'title' dan 'content', per potongan
+    `GENERATE_CHUNK_SIZE` dokumen.
+    """
+    import pandas as pd
+
+    for start in range(0, n_docs, GENERATE_CHUNK_SIZE):
+        count = min(GENERATE_CHUNK_SIZE, n_docs - start)
+        documents = generate_corpus(count, language, seed=seed + start, n_rare_words=rare_word_count(n_docs))
+        pd.DataFrame({
+            'title': [f"Dokumen {i}" for i in range(start, start + count)],
+            'content': documents
+        }).to_csv(filepath, index=False, mode='w' if start == 0 else 'a', header=start == 0)
+
+
+def _percentile_ms(timings, q):
+    return float(np.percentile(timings, q) * 1000)
+
+
+def run_case(filepath, language, options, n_queries=200, batch_size=50):
+    """
+    Menjalankan satu kasus benchmark di proses saat ini dan mengembalikan daftar
+    record (satu per model). Dipanggil di proses terpisah oleh `run_suite`.
+    """
+    import resource
+    from ir_system import load_corpus, load_dataset, load_index, search_documents, search_documents_batch
+    from ir_logic.caching import cache, estimate_size, query_cache
+    from ir_logic.vectorization import vectorize_bow
+
+    search_options = {'language': language, 'use_spacy': options['use_spacy'],
+                      'apply_stemming': options['apply_stemming'], 'tokenizer': options['tokenizer']}
+
+    start = time.perf_counter()
+    df = load_dataset(filepath)
+    load_seconds = time.perf_counter() - start
+    n_docs = len(df)
+
+    start = time.perf_counter()
+    corpus = load_corpus(filepath, 'content', with_counts=False, n_jobs=1, **search_options)
+    preprocess_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    corpus['counts'] = vectorize_bow(corpus['processed_text'], fast_tokenizer=options['tokenizer'] == 'fast')
+    vectorize_seconds = time.perf_counter() - start
+
+    queries = generate_queries(language, n_queries)
+    records = []
+    for model_type in MODELS:
+        start = time.perf_counter()
+        _, index = load_index(filepath, 'content', model_type, index_dir=None, **search_options)
+        build_seconds = time.perf_counter() - start
+
+        # Latensi satu query tanpa cache hasil query
+        timings = []
+        for query in queries:
+            query_cache.clear()
+            start = time.perf_counter()
+            search_documents(filepath, query, 'content', model_type, index_dir=None, **search_options)
+            timings.append(time.perf_counter() - start)
+
+        query_cache.clear()
+        start = time.perf_counter()
+        for i in range(0, len(queries), batch_size):
+            search_documents_batch(filepath, queries[i:i + batch_size], 'content', model_type, index_dir=None, **search_options)
+        batch_seconds = time.perf_counter() - start
+
+        records.append({
+            'model_type': model_type,
+            'n_docs': n_docs,
+            'n_terms': int(index.n_terms),
+            'load_seconds': load_seconds,
+            'preprocess_docs_per_second': n_docs / preprocess_seconds,
+            'vectorize_seconds': vectorize_seconds,
+            'build_seconds': build_seconds,
+            'index_bytes': estimate_size(index),
+            'query_p50_ms': _percentile_ms(timings, 50),
+            'query_p95_ms': _percentile_ms(timings, 95),
+            'query_p99_ms': _percentile_ms(timings, 99),
+            'batch_queries_per_second': len(queries) / batch_seconds
+        })
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    for record in records:
+        record['peak_rss_bytes'] = peak_rss
+        record['cache_bytes'] = cache.stats()['current_bytes']
+    return records
+
+
+def run_suite(sizes, languages, option_names, n_queries=200, work_dir=None):
+    """
+    Menjalankan seluruh kombinasi (bahasa x ukuran x set opsi), masing-masing di
+    proses Python baru agar waktu dan puncak memori tidak saling memengaruhi.
+    """
+    # Anggaran cache besar agar indeks korpus besar tidak dibuang di tengah pengukuran
+    env = dict(os.environ)
+    env.setdefault('IR_CACHE_MAX_BYTES', str(1 << 40))
+    results = []
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp_dir:
+        for language in languages:
+            for n_docs in sizes:
+                filepath = os.path.join(tmp_dir, f"corpus_{language}_{n_docs}.csv")
+                start = time.perf_counter()
+                write_corpus(filepath, n_docs, language)
+                print(f"[{language} {n_docs:>8d}] korpus dibuat dalam {time.perf_counter() - start:.1f} s "
+                      f"({os.path.getsize(filepath) / 2**20:.1f} MiB)", file=sys.stderr)
+
+                for option_name in option_names:
+                    case = {'filepath': filepath, 'language': language,
+                            'options': OPTION_SETS[option_name], 'n_queries': n_queries}
+                    output = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), '--run-case', json.dumps(case)],
+                        capture_output=True, text=True, check=True, env=env,
+                        cwd=os.path.dirname(os.path.abspath(__file__))
+                    )
+                    for record in json.loads(output.stdout.strip().splitlines()[-1]):
+                        record.update({'language': language, 'size': n_docs, 'options': option_name})
+                        results.append(record)
+                        print(f"[{language} {n_docs:>8d} {option_name:8s} {record['model_type']:5s}] "
+                              f"preprocessing {record['preprocess_docs_per_second']:9.0f} dok/s, "
+                              f"p50 {record['query_p50_ms']:7.2f} ms, p99 {record['query_p99_ms']:7.2f} ms, "
+                              f"indeks {record['index_bytes'] / 2**20:7.1f} MiB", file=sys.stderr)
+                os.remove(filepath)
+    return results
+
+
+def _record_key(record):
+    return record['language'], record['size'], record['options'], record['model_type']
+
+
+def compare_with_baseline(results, baseline, threshold=0.1):
+    """
+    Membandingkan hasil dengan baseline dan mengembalikan daftar perubahan metrik
+    yang lebih buruk dari `threshold` (rasio relatif, misalnya 0.1 = 10%).
+    """
+    baseline_records = {_record_key(record): record for record in baseline['results']}
+    regressions = []
+    for record in results:
+        reference = baseline_records.get(_record_key(record))
+        if reference is None:
+            continue
+        for metric, direction in METRIC_DIRECTIONS.items():
+            before, after = reference.get(metric), record.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = change > threshold if direction == 'lower' else change < -threshold
+            print(f"{'/'.join(map(str, _record_key(record))):32s} {metric:28s} {before:14.4g} -> {after:14.4g} "
+                  f"({change:+7.1%}){'  REGRESI' if worse else ''}")
+            if worse:
+                regressions.append({'case': _record_key(record), 'metric': metric, 'baseline': before,
+                                    'current': after, 'change': change})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite benchmark sistem IR")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help="Ukuran korpus (jumlah dokumen), misalnya 1000 10000 100000 1000000")
+    parser.add_argument('--languages', nargs='+', default=['id', 'en'], choices=sorted(CORPUS_WORDS))
+    parser.add_argument('--options', nargs='+', default=list(OPTION_SETS), choices=list(OPTION_SETS))
+    parser.add_argument('--queries', type=int, default=200, help="Jumlah query per kasus")
+    parser.add_argument('--output', default='benchmark_results.json', help="File JSON hasil benchmark")
+    parser.add_argument('--baseline', help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument('--threshold', type=float, default=0.1, help="Ambang regresi relatif (default 0.1 = 10%%)")
+    parser.add_argument('--work-dir', help="Direktori untuk korpus sementara")
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        case = json.loads(args.run_case)
+        print(json.dumps(run_case(case['filepath'], case['language'], case['options'], case['n_queries'])))
+        return 0
+
+    results = run_suite(args.sizes, args.languages, args.options, n_queries=args.queries, work_dir=args.work_dir)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {'python': platform.python_version(), 'platform': platform.platform(),
+                        'cpu_count': os.cpu_count()},
+        'results': results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Hasil disimpan ke {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, threshold=args.threshold)
+        print(f"{len(regressions)} regresi di atas ambang {args.threshold:.0%}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
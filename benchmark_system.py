@@ -0,0 +1,622 @@
+#!/usr/bin/env python3
+"""
+Script benchmark untuk mengukur performa komponen sistem IR.
+"""
+
+import random
+import statistics
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+SAMPLE_WORDS = [
+    'teknologi', 'kecerdasan', 'buatan', 'mesin', 'belajar', 'data', 'bisnis',
+    'analisis', 'prediksi', 'akurat', 'bahasa', 'pemrograman', 'jaringan', 'saraf',
+    'komputer', 'visi', 'manusia', 'informasi', 'sistem', 'pencarian', 'dokumen',
+    'machine', 'learning', 'science', 'python', 'network', 'model', 'statistic'
+]
+
+
+def generate_documents(n_docs, min_words=5, max_words=40, seed=42):
+    """
+    Membuat dokumen sintetis dari kosakata sampel untuk keperluan benchmark.
+    """
+    rng = random.Random(seed)
+    # Tambahkan kata-kata langka agar kosakata menyerupai korpus nyata
+    vocabulary = SAMPLE_WORDS + [f"kata{i}" for i in range(2000)]
+    weights = [50] * len(SAMPLE_WORDS) + [1] * 2000
+    return [
+        ' '.join(rng.choices(vocabulary, weights=weights, k=rng.randint(min_words, max_words)))
+        for _ in range(n_docs)
+    ]
+
+
+def generate_long_tail_documents(n_docs, seed=42):
+    """
+    Membuat dokumen sintetis dengan kata langka sebanyak jumlah dokumen, agar kosakata
+    tumbuh seperti korpus nyata (salah ketik, ID, nama).
+    """
+    rng = random.Random(seed)
+    return [
+        doc + ' ' + ' '.join(f"istilah{rng.randrange(n_docs)}" for _ in range(3))
+        for doc in generate_documents(n_docs, min_words=20, max_words=80, seed=seed)
+    ]
+
+
+def _measure_allocation(func, n_runs):
+    """
+    Menjalankan `func` sebanyak `n_runs` kali dan mengembalikan
+    (puncak alokasi rata-rata dalam byte, waktu rata-rata dalam detik).
+    """
+    peaks = []
+    start = time.perf_counter()
+    for _ in range(n_runs):
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    elapsed = (time.perf_counter() - start) / n_runs
+    return float(np.mean(peaks)), elapsed
+
+
+def benchmark_query_allocation(n_docs=50000, n_runs=20):
+    """
+    Membandingkan alokasi memori per query antara cosine similarity brute-force
+    di atas matriks mentah dan ScoringIndex yang matriksnya sudah ter-normalisasi.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+    from ir_logic.vectorization import vectorize_bow, vectorize_tfidf
+    from ir_logic.indexing import ScoringIndex
+
+    print(f"=== Benchmark Alokasi per Query ({n_docs} dokumen) ===")
+    documents = generate_documents(n_docs)
+    query = 'analisis data bisnis'
+
+    for name, vectorize in (('bow', vectorize_bow), ('tfidf', vectorize_tfidf)):
+        vectorizer, doc_matrix = vectorize(documents)
+        index = ScoringIndex(vectorizer, doc_matrix)
+
+        def brute_force():
+            query_vector = vectorizer.transform([query])
+            similarities = cosine_similarity(query_vector, doc_matrix).flatten()
+            similarities.argsort()[-10:][::-1]
+
+        def scoring_index():
+            query_vector = index.transform(query)
+            doc_indices, scores = index.score(query_vector)
+            np.argsort(-scores, kind='stable')[:10]
+
+        before_bytes, before_time = _measure_allocation(brute_force, n_runs)
+        after_bytes, after_time = _measure_allocation(scoring_index, n_runs)
+        print(f"[{name}] brute-force : {before_bytes / 1024:10.1f} KiB/query, {before_time * 1000:8.2f} ms/query")
+        print(f"[{name}] ScoringIndex: {after_bytes / 1024:10.1f} KiB/query, {after_time * 1000:8.2f} ms/query")
+
+
+def benchmark_models(n_docs=50000, n_queries=200, seed=7):
+    """
+    Membandingkan model BoW, TF-IDF, BM25, dan hashing pada matriks BoW yang sama: waktu
+    membangun indeks, latensi per query, dan throughput query batch.
+    """
+    from ir_logic.vectorization import MODEL_TYPES, build_scoring_index, vectorize_bow
+
+    print(f"=== Benchmark Model ({n_docs} dokumen, {n_queries} query) ===")
+    documents = generate_documents(n_docs)
+    counts = vectorize_bow(documents)
+    rng = random.Random(seed)
+    queries = [' '.join(rng.sample(SAMPLE_WORDS, 3)) for _ in range(n_queries)]
+
+    for model_type in MODEL_TYPES:
+        start = time.perf_counter()
+        index = build_scoring_index(documents, model_type, counts=counts)
+        build_time = time.perf_counter() - start
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            doc_indices, scores = index.score(index.transform(query))
+            np.argsort(-scores, kind='stable')[:10]
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        index.score_many(index.transform_many(queries))
+        batch_time = time.perf_counter() - start
+        print(f"[{model_type:7s}] bangun {build_time * 1000:8.1f} ms, query median {statistics.median(timings) * 1000:6.2f} ms, "
+              f"batch {n_queries / batch_time:8.0f} query/detik")
+
+
+def benchmark_index_memory(n_docs=100000, n_queries=200, n_extra_columns=8, seed=11):
+    """
+    Membandingkan memori cache per 1 juta dokumen sebelum dan sesudah tata letak
+    ringkas: DataFrame semua kolom vs kolom tampilan saja, matriks BoW int64 vs int32,
+    dan indeks penuh (float64, matriks dokumen + posting, kosakata dict) vs
+    `compact_index` (float32, posting saja, kosakata terurut). Latensi query kedua
+    indeks juga dibandingkan.
+    """
+    import pandas as pd
+    from ir_logic.caching import estimate_size
+    from ir_logic.display import TITLE_COLUMN
+    from ir_logic.vectorization import VOCABULARY_MODEL_TYPES, build_scoring_index, compact_index, vectorize_bow
+
+    print(f"=== Benchmark Memori Indeks ({n_docs} dokumen, {n_extra_columns + 2} kolom) ===")
+    documents = generate_long_tail_documents(n_docs, seed=seed)
+    scale = 1e6 / n_docs / 2 ** 20
+
+    def report(name, before, after):
+        print(f"{name:22s}: {before * scale:9.1f} MiB -> {after * scale:9.1f} MiB per 1 juta dokumen "
+              f"({after / before:.0%})")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, 'dataset.csv')
+        frame = pd.DataFrame({TITLE_COLUMN: [f"Judul dokumen {i}" for i in range(n_docs)], 'content': documents})
+        for column in range(n_extra_columns):
+            frame[f'kolom_{column}'] = [f"nilai {column}-{i}" for i in range(n_docs)]
+        frame.to_csv(filepath, index=False)
+        del frame
+        report('DataFrame dataset', estimate_size(pd.read_csv(filepath)),
+               estimate_size(pd.read_csv(filepath, usecols=[TITLE_COLUMN, 'content'])))
+
+    counts = vectorize_bow(documents)
+    wide_counts = (counts[0], counts[1].astype(np.int64))
+    print(f"Kosakata: {len(counts[0].vocabulary_)} term")
+    report('Matriks BoW', estimate_size(wide_counts[1]), estimate_size(counts[1]))
+
+    rng = random.Random(seed)
+    queries = [' '.join(rng.sample(SAMPLE_WORDS, 2) + [f"istilah{rng.randrange(n_docs)}"]) for _ in range(n_queries)]
+    for model_type in VOCABULARY_MODEL_TYPES:
+        full = build_scoring_index(documents, model_type, counts=wide_counts)
+        compact = compact_index(full)
+        report(f'Indeks {model_type}', estimate_size(full), estimate_size(compact))
+        report(f'  kosakata {model_type}', estimate_size(full.vectorizer), estimate_size(compact.vectorizer))
+
+        latencies = []
+        for index in (full, compact):
+            timings = []
+            for query in queries:
+                start = time.perf_counter()
+                index.score(index.transform(query))
+                timings.append(time.perf_counter() - start)
+            latencies.append(statistics.median(timings) * 1000)
+        print(f"  query median: penuh {latencies[0]:.2f} ms, ringkas {latencies[1]:.2f} ms")
+
+
+def benchmark_vocabulary_pruning(n_docs=100000, n_queries=200, model_type='tfidf', top_k=10, seed=13, settings=None):
+    """
+    Membandingkan pengaturan pemangkasan kosakata (min_df, max_df, max_features):
+    ukuran kosakata, nnz, memori indeks ringkas, latensi query, dan recall@k
+    terhadap indeks tanpa pemangkasan.
+    """
+    from ir_logic.caching import estimate_size
+    from ir_logic.indexing import select_top_k
+    from ir_logic.vectorization import build_scoring_index, compact_index, vectorize_bow
+
+    settings = settings or [
+        {}, {'min_df': 2}, {'min_df': 5}, {'max_df': 0.5}, {'min_df': 2, 'max_df': 0.5},
+        {'max_features': 10000}, {'max_features': 1000}
+    ]
+    print(f"=== Benchmark Pemangkasan Kosakata ({n_docs} dokumen, {n_queries} query, model '{model_type}') ===")
+    documents = generate_long_tail_documents(n_docs, seed=seed)
+    counts = vectorize_bow(documents)
+    rng = random.Random(seed)
+    queries = [' '.join(rng.sample(SAMPLE_WORDS, 2) + [f"istilah{rng.randrange(n_docs)}"]) for _ in range(n_queries)]
+
+    baseline = None
+    for pruning in settings:
+        index = compact_index(build_scoring_index(documents, model_type, counts=counts, **pruning))
+        top_docs, timings = [], []
+        for query in queries:
+            start = time.perf_counter()
+            doc_indices, _ = select_top_k(*index.score(index.transform(query)), top_k=top_k, min_score=0.0)
+            timings.append(time.perf_counter() - start)
+            top_docs.append(set(doc_indices.tolist()))
+        if baseline is None:
+            baseline = top_docs
+        recall = statistics.mean(len(top & base) / len(base) for top, base in zip(top_docs, baseline) if base)
+        label = ', '.join(f"{name}={value}" for name, value in pruning.items()) or 'tanpa pemangkasan'
+        print(f"{label:28s}: {index.n_terms:8d} term, nnz {index.nnz:10d}, {estimate_size(index) / 2 ** 20:7.1f} MiB, "
+              f"query median {statistics.median(timings) * 1000:5.2f} ms, recall@{top_k} {recall:.3f}")
+
+
+def benchmark_hashing(n_docs=100000, n_queries=200, batch_size=1000, n_batches=10, top_k=10, seed=17,
+                      bucket_counts=(2 ** 16, 2 ** 18, 2 ** 20), job_counts=None):
+    """
+    Membandingkan model 'hashing' dengan TF-IDF berbasis kosakata: waktu membangun
+    indeks (serial dan paralel), memori indeks dan statistik per term, waktu
+    menambahkan dokumen baru, latensi query, dan irisan top-k dengan TF-IDF.
+
+    Irisan top-k tidak hanya dipengaruhi tabrakan hash: hashing memberi bobot IDF
+    pada query saja (lnc.ltc), sedangkan TF-IDF juga pada dokumen.
+    """
+    from ir_logic.caching import estimate_size
+    from ir_logic.hashing import HashingIndex
+    from ir_logic.incremental import IncrementalIndex
+    from ir_logic.indexing import select_top_k
+    from ir_logic.preprocessing import DEFAULT_N_JOBS
+    from ir_logic.vectorization import build_scoring_index, compact_index, vectorize_bow
+
+    if job_counts is None:
+        job_counts = sorted({1, 2, 4, DEFAULT_N_JOBS})
+    print(f"=== Benchmark Hashing ({n_docs} dokumen, {n_queries} query, {DEFAULT_N_JOBS} core) ===")
+    documents = generate_long_tail_documents(n_docs + batch_size * n_batches, seed=seed)
+    documents, new_documents = documents[:n_docs], documents[n_docs:]
+    batches = [new_documents[i:i + batch_size] for i in range(0, len(new_documents), batch_size)]
+    rng = random.Random(seed)
+    queries = [' '.join(rng.sample(SAMPLE_WORDS, 2) + [f"istilah{rng.randrange(n_docs)}"]) for _ in range(n_queries)]
+
+    def evaluate(index):
+        top_docs, timings = [], []
+        for query in queries:
+            start = time.perf_counter()
+            doc_indices, _ = select_top_k(*index.score(index.transform(query)), top_k=top_k, min_score=0.0)
+            timings.append(time.perf_counter() - start)
+            top_docs.append(set(doc_indices.tolist()))
+        return top_docs, statistics.median(timings) * 1000
+
+    start = time.perf_counter()
+    counts = vectorize_bow(documents)
+    tfidf = compact_index(build_scoring_index(documents, 'tfidf', counts=counts))
+    build_time = time.perf_counter() - start
+    baseline, latency = evaluate(tfidf)
+    incremental = IncrementalIndex(*counts, 'tfidf')
+    start = time.perf_counter()
+    for batch in batches:
+        incremental.append(batch)
+    append_time = (time.perf_counter() - start) / len(batches)
+    print(f"{'tfidf (kosakata)':24s}: bangun {build_time:6.2f} s, {estimate_size(tfidf) / 2 ** 20:7.1f} MiB "
+          f"(kosakata {estimate_size(tfidf.vectorizer) / 2 ** 20:5.1f} MiB), append {append_time * 1000:7.1f} ms/batch, "
+          f"query median {latency:5.2f} ms")
+
+    for n_buckets in bucket_counts:
+        for n_jobs in job_counts:
+            start = time.perf_counter()
+            index = HashingIndex.from_documents(documents, n_buckets=n_buckets, n_jobs=n_jobs)
+            build_time = time.perf_counter() - start
+            if n_jobs == job_counts[0]:
+                top_docs, latency = evaluate(index)
+                recall = statistics.mean(len(top & base) / len(base) for top, base in zip(top_docs, baseline) if base)
+                start = time.perf_counter()
+                for batch in batches:
+                    index.append(batch)
+                append_time = (time.perf_counter() - start) / len(batches)
+                print(f"{f'hashing {n_buckets}':24s}: bangun {build_time:6.2f} s, {estimate_size(index) / 2 ** 20:7.1f} MiB "
+                      f"(df {index.doc_freq.nbytes / 2 ** 20:5.1f} MiB), append {append_time * 1000:7.1f} ms/batch, "
+                      f"query median {latency:5.2f} ms, irisan top-{top_k} {recall:.3f}")
+            else:
+                print(f"{f'  n_jobs={n_jobs}':24s}: bangun {build_time:6.2f} s")
+
+
+def benchmark_sharding(n_docs=200000, n_queries=200, model_type='tfidf', top_k=10, seed=19, shard_counts=(1, 2, 4, 8)):
+    """
+    Mengukur latensi query (median dan p95) dan throughput batch untuk berbagai
+    jumlah shard (lihat `ShardedIndex`). Shard dinilai oleh thread pool bersama
+    berukuran `SCORING_THREADS`, sehingga percepatan dibatasi jumlah core.
+    """
+    from ir_logic.indexing import SCORING_THREADS, ShardedIndex, select_top_k
+    from ir_logic.vectorization import build_scoring_index, compact_index, vectorize_bow
+
+    print(f"=== Benchmark Sharding ({n_docs} dokumen, {n_queries} query, model '{model_type}', "
+          f"{SCORING_THREADS} thread) ===")
+    documents = generate_documents(n_docs)
+    index = compact_index(build_scoring_index(documents, model_type, counts=vectorize_bow(documents)))
+    rng = random.Random(seed)
+    queries = [' '.join(rng.sample(SAMPLE_WORDS, 3)) for _ in range(n_queries)]
+
+    for n_shards in shard_counts:
+        sharded = ShardedIndex(index, n_shards) if n_shards > 1 else index
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            query_vector = sharded.transform(query)
+            if n_shards > 1:
+                doc_indices, scores, _ = sharded.score_top_k(query_vector, top_k=top_k)
+            else:
+                doc_indices, scores = sharded.score(query_vector)
+            select_top_k(doc_indices, scores, top_k=top_k)
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        sharded.score_many(sharded.transform_many(queries))
+        batch_time = time.perf_counter() - start
+        timings.sort()
+        print(f"{n_shards:3d} shard: query median {statistics.median(timings) * 1000:6.2f} ms, "
+              f"p95 {timings[int(len(timings) * 0.95)] * 1000:6.2f} ms, batch {n_queries / batch_time:8.0f} query/detik")
+
+
+def benchmark_preprocessing_scaling(n_docs=20000, language='id', job_counts=None):
+    """
+    Mengukur throughput preprocessing korpus (dokumen/detik) untuk berbagai jumlah worker.
+    """
+    from ir_logic.preprocessing import preprocess_corpus, DEFAULT_N_JOBS
+
+    if job_counts is None:
+        job_counts = sorted({1, 2, 4, 8, 16, 32, DEFAULT_N_JOBS} & set(range(1, DEFAULT_N_JOBS + 1)))
+
+    print(f"=== Benchmark Skalabilitas Preprocessing ({n_docs} dokumen, {DEFAULT_N_JOBS} core) ===")
+    documents = generate_documents(n_docs)
+    baseline = None
+    for n_jobs in job_counts:
+        start = time.perf_counter()
+        preprocess_corpus(documents, language=language, use_spacy=False, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"n_jobs={n_jobs:3d}: {n_docs / elapsed:10.0f} dok/detik, speedup {baseline / elapsed:5.2f}x")
+
+
+def benchmark_lemmatization(n_docs=5000, language='en', batch_size=256, n_process=1):
+    """
+    Membandingkan throughput lemmatization per dokumen (`preprocess_text`) dengan
+    lemmatization batch via `nlp.pipe` (`preprocess_corpus`).
+    """
+    from ir_logic.preprocessing import preprocess_text, preprocess_corpus, get_nlp
+
+    nlp = get_nlp(language)
+    print(f"=== Benchmark Lemmatization ({n_docs} dokumen, bahasa '{language}') ===")
+    print(f"Pipeline spaCy: {nlp.pipe_names if nlp is not None else 'tidak tersedia'}")
+    documents = generate_documents(n_docs)
+
+    start = time.perf_counter()
+    per_document = [preprocess_text(doc, language=language, apply_lemmatization=True) for doc in documents]
+    per_document_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batched = preprocess_corpus(documents, language=language, apply_lemmatization=True, n_jobs=1,
+                                spacy_batch_size=batch_size, spacy_n_process=n_process)
+    batched_time = time.perf_counter() - start
+
+    print(f"per dokumen : {n_docs / per_document_time:10.0f} dok/detik")
+    print(f"nlp.pipe    : {n_docs / batched_time:10.0f} dok/detik (batch_size={batch_size}, n_process={n_process})")
+    print(f"Hasil identik: {per_document == batched}")
+
+
+def benchmark_preprocessor(n_docs=20000, language='id'):
+    """
+    Mengukur biaya preprocessing per dokumen: jalur detail (semua tahap disimpan)
+    dibandingkan jalur cepat `Preprocessor.process` dan `process_many`.
+    """
+    from ir_logic.preprocessing import Preprocessor
+
+    print(f"=== Benchmark Preprocessor ({n_docs} dokumen, bahasa '{language}') ===")
+    documents = generate_documents(n_docs)
+    preprocessor = Preprocessor(language=language, use_spacy=False)
+    preprocessor.process(documents[0])  # Muat stopwords, stemmer, dan tokenizer terlebih dahulu
+
+    runs = (
+        ('detail', lambda: [preprocessor.process(doc, return_details=True) for doc in documents]),
+        ('process', lambda: [preprocessor.process(doc) for doc in documents]),
+        ('process_many', lambda: list(preprocessor.process_many(documents)))
+    )
+    for name, run in runs:
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{name:12s}: {elapsed / n_docs * 1e6:8.1f} us/dokumen")
+
+
+def benchmark_tokenizers(n_docs=50000, language='id'):
+    """
+    Membandingkan throughput tokenizer NLTK dan tokenizer cepat, baik untuk tahap
+    tokenisasi saja, preprocessing lengkap, maupun vektorisasi BoW.
+    """
+    from ir_logic.preprocessing import Preprocessor, nltk_tokenize, fast_tokenize
+    from ir_logic.vectorization import vectorize_bow
+
+    print(f"=== Benchmark Tokenizer ({n_docs} dokumen, bahasa '{language}') ===")
+    documents = generate_documents(n_docs)
+    nltk_tokenize(documents[0])  # Muat NLTK terlebih dahulu
+
+    def throughput(func):
+        start = time.perf_counter()
+        result = func()
+        return n_docs / (time.perf_counter() - start), result
+
+    for name, tokenize in (('nltk', nltk_tokenize), ('fast', fast_tokenize)):
+        rate, _ = throughput(lambda: [tokenize(doc) for doc in documents])
+        print(f"tokenisasi    [{name}]: {rate:12.0f} dok/detik")
+
+    outputs = {}
+    for name in ('nltk', 'fast'):
+        preprocessor = Preprocessor(language=language, use_spacy=False, tokenizer=name)
+        rate, outputs[name] = throughput(lambda: list(preprocessor.process_many(documents)))
+        print(f"preprocessing [{name}]: {rate:12.0f} dok/detik")
+    print(f"Hasil identik: {outputs['nltk'] == outputs['fast']}")
+
+    for name, fast_tokenizer in (('default', False), ('fast', True)):
+        rate, _ = throughput(lambda: vectorize_bow(outputs['fast'], fast_tokenizer=fast_tokenizer))
+        print(f"vectorize_bow [{name}]: {rate:12.0f} dok/detik")
+
+
+def benchmark_streaming_ingestion(n_docs=100000, chunk_size=10000, words_per_doc=(50, 200)):
+    """
+    Membandingkan waktu dan puncak memori proses (RSS) antara pemuatan penuh
+    (`load_corpus`) dan ingestion streaming per potongan untuk dataset CSV.
+    Setiap mode dijalankan di proses Python baru agar puncak memori terpisah.
+    """
+    import pandas as pd
+
+    print(f"=== Benchmark Ingestion Streaming ({n_docs} dokumen, chunk {chunk_size}) ===")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, 'dataset.csv')
+        documents = generate_documents(n_docs, *words_per_doc)
+        pd.DataFrame({
+            'title': [f"Dokumen {i}" for i in range(n_docs)],
+            'content': documents,
+            'extra': documents
+        }).to_csv(filepath, index=False)
+        del documents
+        print(f"Ukuran file: {os.path.getsize(filepath) / 2**20:.1f} MiB")
+
+        for streaming in (False, True):
+            code = (
+                "import resource, time\n"
+                "from ir_system import load_corpus\n"
+                "from ir_logic.caching import cache\n"
+                "start = time.perf_counter()\n"
+                f"load_corpus({filepath!r}, 'content', language='id', use_spacy=False, n_jobs=1, tokenizer='fast', "
+                f"streaming={streaming}, chunk_size={chunk_size})\n"
+                "peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024\n"
+                "print(time.perf_counter() - start, peak, cache.stats()['current_bytes'])\n"
+            )
+            output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+            elapsed, peak, retained = map(float, output.stdout.strip().splitlines()[-1].split())
+            print(f"{'streaming' if streaming else 'penuh':9s}: {elapsed:7.2f} s, puncak RSS {peak / 2**20:8.1f} MiB, "
+                  f"ditahan cache {retained / 2**20:8.1f} MiB")
+
+
+def benchmark_live_updates(n_docs=100000, batch_size=100, n_batches=20, model_type='tfidf'):
+    """
+    Mengukur latensi pembaruan indeks live (baris ditambahkan ke file CSV) dan latensi
+    query setelah setiap pembaruan, dibandingkan dengan membangun ulang seluruh indeks.
+    """
+    import pandas as pd
+    from ir_system import load_live_index, update_index, search_documents
+
+    print(f"=== Benchmark Indeks Live ({n_docs} dokumen, +{batch_size} baris x {n_batches}, model '{model_type}') ===")
+    options = {'language': 'id', 'use_spacy': False, 'tokenizer': 'fast'}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, 'dataset.csv')
+        documents = generate_documents(n_docs + batch_size * n_batches)
+        data = pd.DataFrame({'title': [f"Dokumen {i}" for i in range(len(documents))], 'content': documents})
+        data.iloc[:n_docs].to_csv(filepath, index=False)
+
+        start = time.perf_counter()
+        load_live_index(filepath, 'content', model_type, **options)
+        print(f"bangun awal       : {time.perf_counter() - start:8.2f} s")
+
+        update_times, query_times = [], []
+        for batch in range(n_batches):
+            rows = data.iloc[n_docs + batch * batch_size:n_docs + (batch + 1) * batch_size]
+            rows.to_csv(filepath, mode='a', index=False, header=False)
+            start = time.perf_counter()
+            update_index(filepath, 'content', model_type, **options)
+            update_times.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            search_documents(filepath, 'analisis data bisnis', 'content', model_type, index_dir=None, live=True, **options)
+            query_times.append(time.perf_counter() - start)
+
+        for name, timings in (('pembaruan', update_times), ('query', query_times)):
+            print(f"{name:18s}: median {statistics.median(timings) * 1000:8.1f} ms, "
+                  f"maks {max(timings) * 1000:8.1f} ms")
+
+        start = time.perf_counter()
+        search_documents(filepath, 'analisis data bisnis', 'content', model_type, index_dir=None, **options)
+        print(f"bangun ulang penuh: {time.perf_counter() - start:8.2f} s")
+
+
+def benchmark_query_cache(n_docs=50000, n_runs=200, model_type='tfidf'):
+    """
+    Membandingkan latensi `search_documents` untuk query berulang dengan dan tanpa
+    cache hasil query.
+    """
+    import pandas as pd
+    from ir_system import search_documents
+    from ir_logic.caching import query_cache
+
+    print(f"=== Benchmark Cache Hasil Query ({n_docs} dokumen, {n_runs} query, model '{model_type}') ===")
+    options = {'language': 'id', 'use_spacy': False, 'index_dir': None}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = os.path.join(tmp_dir, 'dataset.csv')
+        pd.DataFrame({'content': generate_documents(n_docs)}).to_csv(filepath, index=False)
+        query = 'analisis data bisnis'
+        search_documents(filepath, query, 'content', model_type, **options)
+
+        for name, before in (('tanpa cache', query_cache.clear), ('dengan cache', lambda: None)):
+            timings = []
+            for _ in range(n_runs):
+                before()
+                start = time.perf_counter()
+                search_documents(filepath, query, 'content', model_type, **options)
+                timings.append(time.perf_counter() - start)
+            print(f"{name:12s}: median {statistics.median(timings) * 1e6:10.1f} us/query")
+        print(f"Statistik cache: {query_cache.stats()}")
+
+
+def benchmark_result_formatting(n_docs=100000, top_k=1000, n_extra_columns=20, n_runs=20):
+    """
+    Membandingkan waktu pembentukan `top_k` hasil dari DataFrame lebar: per baris
+    (`df.iloc`), pengambilan kolom sekaligus, dan `DisplayStore` yang sudah disiapkan.
+    """
+    import numpy as np
+    import pandas as pd
+    from ir_logic.display import SNIPPET_LENGTH, DisplayStore
+    from ir_logic.vectorization import format_results
+
+    def format_rows(doc_indices, scores, df, search_column):
+        # Cara lama: satu baris DataFrame per hasil
+        return [
+            {'original_index': int(i), 'title': df.iloc[i].get('title', f"Dokumen {i}"),
+             'snippet': df.iloc[i][search_column][:SNIPPET_LENGTH] + '...', 'score': float(score)}
+            for i, score in zip(doc_indices, scores)
+        ]
+
+    print(f"=== Benchmark Pembentukan Hasil ({n_docs} dokumen, {n_extra_columns + 2} kolom, top_k={top_k}) ===")
+    documents = generate_documents(n_docs, min_words=40, max_words=120)
+    df = pd.DataFrame({'title': [f"Judul {i}" for i in range(n_docs)], 'content': documents})
+    for column in range(n_extra_columns):
+        df[f'extra_{column}'] = np.arange(n_docs) * column
+    start = time.perf_counter()
+    store = DisplayStore.from_frame(df, 'content')
+    print(f"Membangun DisplayStore: {time.perf_counter() - start:.2f} s")
+
+    rng = np.random.default_rng(0)
+    doc_indices = rng.choice(n_docs, size=top_k, replace=False)
+    scores = np.sort(rng.random(top_k))[::-1]
+    for name, func, source in (('per baris (iloc)', format_rows, df), ('ambil kolom', format_results, df),
+                               ('DisplayStore', format_results, store)):
+        timings = []
+        for _ in range(n_runs):
+            start = time.perf_counter()
+            func(doc_indices, scores, source, 'content')
+            timings.append(time.perf_counter() - start)
+        print(f"{name:18s}: median {statistics.median(timings) * 1e3:8.2f} ms")
+
+
+def benchmark_import_time(n_runs=5, modules=('ir_system', 'ir_logic.preprocessing')):
+    """
+    Mengukur waktu import modul di proses Python baru (cold start), serta waktu
+    pemanggilan `preprocess_text` pertama yang memicu pemuatan stopwords dan NLTK.
+    """
+    print(f"=== Benchmark Waktu Import ({n_runs} kali per modul) ===")
+    for module in modules:
+        code = (
+            "import time; start = time.perf_counter(); "
+            f"import {module}; "
+            "print(time.perf_counter() - start)"
+        )
+        timings = []
+        for _ in range(n_runs):
+            output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+            timings.append(float(output.stdout.strip().splitlines()[-1]))
+        print(f"import {module:25s}: median {statistics.median(timings) * 1000:8.1f} ms, "
+              f"min {min(timings) * 1000:8.1f} ms")
+
+    code = (
+        "import time; from ir_logic.preprocessing import preprocess_text; "
+        "start = time.perf_counter(); "
+        "preprocess_text('analisis data bisnis', language='id', use_spacy=False); "
+        "print(time.perf_counter() - start)"
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    print(f"preprocess_text pertama (tanpa spaCy): {float(output.stdout.strip().splitlines()[-1]) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_import_time()
+    benchmark_preprocessor()
+    benchmark_tokenizers()
+    benchmark_streaming_ingestion()
+    benchmark_live_updates()
+    benchmark_query_cache()
+    benchmark_result_formatting()
+    benchmark_index_memory()
+    benchmark_vocabulary_pruning()
+    benchmark_hashing()
+    benchmark_sharding()
+    benchmark_models()
+    benchmark_query_allocation()
+    benchmark_preprocessing_scaling()
+    benchmark_lemmatization()
@@ -1,3 +1,332 @@
-# Cache sederhana untuk menyimpan data dan model yang telah diproses
-# Tujuannya adalah untuk menghindari pemrosesan ulang yang memakan waktu
-cache = {}
\ No newline at end of file
+# Cache untuk menyimpan data dan model yang telah diproses
+# Tujuannya adalah untuk menghindari pemrosesan ulang yang memakan waktu.
+# Cache dibatasi oleh anggaran memori (byte) dan membuang entri yang paling
+# lama tidak digunakan (LRU) ketika anggaran terlampaui.
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Anggaran memori default (1 GiB), dapat diubah melalui variabel lingkungan
+DEFAULT_MAX_BYTES = int(os.environ.get('IR_CACHE_MAX_BYTES', 1 << 30))
+
+# Direktori tier disk opsional untuk entri yang dibuang dari memori
+DEFAULT_DISK_DIR = os.environ.get('IR_CACHE_DISK_DIR') or None
+
+# Jumlah maksimum hasil query yang disimpan oleh cache hasil query
+DEFAULT_QUERY_CACHE_SIZE = int(os.environ.get('IR_QUERY_CACHE_SIZE', 1024))
+
+
+def estimate_size(obj, _seen=None):
+    """
+    Memperkirakan ukuran memori sebuah objek dalam byte.
+
+    Menghitung DataFrame (termasuk isi string), matriks sparse, array numpy,
+    kosakata (dict) dan atribut objek seperti vectorizer atau indeks secara
+    rekursif. Buffer array yang dipakai bersama hanya dihitung satu kali. Array
+    yang memory-map ke file (misalnya indeks dari `read_index`) tidak dihitung,
+    karena halamannya dapat dibuang oleh sistem operasi kapan saja.
+    """
+    if _seen is None:
+        _seen = set()
+
+    if isinstance(obj, np.ndarray):
+        # Array yang berbagi buffer (view) dihitung berdasarkan buffer dasarnya
+        base = obj
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if id(base) in _seen:
+            return 0
+        _seen.add(id(base))
+        if isinstance(base, np.memmap) or isinstance(base.base, mmap.mmap):
+            return 0
+        return int(base.nbytes)
+
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(obj, pd.DataFrame) else usage)
+    if sparse.issparse(obj):
+        return sum(estimate_size(getattr(obj, name), _seen)
+                   for name in ('data', 'indices', 'indptr') if hasattr(obj, name))
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in obj.items()
+        )
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(estimate_size(item, _seen) for item in obj)
+    if hasattr(obj, '__dict__') and not isinstance(obj, type):
+        return sys.getsizeof(obj) + estimate_size(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+class LRUCache:
+    """
+    Cache LRU dengan anggaran memori dalam byte.
+
+    Setiap entri diukur dengan `estimate_size` saat disimpan. Jika total ukuran
+    melebihi `max_bytes`, entri yang paling lama tidak digunakan dibuang. Jika
+    `disk_dir` diberikan, entri yang dibuang disimpan ke disk (pickle) dan dimuat
+    kembali ketika diminta lagi.
+
+    Entri yang lebih besar dari seluruh anggaran tidak dimasukkan ke LRU maupun tier
+    disk (pickle ulang pada setiap akses justru lebih lambat dari membangunnya).
+    Hanya entri besar terakhir yang ditahan (pinned) di luar anggaran, sehingga
+    pemakaian berulang atas entri yang sama tetap hit; entri besar sebelumnya dibuang.
+
+    Parameters:
+    -----------
+    max_bytes : int
+        Anggaran memori maksimum untuk seluruh entri.
+    disk_dir : str, optional
+        Direktori untuk tier disk. None berarti entri yang dibuang langsung dihapus.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=DEFAULT_DISK_DIR):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self._entries = OrderedDict()
+        self._pinned = None
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        """
+        Mengambil entri dan menandainya sebagai yang terbaru digunakan.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            if self._pinned is not None and self._pinned[0] == key:
+                self.hits += 1
+                return self._pinned[1]
+
+            value = self._load_from_disk(key)
+            if value is not None:
+                self.disk_hits += 1
+                self.hits += 1
+                self.put(key, value)
+                return value
+
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Menyimpan entri lalu membuang entri LRU sampai total ukuran sesuai anggaran.
+        """
+        with self._lock:
+            self.pop(key)
+            size = estimate_size(value)
+            if size > self.max_bytes:
+                # Entri lebih besar dari seluruh anggaran: tahan hanya entri besar terakhir
+                if self._pinned is not None:
+                    self.evictions += 1
+                self._pinned = (key, value, size)
+                return
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            self._evict()
+
+    def pop(self, key, default=None):
+        """
+        Menghapus entri dari memori (tanpa menghitungnya sebagai eviction).
+        """
+        with self._lock:
+            if self._pinned is not None and self._pinned[0] == key:
+                value = self._pinned[1]
+                self._pinned = None
+                return value
+            if key not in self._entries:
+                return default
+            value, size = self._entries.pop(key)
+            self.current_bytes -= size
+            return value
+
+    def clear(self):
+        """
+        Mengosongkan seluruh entri di memori dan mereset penghitung.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._pinned = None
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = self.disk_hits = 0
+
+    def stats(self):
+        """
+        Mengembalikan statistik cache: jumlah entri, ukuran (termasuk entri besar yang
+        ditahan, 'pinned_bytes'), hit, miss, dan eviction.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'pinned_bytes': self._pinned[2] if self._pinned is not None else 0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def size_of(self, key):
+        """
+        Mengembalikan perkiraan ukuran (byte) entri yang ada di memori, atau None.
+        """
+        with self._lock:
+            if self._pinned is not None and self._pinned[0] == key:
+                return self._pinned[2]
+            entry = self._entries.get(key)
+            return entry[1] if entry is not None else None
+
+    def __contains__(self, key):
+        with self._lock:
+            pinned = self._pinned is not None and self._pinned[0] == key
+            return pinned or key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            key, (value, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.evictions += 1
+            self._save_to_disk(key, value)
+
+    def _disk_path(self, key):
+        name = hashlib.sha256(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{name}.pkl")
+
+    def _save_to_disk(self, key, value):
+        if self.disk_dir is None:
+            return
+        os.makedirs(self.disk_dir, exist_ok=True)
+        path = self._disk_path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def _load_from_disk(self, key):
+        if self.disk_dir is None:
+            return None
+        path = self._disk_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            value = pickle.load(f)
+        os.remove(path)
+        return value
+
+
+class QueryResultCache:
+    """
+    Cache LRU untuk hasil pencarian dan metriknya, dibatasi jumlah entri.
+
+    Kunci berisi identitas indeks (id objek dan atribut `version` jika ada), query
+    yang sudah diproses, dan parameter pencarian. Setiap entri menyimpan weakref ke
+    indeksnya, sehingga entri milik indeks yang sudah dibuang (id objek dipakai ulang)
+    dianggap miss. Indeks yang berubah di tempat (`IncrementalIndex`) menaikkan
+    `version`, sehingga hasil lama tidak pernah cocok lagi dan akhirnya terbuang.
+
+    Parameters:
+    -----------
+    max_entries : int
+        Jumlah hasil query maksimum yang disimpan.
+    """
+
+    def __init__(self, max_entries=DEFAULT_QUERY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(index, processed_query, params):
+        """
+        Membuat kunci cache. Dibuat sebelum pencarian, agar hasil dari indeks yang
+        berubah selama pencarian tidak disimpan di bawah versi yang lebih baru.
+        """
+        return id(index), getattr(index, 'version', None), processed_query, params
+
+    def get(self, key, index):
+        """
+        Mengambil salinan (hasil pencarian, metrik) yang tersimpan, atau None jika belum ada.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is index:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return [dict(result) for result in entry[1]], dict(entry[2])
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, index, results, metrics):
+        """
+        Menyimpan salinan hasil pencarian dan metriknya lalu membuang entri LRU jika melebihi batas.
+        """
+        entry = (weakref.ref(index), tuple(dict(result) for result in results), dict(metrics))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Mengosongkan seluruh entri dan mereset penghitung.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Mengembalikan statistik cache: jumlah entri, hit, miss, eviction, dan hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+cache = LRUCache()
+query_cache = QueryResultCache()
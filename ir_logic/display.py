@@ -0,0 +1,143 @@
+# Kolom tampilan hasil pencarian (judul dan cuplikan teks).
+# Cuplikan dihitung sekali saat indeks dimuat dan disimpan sebagai satu blob UTF-8
+# dengan array offset, sehingga hasil pencarian dibentuk dengan mengambil baris
+# secara massal per indeks dokumen, bukan membangun satu baris DataFrame per hasil.
+import numpy as np
+import pandas as pd
+
+# Panjang cuplikan teks (karakter) yang ditampilkan di hasil pencarian
+SNIPPET_LENGTH = 150
+
+# Kolom judul yang ditampilkan di hasil pencarian (jika ada di dataset)
+TITLE_COLUMN = 'title'
+
+
+def display_value(value):
+    """
+    Menormalkan nilai kolom tampilan: string apa adanya, nilai kosong (None/NaN)
+    menjadi None, dan nilai lain diubah dengan `str`. Dipakai oleh `PackedStrings` dan
+    jalur DataFrame agar hasil pencarian sama (dan NaN tidak masuk ke JSON).
+    """
+    if isinstance(value, str):
+        return value
+    if value is None or pd.isna(value):
+        return None
+    return str(value)
+
+
+class PackedStrings:
+    """
+    Deretan string yang disimpan sebagai satu blob UTF-8 dan array offset.
+
+    Dibandingkan list of str, setiap string hanya memakan panjang byte-nya ditambah
+    8 byte offset. Nilai yang kosong (None/NaN) dikembalikan sebagai None.
+
+    Parameters:
+    -----------
+    values : iterable
+        Nilai yang disimpan; nilai bukan string diubah dengan `str`.
+    """
+
+    def __init__(self, values):
+        encoded = []
+        missing = []
+        for i, value in enumerate(values):
+            value = display_value(value)
+            if value is None:
+                encoded.append(b'')
+                missing.append(i)
+            else:
+                encoded.append(value.encode('utf-8'))
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=self.offsets[1:])
+        self.blob = b''.join(encoded)
+        self.missing = np.asarray(missing, dtype=np.int64) if missing else None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def take(self, indices):
+        """
+        Mengambil string pada posisi `indices` (array integer) sesuai urutannya.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        blob = self.blob
+        values = [
+            blob[start:end].decode('utf-8')
+            for start, end in zip(self.offsets[indices].tolist(), self.offsets[indices + 1].tolist())
+        ]
+        if self.missing is not None:
+            for position in np.flatnonzero(np.isin(indices, self.missing)).tolist():
+                values[position] = None
+        return values
+
+
+class DisplayStore:
+    """
+    Judul dan cuplikan teks semua dokumen, siap diambil per indeks dokumen.
+
+    Parameters:
+    -----------
+    titles : PackedStrings or None
+        Judul dokumen, atau None jika dataset tidak memiliki kolom judul.
+    snippets : PackedStrings
+        Awalan teks sepanjang `SNIPPET_LENGTH` karakter.
+    """
+
+    def __init__(self, titles, snippets):
+        self.titles = titles
+        self.snippets = snippets
+
+    @classmethod
+    def from_frame(cls, df, search_column):
+        """
+        Membangun DisplayStore dari DataFrame dataset (lengkap atau kolom tampilan saja).
+        """
+        titles = PackedStrings(df[TITLE_COLUMN].tolist()) if TITLE_COLUMN in df.columns else None
+        snippets = PackedStrings(
+            text[:SNIPPET_LENGTH] if isinstance(text, str) else ''
+            for text in df[search_column].tolist()
+        )
+        return cls(titles, snippets)
+
+    def __len__(self):
+        return len(self.snippets)
+
+    def take(self, doc_indices):
+        """
+        Mengembalikan (judul, cuplikan) untuk dokumen `doc_indices`; cuplikan sudah
+        diakhiri '...'.
+        """
+        doc_indices = np.asarray(doc_indices, dtype=np.int64)
+        if self.titles is not None:
+            titles = self.titles.take(doc_indices)
+        else:
+            titles = [f"Dokumen {i}" for i in doc_indices.tolist()]
+        snippets = [snippet + '...' for snippet in self.snippets.take(doc_indices)]
+        return titles, snippets
+
+
+def display_fields(source, search_column, doc_indices):
+    """
+    Mengambil judul dan cuplikan untuk `doc_indices` dari DisplayStore atau DataFrame.
+
+    Untuk DataFrame, setiap kolom diambil sekaligus dengan `take`, bukan per baris.
+
+    Returns:
+    --------
+    tuple
+        (list judul, list cuplikan) sesuai urutan `doc_indices`.
+    """
+    if isinstance(source, DisplayStore):
+        return source.take(doc_indices)
+
+    doc_indices = np.asarray(doc_indices, dtype=np.int64)
+    if TITLE_COLUMN in source.columns:
+        titles = [display_value(title) for title in source[TITLE_COLUMN].take(doc_indices).tolist()]
+    else:
+        titles = [f"Dokumen {i}" for i in doc_indices.tolist()]
+    snippets = [
+        (text[:SNIPPET_LENGTH] if isinstance(text, str) else '') + '...'
+        for text in source[search_column].take(doc_indices).tolist()
+    ]
+    return titles, snippets
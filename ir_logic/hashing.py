@@ -0,0 +1,255 @@
+# Model TF-IDF berbasis feature hashing: tanpa fit dan tanpa kosakata.
+# Setiap token dipetakan ke salah satu `n_buckets` kolom dengan fungsi hash, sehingga
+# dokumen dapat di-vektorisasi secara independen (per potongan, paralel) dan
+# ditambahkan ke indeks kapan saja tanpa membangun ulang kosakata.
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from ir_logic.indexing import ScoringIndex
+from ir_logic.vectorization import DEFAULT_N_BUCKETS, tokenizer_options
+
+# Jumlah dokumen minimum agar hashing dijalankan paralel
+MIN_PARALLEL_SIZE = 20000
+
+
+def hashing_vectorizer(n_buckets=DEFAULT_N_BUCKETS, fast_tokenizer=False):
+    """
+    Membuat HashingVectorizer yang menghasilkan frekuensi term per bucket, dengan
+    tokenisasi yang sama dengan `vectorize_bow`.
+    """
+    return HashingVectorizer(n_features=n_buckets, alternate_sign=False, norm=None, dtype=np.float32,
+                             **tokenizer_options(fast_tokenizer))
+
+
+def _hash_chunk(args):
+    documents, n_buckets, fast_tokenizer = args
+    return hashing_vectorizer(n_buckets, fast_tokenizer).transform(documents)
+
+
+def hash_documents(documents, n_buckets=DEFAULT_N_BUCKETS, fast_tokenizer=False, n_jobs=None, chunk_size=None,
+                   min_parallel_size=MIN_PARALLEL_SIZE):
+    """
+    Mengubah dokumen menjadi matriks frekuensi term per bucket.
+
+    HashingVectorizer tidak memerlukan fit, sehingga setiap potongan dokumen dapat
+    di-vektorisasi secara independen oleh process pool; hasilnya sama dengan
+    vektorisasi serial.
+
+    Parameters:
+    -----------
+    documents : list of str
+        Daftar dokumen (teks yang sudah diproses).
+    n_buckets : int, optional
+        Jumlah bucket (kolom). Default adalah 2^20.
+    fast_tokenizer : bool, optional
+        Jika True, gunakan `fast_word_tokens` sebagai tokenizer. Default adalah False.
+    n_jobs : int, optional
+        Jumlah proses worker. Default adalah 1 (serial).
+    chunk_size : int, optional
+        Jumlah dokumen per potongan. Default dibagi rata menjadi 4 potongan per worker.
+    min_parallel_size : int, optional
+        Jumlah dokumen minimum agar pemrosesan paralel digunakan. Default adalah 20000.
+
+    Returns:
+    --------
+    scipy.sparse.csr_matrix
+        Matriks frekuensi term (float32) berukuran len(documents) x n_buckets.
+    """
+    documents = list(documents)
+    n_jobs = n_jobs or 1
+    if n_jobs <= 1 or len(documents) < min_parallel_size:
+        return _hash_chunk((documents, n_buckets, fast_tokenizer))
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(documents) // (n_jobs * 4)))
+    chunks = [(documents[i:i + chunk_size], n_buckets, fast_tokenizer) for i in range(0, len(documents), chunk_size)]
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        return sparse.vstack(list(executor.map(_hash_chunk, chunks)), format='csr')
+
+
+def term_buckets(terms, n_buckets=DEFAULT_N_BUCKETS, fast_tokenizer=False):
+    """
+    Mengembalikan bucket untuk setiap term kosakata (array int32 sepanjang `terms`).
+    """
+    matrix = hashing_vectorizer(n_buckets, fast_tokenizer).transform(terms)
+    if not np.all(np.diff(matrix.indptr) == 1):
+        raise ValueError("Setiap term kosakata harus menghasilkan tepat satu token.")
+    return matrix.indices.astype(np.int32)
+
+
+class HashingIndex:
+    """
+    Indeks TF-IDF berbasis feature hashing yang tidak memerlukan fit.
+
+    Dokumen disimpan sebagai frekuensi term per bucket yang dinormalisasi L2 (float32),
+    tanpa IDF, sehingga bobot dokumen tidak bergantung pada dokumen lain. Frekuensi
+    dokumen per bucket disimpan sebagai array int32 (`doc_freq`), dan IDF dihitung
+    saat query dari array tersebut: query diberi bobot TF-IDF (IDF dengan smoothing
+    seperti TfidfTransformer) lalu dinormalisasi L2 (skema lnc.ltc). Karena itu
+    dokumen baru cukup di-hash dan ditambahkan (`append`) tanpa menghitung ulang bobot
+    lama, dan IDF query selalu mencerminkan seluruh dokumen.
+
+    Seperti `IncrementalIndex`, dokumen baru masuk ke segmen delta yang digabung
+    dengan segmen dasar jika melebihi `compact_ratio`. Daftar segmen dan `doc_freq`
+    diganti sebagai objek baru, sehingga query yang berjalan bersamaan dengan
+    `append` melihat kondisi yang konsisten. Indeks ini tidak disimpan ke disk.
+
+    Parameters:
+    -----------
+    n_buckets : int, optional
+        Jumlah bucket (kolom). Default adalah 2^20.
+    fast_tokenizer : bool, optional
+        Jika True, gunakan `fast_word_tokens` sebagai tokenizer. Default adalah False.
+    compact_ratio : float, optional
+        Rasio maksimum jumlah dokumen delta terhadap dokumen dasar sebelum digabung. Default adalah 0.1.
+    n_jobs : int, optional
+        Jumlah proses untuk `hash_documents`. Default adalah 1.
+    """
+
+    def __init__(self, n_buckets=DEFAULT_N_BUCKETS, fast_tokenizer=False, compact_ratio=0.1, n_jobs=None):
+        self.n_buckets = n_buckets
+        self.fast_tokenizer = fast_tokenizer
+        self.compact_ratio = compact_ratio
+        self.n_jobs = n_jobs
+        self.vectorizer = hashing_vectorizer(n_buckets, fast_tokenizer)
+        self.doc_freq = np.zeros(n_buckets, dtype=np.int32)
+        self.n_docs = 0
+        self.version = 0
+        self._delta_blocks = []
+        self._segments = ()
+
+    @classmethod
+    def from_documents(cls, documents, n_buckets=DEFAULT_N_BUCKETS, fast_tokenizer=False, n_jobs=None):
+        """
+        Membangun indeks langsung dari dokumen (teks yang sudah diproses), tanpa kosakata.
+        """
+        index = cls(n_buckets, fast_tokenizer, n_jobs=n_jobs)
+        index.append_counts(hash_documents(documents, n_buckets, fast_tokenizer, n_jobs=n_jobs))
+        return index.compact()
+
+    @classmethod
+    def from_counts(cls, count_vectorizer, count_matrix, n_buckets=DEFAULT_N_BUCKETS):
+        """
+        Membangun indeks dari matriks BoW yang sudah di-cache tanpa tokenisasi ulang:
+        setiap kolom term dipetakan ke bucket-nya. Hasilnya sama dengan `from_documents`.
+        """
+        fast_tokenizer = count_vectorizer.tokenizer is not None
+        count_matrix = sparse.csr_matrix(count_matrix)
+        buckets = term_buckets(count_vectorizer.get_feature_names_out(), n_buckets, fast_tokenizer)
+        counts = sparse.csr_matrix((count_matrix.data.astype(np.float32), buckets[count_matrix.indices],
+                                    count_matrix.indptr), shape=(count_matrix.shape[0], n_buckets))
+        # Term yang bertabrakan di bucket yang sama dijumlahkan
+        counts.sum_duplicates()
+        index = cls(n_buckets, fast_tokenizer)
+        index.append_counts(counts)
+        return index.compact()
+
+    @property
+    def n_terms(self):
+        return self.n_buckets
+
+    @property
+    def nnz(self):
+        return sum(segment.nnz for _, segment in self._segments)
+
+    def _segment(self, blocks):
+        postings = sparse.vstack(blocks, format='csc') if len(blocks) > 1 else blocks[0].tocsc()
+        postings.sort_indices()
+        return ScoringIndex.from_normalized(None, None, postings)
+
+    def compact(self):
+        """
+        Menggabungkan semua segmen menjadi satu segmen dasar.
+        """
+        if self._delta_blocks:
+            # Segmen dasar hanya disimpan sebagai posting (CSC), tanpa salinan per baris
+            base = [self._segments[0][1].postings] if self._segments else []
+            self._segments = ((0, self._segment(base + self._delta_blocks)),)
+            self._delta_blocks = []
+        self.version += 1
+        return self
+
+    def append_counts(self, counts):
+        """
+        Menambahkan dokumen yang sudah di-hash (matriks frekuensi per bucket) ke akhir indeks.
+
+        Returns:
+        --------
+        int
+            Versi indeks setelah penambahan.
+        """
+        counts = sparse.csr_matrix(counts)
+        counts.sum_duplicates()
+        if counts.shape[0] == 0:
+            return self.version
+        block = normalize(counts.astype(np.float32), norm='l2')
+        self.doc_freq = self.doc_freq + np.bincount(block.indices, minlength=self.n_buckets).astype(np.int32)
+        self.n_docs += counts.shape[0]
+
+        base_rows = self._segments[0][1].n_docs if self._segments else 0
+        self._delta_blocks.append(block)
+        if not base_rows or self.n_docs - base_rows > self.compact_ratio * base_rows:
+            return self.compact().version
+
+        # Bangun ulang hanya segmen delta (dokumen setelah segmen dasar)
+        self._segments = (self._segments[0], (base_rows, self._segment(self._delta_blocks)))
+        self.version += 1
+        return self.version
+
+    def append(self, documents):
+        """
+        Menambahkan dokumen baru (teks yang sudah diproses) ke akhir indeks tanpa fit ulang.
+
+        Returns:
+        --------
+        int
+            Versi indeks setelah penambahan.
+        """
+        return self.append_counts(hash_documents(documents, self.n_buckets, self.fast_tokenizer, n_jobs=self.n_jobs))
+
+    def idf(self, buckets):
+        """
+        Menghitung IDF (dengan smoothing) untuk bucket tertentu dari `doc_freq` saat ini.
+        """
+        return np.log((1 + self.n_docs) / (1 + self.doc_freq[buckets].astype(np.float64))) + 1
+
+    def transform(self, query):
+        """
+        Mengubah query yang sudah diproses menjadi vektor TF-IDF ter-normalisasi L2 (1 x n_buckets).
+        """
+        return self.transform_many([query])
+
+    def transform_many(self, queries):
+        """
+        Mengubah banyak query yang sudah diproses menjadi matriks TF-IDF ter-normalisasi L2 per baris.
+        """
+        counts = sparse.csr_matrix(self.vectorizer.transform(queries), dtype=np.float64)
+        counts.data *= self.idf(counts.indices)
+        return normalize(counts, norm='l2')
+
+    def score(self, query_vector):
+        """
+        Menghitung skor per segmen lalu menggabungkan hasilnya (lihat `ScoringIndex.score`).
+        """
+        all_docs, all_scores = [], []
+        for offset, segment in self._segments:
+            doc_indices, scores = segment.score(query_vector)
+            all_docs.append(doc_indices + offset)
+            all_scores.append(scores)
+        if not all_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        return np.concatenate(all_docs), np.concatenate(all_scores)
+
+    def score_many(self, query_matrix):
+        """
+        Menghitung matriks skor n_queries x n_docs untuk banyak query (lihat `ScoringIndex.score_many`).
+        """
+        query_matrix = sparse.csr_matrix(query_matrix)
+        if not self._segments:
+            return sparse.csr_matrix((query_matrix.shape[0], 0))
+        blocks = [segment.score_many(query_matrix) for _, segment in self._segments]
+        return sparse.hstack(blocks, format='csr')
@@ -0,0 +1,325 @@
+# Pembaruan indeks secara inkremental untuk dataset yang hanya bertambah (append-only).
+# Baris baru dideteksi dari posisi byte terakhir yang sudah dibaca, lalu hanya
+# baris tersebut yang diproses dan ditambahkan ke indeks sebagai segmen baru.
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+from ir_logic.indexing import BM25_B, BM25_K1, BM25Index, ScoringIndex, bm25_idf, bm25_weights
+from ir_logic.vectorization import VOCABULARY_MODEL_TYPES, count_into_vocabulary, tokenizer_options
+
+# Jumlah byte sebelum posisi terakhir yang di-hash untuk memastikan file hanya bertambah
+TAIL_CHECK_BYTES = 4096
+
+
+def _tail_digest(f, offset):
+    start = max(0, offset - TAIL_CHECK_BYTES)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
+
+
+def file_version(filepath):
+    """
+    Versi file berupa (ukuran, waktu modifikasi dalam ns), untuk kunci cache yang
+    harus berganti ketika isi file berubah.
+    """
+    stat = os.stat(filepath)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def file_state(filepath, rows, offset=None):
+    """
+    Mencatat posisi baca sebuah file: offset byte, jumlah baris, dan hash bagian akhir
+    sebelum offset (untuk mendeteksi perubahan selain penambahan baris).
+
+    Parameters:
+    -----------
+    filepath : str
+        Path file dataset.
+    rows : int
+        Jumlah baris data yang sudah dibaca sampai `offset`.
+    offset : int, optional
+        Posisi byte yang sudah dibaca. Default adalah ukuran file saat ini.
+    """
+    if offset is None:
+        offset = os.path.getsize(filepath)
+    with open(filepath, 'rb') as f:
+        digest = _tail_digest(f, offset)
+    return {'offset': offset, 'rows': rows, 'tail_digest': digest}
+
+
+def _complete_length(data, quoted):
+    """
+    Mengembalikan panjang awalan `data` yang hanya berisi record lengkap (diakhiri
+    baris baru). Jika `quoted` (CSV), baris baru di dalam field bertanda kutip tidak
+    dianggap akhir record.
+    """
+    if not quoted or b'"' not in data:
+        return data.rfind(b'\n') + 1
+    # Tanda kutip ganda ("") di dalam field membalik status dua kali, sehingga cukup
+    # menghitung paritas tanda kutip sampai setiap baris baru
+    complete = position = 0
+    in_quotes = False
+    for line in data.split(b'\n')[:-1]:
+        position += len(line) + 1
+        in_quotes ^= line.count(b'"') % 2 == 1
+        if not in_quotes:
+            complete = position
+    return complete
+
+
+def read_appended_rows(filepath, state, columns):
+    """
+    Membaca baris yang ditambahkan ke file setelah posisi `state['offset']`.
+
+    Hanya record lengkap (diakhiri baris baru) yang dibaca; record terakhir yang belum
+    selesai ditulis akan dibaca pada pembaruan berikutnya. Field CSV bertanda kutip
+    boleh berisi baris baru.
+
+    Parameters:
+    -----------
+    filepath : str
+        Path file dataset CSV/JSONL.
+    state : dict
+        Posisi baca sebelumnya (lihat `file_state`).
+    columns : list of str
+        Nama kolom dataset (untuk CSV, karena header hanya ada di awal file).
+
+    Returns:
+    --------
+    tuple or None
+        (DataFrame baris baru, state baru), atau None jika file tidak hanya bertambah
+        (ukuran mengecil atau isi sebelum offset berubah) sehingga perlu dibangun ulang.
+    """
+    offset = state['offset']
+    with open(filepath, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        if size < offset or _tail_digest(f, offset) != state['tail_digest']:
+            return None
+        f.seek(offset)
+        appended = f.read(size - offset)
+
+    # Hanya record lengkap yang dibaca
+    complete = _complete_length(appended, quoted=filepath.endswith('.csv'))
+    if not appended[:complete].strip():
+        new_rows = pd.DataFrame(columns=columns)
+    elif filepath.endswith('.csv'):
+        new_rows = pd.read_csv(io.BytesIO(appended[:complete]), header=None, names=columns)
+    elif filepath.endswith('.json'):
+        new_rows = pd.read_json(io.BytesIO(appended[:complete]), lines=True).reindex(columns=columns)
+    else:
+        raise ValueError("Unsupported file format")
+
+    if not complete:
+        return new_rows, state
+    return new_rows, file_state(filepath, state['rows'] + len(new_rows), offset + complete)
+
+
+class IncrementalIndex:
+    """
+    Indeks siap-skor yang dapat ditambah dokumen baru tanpa membangun ulang seluruhnya.
+
+    Indeks terdiri dari segmen dasar dan segmen delta (masing-masing `ScoringIndex`)
+    yang mencakup rentang dokumen berurutan. Dokumen baru hanya membangun ulang segmen
+    delta; term baru ditambahkan di akhir kosakata. Jika segmen delta melebihi
+    `compact_ratio` dari segmen dasar, semua segmen digabung kembali (`compact`).
+
+    Untuk TF-IDF dan BM25, bobot IDF term lama (dan rata-rata panjang dokumen BM25)
+    tidak diubah saat penambahan; keduanya dihitung ulang secara malas saat `compact`,
+    sehingga selisihnya dibatasi `compact_ratio`. Term baru mendapat IDF dari
+    frekuensi dokumen saat ditambahkan.
+
+    Kosakata, IDF, dan daftar segmen diganti sebagai objek baru (bukan diubah di
+    tempat), sehingga query yang berjalan bersamaan dengan `append` tetap melihat
+    kondisi yang konsisten. Pemanggilan `append`/`compact` sendiri harus berurutan.
+
+    Parameters:
+    -----------
+    count_vectorizer : CountVectorizer
+        Vectorizer BoW yang sudah di-fit (kosakata dan tokenizer).
+    count_matrix : scipy.sparse.csr_matrix
+        Matriks BoW dari dokumen awal.
+    model_type : str
+        Jenis model. Pilihan: 'bow', 'tfidf', 'bm25'.
+    compact_ratio : float, optional
+        Rasio maksimum jumlah dokumen delta terhadap dokumen dasar sebelum digabung. Default adalah 0.1.
+    k1 : float, optional
+        Parameter BM25 saturasi frekuensi term. Default adalah 1.2.
+    b : float, optional
+        Parameter BM25 normalisasi panjang dokumen. Default adalah 0.75.
+    """
+
+    def __init__(self, count_vectorizer, count_matrix, model_type, compact_ratio=0.1, k1=BM25_K1, b=BM25_B):
+        if model_type not in VOCABULARY_MODEL_TYPES:
+            raise ValueError("Invalid model type specified")
+        self.model_type = model_type
+        self.compact_ratio = compact_ratio
+        self.k1 = k1
+        self.b = b
+        self.fast_tokenizer = count_vectorizer.tokenizer is not None
+        self.vocabulary = dict(count_vectorizer.vocabulary_)
+        self._analyzer = count_vectorizer.build_analyzer()
+        self.doc_freq = np.bincount(sparse.csr_matrix(count_matrix).indices,
+                                    minlength=len(self.vocabulary)).astype(np.int64)
+        self.n_docs = count_matrix.shape[0]
+        self.version = 0
+        self._count_blocks = [sparse.csr_matrix(count_matrix)]
+        self._delta_blocks = []
+        self._segments = ()
+        self.compact()
+
+    @property
+    def n_terms(self):
+        return len(self.vocabulary)
+
+    @property
+    def nnz(self):
+        return sum(segment.nnz for _, segment in self._segments)
+
+    @property
+    def vectorizer(self):
+        """
+        Vectorizer sklearn yang setara dengan kondisi indeks saat ini (untuk penyimpanan).
+        """
+        options = tokenizer_options(self.fast_tokenizer)
+        if self.model_type == 'tfidf':
+            vectorizer = TfidfVectorizer(vocabulary=self.vocabulary, **options)
+            vectorizer.idf_ = self.idf
+        else:
+            vectorizer = CountVectorizer(vocabulary=self.vocabulary, **options)
+            vectorizer.fit(())
+        return vectorizer
+
+    def _stack(self, blocks):
+        # Blok lama memiliki kolom lebih sedikit; term baru selalu berada di akhir kosakata
+        n_terms = self.n_terms
+        return sparse.vstack([
+            sparse.csr_matrix((block.data, block.indices, block.indptr), shape=(block.shape[0], n_terms))
+            for block in blocks
+        ], format='csr')
+
+    def _compute_idf(self, doc_freq):
+        if self.model_type == 'bm25':
+            return bm25_idf(doc_freq, self.n_docs)
+        # IDF dengan smoothing, sama dengan TfidfTransformer(smooth_idf=True)
+        return np.log((1 + self.n_docs) / (1 + doc_freq)) + 1
+
+    def _weights(self, counts):
+        counts = sparse.csr_matrix(counts, dtype=np.float64)
+        if self.model_type == 'tfidf':
+            counts.data *= self.idf[counts.indices]
+        return counts
+
+    def _segment(self, counts):
+        # Segmen BM25 menyimpan bobot BM25 apa adanya; segmen lain dinormalisasi L2
+        if self.model_type == 'bm25':
+            weights = bm25_weights(counts, self.idf, k1=self.k1, b=self.b, avgdl=self._avgdl)
+            postings = weights.tocsc()
+            postings.sort_indices()
+            return BM25Index.from_normalized(None, weights, postings)
+        return ScoringIndex(None, self._weights(counts))
+
+    def compact(self):
+        """
+        Menggabungkan semua segmen menjadi satu segmen dasar dan menghitung ulang IDF.
+        """
+        counts = self._stack(self._count_blocks)
+        self._count_blocks = [counts]
+        if self.model_type != 'bow':
+            self.idf = self._compute_idf(self.doc_freq)
+        self._avgdl = counts.sum() / self.n_docs if self.n_docs else 0.0
+        self._segments = ((0, self._segment(counts)),)
+        self._delta_blocks = []
+        self.version += 1
+        return self
+
+    def append(self, documents):
+        """
+        Menambahkan dokumen baru (teks yang sudah diproses) ke akhir indeks.
+
+        Returns:
+        --------
+        int
+            Versi indeks setelah penambahan.
+        """
+        documents = list(documents)
+        if not documents:
+            return self.version
+
+        # Term baru ditambahkan ke salinan kosakata yang baru dipublikasikan di akhir
+        vocabulary = dict(self.vocabulary)
+        counts = count_into_vocabulary(documents, vocabulary, self.fast_tokenizer)
+        counts.sort_indices()
+        n_new_terms = len(vocabulary) - len(self.doc_freq)
+        doc_freq = np.concatenate([self.doc_freq, np.zeros(n_new_terms, dtype=np.int64)])
+        self.doc_freq = doc_freq + np.bincount(counts.indices, minlength=len(vocabulary))
+        self.n_docs += len(documents)
+        self._count_blocks.append(counts)
+
+        if self.model_type != 'bow' and n_new_terms:
+            # Term baru mendapat IDF sekarang; IDF term lama diperbarui saat compact
+            self.idf = np.concatenate([self.idf, self._compute_idf(self.doc_freq[-n_new_terms:])])
+        self.vocabulary = vocabulary
+
+        base_rows = self._segments[0][1].n_docs
+        if self.n_docs - base_rows > self.compact_ratio * max(base_rows, 1):
+            return self.compact().version
+
+        # Bangun ulang hanya segmen delta (dokumen setelah segmen dasar)
+        self._delta_blocks.append(counts)
+        delta = self._segment(self._stack(self._delta_blocks))
+        self._segments = (self._segments[0], (base_rows, delta))
+        self.version += 1
+        return self.version
+
+    def transform(self, query):
+        """
+        Mengubah query yang sudah diproses menjadi vektor sparse ter-normalisasi L2 (1 x n_terms).
+        """
+        return self.transform_many([query])
+
+    def transform_many(self, queries):
+        """
+        Mengubah banyak query yang sudah diproses menjadi matriks sparse ter-normalisasi L2 per baris
+        (untuk BM25: frekuensi term query tanpa normalisasi).
+        """
+        vocabulary = self.vocabulary
+        rows, columns = [], []
+        for row, query in enumerate(queries):
+            for term in self._analyzer(query):
+                column = vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        # Entri duplikat (term yang muncul berulang) dijumlahkan saat konversi ke CSR
+        counts = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(queries), len(vocabulary)))
+        if self.model_type == 'bm25':
+            # Skor BM25 = jumlah bobot term query, tanpa normalisasi
+            return counts
+        return normalize(self._weights(counts), norm='l2')
+
+    def score(self, query_vector):
+        """
+        Menghitung skor per segmen lalu menggabungkan hasilnya (lihat `ScoringIndex.score`).
+        """
+        query_vector = sparse.csr_matrix(query_vector)
+        all_docs, all_scores = [], []
+        for offset, segment in self._segments:
+            doc_indices, scores = segment.score(query_vector[:, :segment.n_terms])
+            all_docs.append(doc_indices + offset)
+            all_scores.append(scores)
+        return np.concatenate(all_docs), np.concatenate(all_scores)
+
+    def score_many(self, query_matrix):
+        """
+        Menghitung matriks skor n_queries x n_docs untuk banyak query (lihat `ScoringIndex.score_many`).
+        """
+        query_matrix = sparse.csr_matrix(query_matrix)
+        blocks = [segment.score_many(query_matrix[:, :segment.n_terms]) for _, segment in self._segments]
+        return sparse.hstack(blocks, format='csr')
@@ -0,0 +1,416 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from ir_logic.instrumentation import available_cpus
+
+
+class ScoringIndex:
+    """
+    Indeks siap-skor (scoring-ready index) yang dibangun dari hasil vectorizer.
+
+    Setiap baris matriks dokumen dinormalisasi L2 satu kali saat indeks dibangun,
+    sehingga cosine similarity cukup dihitung sebagai dot product antara query yang
+    sudah dinormalisasi dan dokumen. Indeks juga menyimpan daftar posting (inverted
+    index) per term: penilaian query hanya mengunjungi posting milik term yang muncul
+    di query, sehingga biaya pencarian sebanding dengan panjang posting, bukan dengan
+    jumlah dokumen di korpus.
+
+    Parameters:
+    -----------
+    vectorizer : CountVectorizer or TfidfVectorizer
+        Objek vectorizer yang sudah di-fit.
+    doc_matrix : scipy.sparse.csr_matrix
+        Matriks vektor dari seluruh dokumen (baris = dokumen, kolom = term).
+    """
+
+    def __init__(self, vectorizer, doc_matrix):
+        # Matriks dokumen ter-normalisasi L2 per baris (dokumen kosong tetap nol)
+        normalized = normalize(sparse.csr_matrix(doc_matrix, dtype=np.float64), norm='l2')
+        normalized.sort_indices()
+
+        # Format CSC menyimpan data per kolom (term), sehingga strukturnya
+        # sama dengan daftar posting: term_offsets[t]:term_offsets[t + 1]
+        # menunjuk ke dokumen-dokumen yang mengandung term t.
+        postings = normalized.tocsc()
+        postings.sort_indices()
+        self._attach(vectorizer, normalized, postings)
+
+    @classmethod
+    def from_normalized(cls, vectorizer, doc_matrix, postings):
+        """
+        Membuat indeks dari matriks yang sudah ter-normalisasi tanpa menghitung ulang,
+        misalnya dari array yang dimuat dari disk (lihat `ir_logic.storage`).
+
+        Parameters:
+        -----------
+        vectorizer : CountVectorizer or TfidfVectorizer
+            Objek vectorizer yang sudah di-fit.
+        doc_matrix : scipy.sparse.csr_matrix or None
+            Matriks dokumen yang sudah ter-normalisasi L2 per baris. Penilaian hanya
+            memakai `postings`, sehingga indeks ringkas (lihat `compact_index`) tidak
+            menyimpannya.
+        postings : scipy.sparse.csc_matrix
+            Matriks yang sama dalam format CSC dengan indeks terurut.
+        """
+        index = cls.__new__(cls)
+        index._attach(vectorizer, doc_matrix, postings)
+        return index
+
+    def _attach(self, vectorizer, doc_matrix, postings):
+        self.vectorizer = vectorizer
+        self.n_docs, self.n_terms = postings.shape
+        self.nnz = postings.nnz
+        self.doc_matrix = doc_matrix
+        self.postings = postings
+        # Transpose dari CSC adalah CSR (term x dokumen) yang berbagi array yang sama
+        self.term_doc_matrix = postings.T
+        self.term_offsets = postings.indptr
+        self.posting_docs = postings.indices
+        self.posting_weights = postings.data
+
+    def transform(self, query):
+        """
+        Mengubah query yang sudah diproses menjadi vektor sparse ter-normalisasi L2 (1 x n_terms).
+        """
+        return self.transform_many([query])
+
+    def transform_many(self, queries):
+        """
+        Mengubah banyak query yang sudah diproses menjadi satu matriks sparse
+        ter-normalisasi L2 per baris (n_queries x n_terms).
+        """
+        return normalize(self.vectorizer.transform(queries), norm='l2')
+
+    def score(self, query_vector):
+        """
+        Menghitung cosine similarity antara query dan dokumen yang berbagi term dengan query.
+
+        Parameters:
+        -----------
+        query_vector : scipy.sparse matrix
+            Vektor query ter-normalisasi berukuran 1 x n_terms (hasil `transform`).
+
+        Returns:
+        --------
+        numpy.ndarray
+            Indeks dokumen yang memiliki setidaknya satu term query (terurut naik).
+        numpy.ndarray
+            Skor cosine similarity untuk setiap dokumen tersebut.
+        """
+        query_vector = sparse.csr_matrix(query_vector)
+        terms = query_vector.indices
+        query_weights = query_vector.data
+
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+        if terms.size == 0:
+            return empty
+
+        starts = self.term_offsets[terms]
+        ends = self.term_offsets[terms + 1]
+        if not np.any(ends > starts):
+            return empty
+
+        # Kumpulkan kontribusi setiap posting dari term-term query saja
+        docs = np.concatenate([self.posting_docs[s:e] for s, e in zip(starts, ends)])
+        contributions = np.concatenate([
+            self.posting_weights[s:e] * w for s, e, w in zip(starts, ends, query_weights)
+        ])
+
+        # Akumulasi dot product per dokumen tanpa membuat array sepanjang korpus.
+        # Karena kedua sisi sudah ter-normalisasi, dot product = cosine similarity.
+        doc_indices, inverse = np.unique(docs, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions)
+        return doc_indices, scores
+
+    def score_many(self, query_matrix):
+        """
+        Menghitung cosine similarity untuk banyak query sekaligus dengan satu perkalian matriks sparse.
+
+        Parameters:
+        -----------
+        query_matrix : scipy.sparse matrix
+            Matriks query ter-normalisasi berukuran n_queries x n_terms (hasil `transform_many`).
+
+        Returns:
+        --------
+        scipy.sparse.csr_matrix
+            Matriks skor berukuran n_queries x n_docs. Hanya dokumen yang berbagi term
+            dengan query yang memiliki entri.
+        """
+        scores = sparse.csr_matrix(query_matrix) @ self.term_doc_matrix
+        scores = sparse.csr_matrix(scores)
+        scores.sort_indices()
+        return scores
+
+
+
+# Parameter default BM25: saturasi frekuensi term (k1) dan normalisasi panjang dokumen (b)
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def bm25_idf(doc_freq, n_docs):
+    """
+    Menghitung IDF BM25 (varian non-negatif): log(1 + (N - df + 0.5) / (df + 0.5)).
+    """
+    doc_freq = np.asarray(doc_freq, dtype=np.float64)
+    return np.log1p((n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+
+def bm25_weights(count_matrix, idf, k1=BM25_K1, b=BM25_B, avgdl=None):
+    """
+    Menghitung bobot BM25 per (dokumen, term) dari matriks BoW.
+
+    Bobot = idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * panjang_dokumen / avgdl)),
+    sehingga skor BM25 sebuah query adalah jumlah bobot term-term query.
+
+    Parameters:
+    -----------
+    count_matrix : scipy.sparse matrix
+        Matriks BoW (baris = dokumen, kolom = term).
+    idf : numpy.ndarray
+        IDF BM25 per term (lihat `bm25_idf`).
+    k1 : float, optional
+        Saturasi frekuensi term. Default adalah 1.2.
+    b : float, optional
+        Kekuatan normalisasi panjang dokumen (0 sampai 1). Default adalah 0.75.
+    avgdl : float, optional
+        Rata-rata panjang dokumen. Default dihitung dari `count_matrix`.
+
+    Returns:
+    --------
+    scipy.sparse.csr_matrix
+        Matriks bobot BM25 (float64) dengan indeks kolom terurut.
+    """
+    weights = sparse.csr_matrix(count_matrix).astype(np.float64)
+    doc_lengths = np.asarray(weights.sum(axis=1)).ravel()
+    if avgdl is None:
+        avgdl = doc_lengths.mean() if doc_lengths.size else 0.0
+    length_norm = k1 * (1 - b + b * doc_lengths / avgdl) if avgdl > 0 else np.full(doc_lengths.shape, k1)
+
+    tf = weights.data
+    row_norm = np.repeat(length_norm, np.diff(weights.indptr))
+    weights.data = idf[weights.indices] * tf * (k1 + 1) / (tf + row_norm)
+    weights.sort_indices()
+    return weights
+
+
+class BM25Index(ScoringIndex):
+    """
+    Indeks siap-skor untuk peringkat BM25, dibangun langsung dari matriks BoW.
+
+    Panjang dokumen, rata-rata panjang, dan IDF dihitung sekali saat indeks dibangun
+    dan dilipat ke dalam bobot per posting (lihat `bm25_weights`). Skor query adalah
+    jumlah bobot term query dikalikan frekuensinya di query, sehingga penilaian
+    memakai jalur posting dan perkalian matriks sparse yang sama dengan `ScoringIndex`,
+    tanpa normalisasi L2. `from_normalized` menerima matriks bobot BM25 yang sudah
+    dihitung (misalnya dari disk).
+
+    Parameters:
+    -----------
+    vectorizer : CountVectorizer
+        Objek vectorizer BoW yang sudah di-fit.
+    count_matrix : scipy.sparse.csr_matrix
+        Matriks BoW dari seluruh dokumen.
+    k1 : float, optional
+        Saturasi frekuensi term. Default adalah 1.2.
+    b : float, optional
+        Kekuatan normalisasi panjang dokumen. Default adalah 0.75.
+    """
+
+    def __init__(self, vectorizer, count_matrix, k1=BM25_K1, b=BM25_B):
+        count_matrix = sparse.csr_matrix(count_matrix)
+        n_docs, n_terms = count_matrix.shape
+        self.k1 = k1
+        self.b = b
+        self.idf = bm25_idf(np.bincount(count_matrix.indices, minlength=n_terms), n_docs)
+
+        weights = bm25_weights(count_matrix, self.idf, k1=k1, b=b)
+        postings = weights.tocsc()
+        postings.sort_indices()
+        self._attach(vectorizer, weights, postings)
+
+    def transform_many(self, queries):
+        """
+        Mengubah banyak query yang sudah diproses menjadi matriks frekuensi term
+        (n_queries x n_terms) tanpa normalisasi.
+        """
+        return sparse.csr_matrix(self.vectorizer.transform(queries), dtype=np.float64)
+
+def select_top_k(doc_indices, scores, top_k=10, min_score=0.01):
+    """
+    Memilih k dokumen dengan skor tertinggi tanpa mengurutkan seluruh skor.
+
+    Hanya skor yang melebihi `min_score` yang dipertimbangkan. Skor ke-k dicari
+    dengan seleksi parsial `numpy.partition` (O(n)), lalu hanya kandidat dengan skor
+    setidaknya sebesar itu yang diurutkan. Skor yang sama diurutkan berdasarkan
+    indeks dokumen terkecil, sehingga hasilnya sama dengan pengurutan penuh.
+
+    Parameters:
+    -----------
+    doc_indices : numpy.ndarray
+        Indeks dokumen kandidat.
+    scores : numpy.ndarray
+        Skor untuk setiap dokumen kandidat.
+    top_k : int or None, optional
+        Jumlah hasil maksimum. None berarti semua kandidat di atas ambang batas. Default adalah 10.
+    min_score : float, optional
+        Skor minimum (eksklusif) agar dokumen dianggap relevan. Default adalah 0.01.
+
+    Returns:
+    --------
+    numpy.ndarray
+        Indeks dokumen terpilih, terurut dari skor tertinggi.
+    numpy.ndarray
+        Skor untuk setiap dokumen terpilih.
+    """
+    doc_indices = np.asarray(doc_indices)
+    scores = np.asarray(scores)
+
+    # Buang kandidat yang tidak relevan sebelum seleksi
+    relevant = scores > min_score
+    doc_indices = doc_indices[relevant]
+    scores = scores[relevant]
+
+    if top_k is not None:
+        if top_k <= 0:
+            return doc_indices[:0], scores[:0]
+        if scores.size > top_k:
+            # Pertahankan semua kandidat dengan skor sama dengan skor ke-k, agar skor
+            # yang sama tetap dipilih berdasarkan indeks dokumen terkecil
+            kth_score = -np.partition(-scores, top_k - 1)[top_k - 1]
+            candidates = scores >= kth_score
+            doc_indices = doc_indices[candidates]
+            scores = scores[candidates]
+
+    order = np.lexsort((doc_indices, -scores))[:top_k]
+    return doc_indices[order], scores[order]
+
+
+# Jumlah shard default (1 = tanpa sharding)
+DEFAULT_N_SHARDS = 1
+
+# Jumlah thread penilaian shard (dapat diubah melalui variabel lingkungan)
+SCORING_THREADS = int(os.environ.get('IR_SCORING_THREADS', 0)) or available_cpus()
+
+_scoring_pool = None
+_scoring_pool_lock = threading.Lock()
+
+
+def scoring_pool():
+    """
+    Mengembalikan thread pool bersama untuk penilaian shard (dibuat saat pertama dipakai).
+    """
+    global _scoring_pool
+    with _scoring_pool_lock:
+        if _scoring_pool is None:
+            _scoring_pool = ThreadPoolExecutor(max_workers=SCORING_THREADS, thread_name_prefix='ir-scoring')
+        return _scoring_pool
+
+
+class ShardedIndex:
+    """
+    Indeks yang dibagi menjadi beberapa shard baris (dokumen) yang dinilai bersamaan.
+
+    Setiap shard adalah indeks siap-skor dengan jenis yang sama (`ScoringIndex` atau
+    `BM25Index`) untuk rentang dokumen yang berurutan, dengan vectorizer dan bobot
+    yang sama dengan indeks asal, sehingga skor per dokumen identik. Query diubah
+    menjadi vektor satu kali, lalu setiap shard dinilai di thread pool bersama
+    (`scoring_pool`): thread berbagi memori proses, sehingga array posting shard tidak
+    disalin per query, dan operasi NumPy/SciPy berat melepas GIL. Setiap shard memilih
+    k kandidat teratasnya sendiri dan hasilnya digabung menjadi top-k global.
+
+    Parameters:
+    -----------
+    index : ScoringIndex
+        Indeks yang akan dibagi (misalnya hasil `compact_index`).
+    n_shards : int
+        Jumlah shard. Dibatasi oleh jumlah dokumen.
+    """
+
+    def __init__(self, index, n_shards):
+        postings = sparse.csc_matrix(index.postings)
+        n_docs = postings.shape[0]
+        n_shards = max(1, min(int(n_shards), n_docs))
+        rows = postings.tocsr()
+        self.offsets = np.linspace(0, n_docs, n_shards + 1).astype(np.int64)
+        self.shards = []
+        for start, end in zip(self.offsets[:-1], self.offsets[1:]):
+            shard_postings = rows[start:end].tocsc()
+            shard_postings.sort_indices()
+            shard = type(index).from_normalized(index.vectorizer, None, shard_postings)
+            for name in ('k1', 'b', 'idf'):
+                if hasattr(index, name):
+                    setattr(shard, name, getattr(index, name))
+            self.shards.append(shard)
+        self.vectorizer = index.vectorizer
+        self.n_docs, self.n_terms = postings.shape
+        self.nnz = postings.nnz
+
+    @property
+    def n_shards(self):
+        return len(self.shards)
+
+    def transform(self, query):
+        """
+        Mengubah query menjadi vektor dengan cara yang sama seperti indeks asal.
+        """
+        return self.shards[0].transform(query)
+
+    def transform_many(self, queries):
+        """
+        Mengubah banyak query menjadi matriks dengan cara yang sama seperti indeks asal.
+        """
+        return self.shards[0].transform_many(queries)
+
+    def _map(self, func, *args):
+        if len(self.shards) == 1:
+            return [func(self.shards[0], *args)]
+        pool = scoring_pool()
+        return list(pool.map(lambda shard: func(shard, *args), self.shards))
+
+    def score(self, query_vector):
+        """
+        Menghitung skor semua shard secara paralel (lihat `ScoringIndex.score`).
+        """
+        parts = self._map(ScoringIndex.score, sparse.csr_matrix(query_vector))
+        doc_indices = np.concatenate([docs + offset for (docs, _), offset in zip(parts, self.offsets)])
+        return doc_indices, np.concatenate([scores for _, scores in parts])
+
+    def score_top_k(self, query_vector, top_k=10, min_score=0.01):
+        """
+        Menilai semua shard secara paralel dan memilih k kandidat teratas di setiap shard.
+
+        Top-k global selalu termasuk di antara gabungan top-k per shard, sehingga
+        `select_top_k` atas hasil ini sama dengan seleksi atas seluruh skor.
+
+        Returns:
+        --------
+        numpy.ndarray
+            Indeks dokumen kandidat (gabungan top-k per shard).
+        numpy.ndarray
+            Skor untuk setiap kandidat.
+        int
+            Jumlah dokumen yang dinilai di semua shard.
+        """
+        def shard_top_k(shard, query_vector):
+            doc_indices, scores = shard.score(query_vector)
+            return doc_indices.size, select_top_k(doc_indices, scores, top_k=top_k, min_score=min_score)
+
+        parts = self._map(shard_top_k, sparse.csr_matrix(query_vector))
+        doc_indices = np.concatenate([docs + offset for (_, (docs, _)), offset in zip(parts, self.offsets)])
+        scores = np.concatenate([scores for _, (_, scores) in parts])
+        return doc_indices, scores, sum(n_candidates for n_candidates, _ in parts)
+
+    def score_many(self, query_matrix):
+        """
+        Menghitung matriks skor n_queries x n_docs dengan menilai semua shard secara
+        paralel (lihat `ScoringIndex.score_many`).
+        """
+        blocks = self._map(ScoringIndex.score_many, sparse.csr_matrix(query_matrix))
+        return sparse.hstack(blocks, format='csr') if len(blocks) > 1 else blocks[0]
@@ -0,0 +1,119 @@
+# Pembacaan dataset besar secara bertahap (streaming) per potongan baris.
+# Hanya kolom yang dibutuhkan untuk tampilan hasil pencarian yang disimpan,
+# sehingga memori puncak bergantung pada ukuran potongan, bukan ukuran dataset.
+from contextlib import nullcontext
+
+import pandas as pd
+
+from ir_logic.preprocessing import DEFAULT_N_JOBS, preprocess_corpus, preprocess_pool
+from ir_logic.display import SNIPPET_LENGTH, TITLE_COLUMN
+from ir_logic.vectorization import IncrementalBowBuilder
+
+# Jumlah baris per potongan default
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def read_columns(filepath):
+    """
+    Membaca nama kolom dataset tanpa memuat isinya (CSV: header, JSONL: baris pertama).
+    """
+    if filepath.endswith('.csv'):
+        return pd.read_csv(filepath, nrows=0).columns.tolist()
+    elif filepath.endswith('.json'):
+        return pd.read_json(filepath, lines=True, nrows=1).columns.tolist()
+    else:
+        raise ValueError("Unsupported file format")
+
+
+def iter_dataset_chunks(filepath, columns, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Membaca dataset CSV/JSONL per potongan `chunk_size` baris, hanya untuk `columns`.
+
+    Kolom dibaca sebagai teks (object) agar tipe data tidak berubah antar potongan.
+    """
+    if filepath.endswith('.csv'):
+        reader = pd.read_csv(filepath, usecols=columns, dtype={column: object for column in columns},
+                             chunksize=chunk_size)
+    elif filepath.endswith('.json'):
+        reader = pd.read_json(filepath, lines=True, chunksize=chunk_size, dtype=False)
+    else:
+        raise ValueError("Unsupported file format")
+
+    with reader:
+        for chunk in reader:
+            # Baris JSONL boleh tidak memiliki semua kolom
+            yield chunk.reindex(columns=columns)
+
+
+def display_columns(filepath, search_column):
+    """
+    Menentukan kolom yang perlu disimpan untuk tampilan: judul (jika ada) dan kolom pencarian.
+    """
+    columns = read_columns(filepath)
+    if search_column not in columns:
+        raise ValueError(f"Column '{search_column}' not found in the dataset.")
+    if TITLE_COLUMN in columns and TITLE_COLUMN != search_column:
+        return [TITLE_COLUMN, search_column]
+    return [search_column]
+
+
+def display_chunk(chunk, search_column):
+    """
+    Memotong kolom pencarian menjadi cuplikan yang akan ditampilkan, bukan teks lengkap.
+    """
+    display = chunk.copy()
+    display[search_column] = display[search_column].map(
+        lambda text: text[:SNIPPET_LENGTH] if isinstance(text, str) else text
+    )
+    return display
+
+
+def _concat_display(parts, columns):
+    if not parts:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_display_frame(filepath, search_column, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Membaca hanya kolom tampilan dataset (judul dan cuplikan teks) secara bertahap.
+
+    Mengembalikan:
+    --------
+    pandas.DataFrame
+        DataFrame dengan kolom judul (jika ada) dan kolom pencarian yang sudah dipotong
+        menjadi cuplikan; urutan baris sama dengan dataset.
+    """
+    columns = display_columns(filepath, search_column)
+    parts = [display_chunk(chunk, search_column) for chunk in iter_dataset_chunks(filepath, columns, chunk_size)]
+    return _concat_display(parts, columns)
+
+
+def ingest_dataset(filepath, search_column, chunk_size=DEFAULT_CHUNK_SIZE, language='auto', use_spacy=True,
+                   apply_stemming=True, apply_lemmatization=False, n_jobs=None, tokenizer='nltk'):
+    """
+    Membaca, memproses, dan mem-vektorisasi dataset secara bertahap per potongan.
+
+    Setiap potongan dibaca, diproses dengan `preprocess_corpus`, lalu ditambahkan ke
+    `IncrementalBowBuilder`. Teks lengkap dan teks hasil preprocessing tidak disimpan
+    setelah potongannya selesai diproses; hanya kolom tampilan yang dipertahankan.
+    Semua potongan memakai satu process pool (lihat `preprocess_pool`).
+
+    Mengembalikan:
+    --------
+    tuple
+        (DataFrame tampilan, (CountVectorizer, matriks BoW))
+    """
+    columns = display_columns(filepath, search_column)
+    builder = IncrementalBowBuilder(fast_tokenizer=tokenizer == 'fast')
+    parts = []
+    n_jobs = n_jobs or DEFAULT_N_JOBS
+    # Worker baru dijalankan saat potongan pertama yang cukup besar dikirim ke pool
+    with preprocess_pool(n_jobs) if n_jobs > 1 else nullcontext() as executor:
+        for chunk in iter_dataset_chunks(filepath, columns, chunk_size):
+            processed_text = preprocess_corpus(chunk[search_column], language=language, use_spacy=use_spacy,
+                                               apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization,
+                                               n_jobs=n_jobs, tokenizer=tokenizer, executor=executor)
+            builder.partial_fit(processed_text)
+            parts.append(display_chunk(chunk, search_column))
+    return _concat_display(parts, columns), builder.finalize()
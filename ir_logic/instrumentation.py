@@ -0,0 +1,148 @@
+# Instrumentasi per tahap untuk pencarian: waktu, cache hit/miss, ukuran matriks,
+# dan perubahan memori. Fungsi-fungsi di sistem mencatat tahapnya ke jejak (trace)
+# yang sedang aktif; jika tidak ada jejak aktif, pencatatan tidak melakukan apa-apa.
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+
+_current_trace = contextvars.ContextVar('ir_search_trace', default=None)
+
+# Sink metrik global opsional (lihat `set_metrics_sink`)
+_metrics_sink = None
+
+try:
+    _PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+def current_rss():
+    """
+    Mengembalikan ukuran memori proses (RSS) saat ini dalam byte, atau None jika
+    tidak tersedia (hanya dibaca dari /proc di Linux).
+    """
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def available_cpus():
+    """
+    Mengembalikan jumlah CPU yang boleh dipakai proses ini (menghormati CPU affinity
+    jika tersedia), minimal 1.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+class SearchTrace:
+    """
+    Catatan instrumentasi untuk satu pencarian.
+
+    Attributes:
+    -----------
+    timings : dict
+        Waktu (detik) per tahap; tahap yang sama dijumlahkan.
+    memory : dict
+        Perubahan RSS (byte) per tahap.
+    cache : dict
+        Status cache per lapisan ('hit' atau 'miss').
+    stats : dict
+        Statistik lain seperti dimensi matriks dan jumlah elemen non-nol.
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.memory = {}
+        self.cache = {}
+        self.stats = {}
+
+    def as_dict(self):
+        """
+        Mengembalikan {'timings': ..., 'stats': ...} untuk hasil pencarian.
+        """
+        return {
+            'timings': dict(self.timings),
+            'stats': {**self.stats, 'cache': dict(self.cache), 'memory': dict(self.memory)}
+        }
+
+
+@contextmanager
+def trace_search():
+    """
+    Mengaktifkan jejak baru selama blok berjalan; total waktu dicatat sebagai 'total'.
+    """
+    trace = SearchTrace()
+    token = _current_trace.set(trace)
+    start = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.timings['total'] = time.perf_counter() - start
+        _current_trace.reset(token)
+
+
+@contextmanager
+def stage(name):
+    """
+    Mencatat waktu dan perubahan RSS sebuah tahap ke jejak yang aktif.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    rss_before = current_rss()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.timings[name] = trace.timings.get(name, 0.0) + time.perf_counter() - start
+        rss_after = current_rss()
+        if rss_before is not None and rss_after is not None:
+            trace.memory[name] = trace.memory.get(name, 0) + rss_after - rss_before
+
+
+def record_cache(layer, hit):
+    """
+    Mencatat hit/miss sebuah lapisan cache ke jejak yang aktif. Jika lapisan yang
+    sama dibaca beberapa kali, status 'miss' dipertahankan.
+    """
+    trace = _current_trace.get()
+    if trace is not None and trace.cache.get(layer) != 'miss':
+        trace.cache[layer] = 'hit' if hit else 'miss'
+
+
+def record_stats(**values):
+    """
+    Mencatat statistik (misalnya dimensi matriks) ke jejak yang aktif.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.stats.update(values)
+
+
+def set_metrics_sink(sink):
+    """
+    Menetapkan sink metrik global: callable yang menerima satu dict per pencarian
+    (misalnya untuk mengirim ke StatsD/Prometheus/log). Berikan None untuk menonaktifkan.
+    """
+    global _metrics_sink
+    _metrics_sink = sink
+
+
+def emit_metrics(record, sink=None):
+    """
+    Mengirim record metrik ke `sink` (atau sink global). Kesalahan di sink tidak
+    menggagalkan pencarian.
+    """
+    sink = sink or _metrics_sink
+    if sink is None:
+        return
+    try:
+        sink(record)
+    except Exception as e:
+        print(f"Gagal mengirim metrik ke sink: {e}")
@@ -1,165 +1,593 @@
 import re
-import nltk
-import spacy
 import pandas as pd # Tambahkan import pandas di sini
 import os # Tambahkan import os di sini
 import json # Tambahkan import json di sini
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
-from nltk.corpus import stopwords
-from nltk.stem import PorterStemmer
-from nltk.tokenize import word_tokenize
+from ir_logic.instrumentation import available_cpus
 
-# Dictionary untuk menyimpan model spaCy berdasarkan bahasa
+# spaCy dan NLTK tidak diimpor di level modul. Model spaCy, stopwords, stemmer,
+# dan tokenizer dimuat saat pertama kali dibutuhkan, sehingga `import ir_system`
+# tetap cepat dan tidak pernah mencoba mengunduh apa pun dari jaringan.
+
+# Dictionary untuk menyimpan model spaCy berdasarkan bahasa (diisi oleh get_nlp)
 nlp_models = {}
 
-# Coba muat model spaCy untuk bahasa Indonesia
-try:
-    nlp_models['id'] = spacy.load('id_core_news_sm')
-    print("Model spaCy untuk bahasa Indonesia berhasil dimuat.")
-except (OSError, ImportError):
-    try:
-        nlp_models['id'] = spacy.blank('id')
-        print("Menggunakan model spaCy blank untuk bahasa Indonesia. Lemmatization mungkin tidak optimal.")
-        print("Untuk hasil terbaik, install model bahasa Indonesia dengan: python -m spacy download id_core_news_sm")
-    except (OSError, ImportError):
-        nlp_models['id'] = None
-        print("Model spaCy untuk bahasa Indonesia tidak tersedia. Lemmatization tidak akan berfungsi.")
-        print("Untuk mengaktifkan lemmatization, install spaCy dan model bahasa dengan: pip install spacy dan python -m spacy download id_core_news_sm")
-
-# Coba muat model spaCy untuk bahasa Inggris
-try:
-    nlp_models['en'] = spacy.load('en_core_web_sm')
-    print("Model spaCy untuk bahasa Inggris berhasil dimuat.")
-except (OSError, ImportError):
-    try:
-        nlp_models['en'] = spacy.blank('en')
-        print("Menggunakan model spaCy blank untuk bahasa Inggris. Lemmatization mungkin tidak optimal.")
-        print("Untuk hasil terbaik, install model bahasa Inggris dengan: python -m spacy download en_core_web_sm")
-    except (OSError, ImportError):
-        nlp_models['en'] = None
-        print("Model spaCy untuk bahasa Inggris tidak tersedia. Lemmatization tidak akan berfungsi.")
-        print("Untuk mengaktifkan lemmatization, install spaCy dan model bahasa dengan: pip install spacy dan python -m spacy download en_core_web_sm")
-
-# Untuk kompatibilitas dengan kode lama
-nlp = nlp_models.get('id')
-
-# Unduh data NLTK yang diperlukan
-try:
-    stopwords.words('english')
-except LookupError:
-    nltk.download('stopwords')
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-try:
-    nltk.data.find('tokenizers/punkt_tab')
-except LookupError:
-    nltk.download('punkt_tab')
-
-# Coba mendapatkan stopwords bahasa Indonesia
-try:
-    id_stop_words = set(stopwords.words('indonesian'))
-except LookupError:
-    try:
-        nltk.download('stopwords')
-        id_stop_words = set(stopwords.words('indonesian'))
-    except:
-        id_stop_words = set([
-            'ada', 'adalah', 'adanya', 'adapun', 'agak', 'agaknya', 'agar', 'akan', 'akankah', 'akhir', 
-            'akhiri', 'akhirnya', 'aku', 'akulah', 'amat', 'amatlah', 'anda', 'andalah', 'antar', 'antara',
-            'antaranya', 'apa', 'apaan', 'apabila', 'apakah', 'apalagi', 'apatah', 'artinya', 'asal', 'asalkan',
-            'atas', 'atau', 'ataukah', 'ataupun', 'awal', 'awalnya', 'bagai', 'bagaikan', 'bagaimana', 'bagaimanakah',
-            'bagaimanapun', 'bagi', 'bagian', 'bahkan', 'bahwa', 'bahwasanya', 'baik', 'bakal', 'bakalan', 'balik',
-            'banyak', 'bapak', 'baru', 'bawah', 'beberapa', 'begini', 'beginian', 'beginikah', 'beginilah', 'begitu',
-            'begitukah', 'begitulah', 'begitupun', 'bekerja', 'belakang', 'belakangan', 'belum', 'belumlah', 'benar',
-            'benarkah', 'benarlah', 'berada', 'berakhir', 'berakhirlah', 'berakhirnya', 'berapa', 'berapakah',
-            'berapalah', 'berapapun', 'berarti', 'berawal', 'berbagai', 'berdatangan', 'beri', 'berikan', 'berikut',
-            'berikutnya', 'berjumlah', 'berkali-kali', 'berkata', 'berkehendak', 'berkeinginan', 'berkenaan',
-            'berlainan', 'berlalu', 'berlangsung', 'berlebihan', 'bermacam', 'bermacam-macam', 'bermaksud',
-            'bermula', 'bersama', 'bersama-sama', 'bersiap', 'bersiap-siap', 'bertanya', 'bertanya-tanya', 'berturut',
-            'berturut-turut', 'bertutur', 'berujar', 'berupa', 'besar', 'betul', 'betulkah', 'biasa', 'biasanya',
-            'bila', 'bilakah', 'bisa', 'bisakah', 'boleh', 'bolehkah', 'bolehlah', 'buat', 'bukan', 'bukankah',
-            'bukanlah', 'bukannya', 'bulan', 'bung', 'cara', 'caranya', 'cukup', 'cukupkah', 'cukuplah', 'cuma',
-            'dahulu', 'dalam', 'dan', 'dapat', 'dari', 'daripada', 'datang', 'dekat', 'demi', 'demikian',
-            'demikianlah', 'dengan', 'depan', 'di', 'dia', 'diakhiri', 'diakhirinya', 'dialah', 'diantara',
-            'diantaranya', 'diberi', 'diberikan', 'diberikannya', 'dibuat', 'dibuatnya', 'didapat',
-            'didatangkan', 'digunakan', 'diibaratkan', 'diibaratkannya', 'diingat', 'diingatkan', 'diinginkan',
-            'dijawab', 'dijelaskan', 'dijelaskannya', 'dikarenakan', 'dikatakan', 'dikatakannya', 'dikerjakan',
-            'diketahui', 'diketahuinya', 'dikira', 'dilakukan', 'dilalui', 'dilihat', 'dimaksud', 'dimaksudkan',
-            'dimaksudkannya', 'dimaksudnya', 'diminta', 'dimintai', 'dimisalkan', 'dimulai', 'dimulailah',
-            'dimulainya', 'dimungkinkan', 'dini', 'dipastikan', 'diperbuat', 'diperbuatnya', 'dipergunakan',
-            'diperkirakan', 'diperlihatkan', 'diperlukan', 'diperlukannya', 'dipersoalkan', 'dipertanyakan',
-            'dipunyai', 'diri', 'dirinya', 'disampaikan', 'disebut', 'disebutkan', 'disebutkannya', 'disini',
-            'disinilah', 'ditambahkan', 'ditandaskan', 'ditanya', 'ditanyai', 'ditanyakan', 'ditegaskan',
-            'ditujukan', 'ditunjuk', 'ditunjuki', 'ditunjukkan', 'ditunjukkannya', 'ditunjuknya', 'dituturkan',
-            'dituturkannya', 'diucapkan', 'diucapkannya', 'diungkapkan', 'dong', 'dua', 'dulu', 'empat', 'enggak',
-            'enggaknya', 'entah', 'entahlah', 'guna', 'gunakan', 'hal', 'hampir', 'hanya', 'hanyalah', 'hari',
-            'harus', 'haruslah', 'harusnya', 'hendak', 'hendaklah', 'hendaknya', 'hingga', 'ia', 'ialah', 'ibarat',
-            'ibaratkan', 'ibaratnya', 'ibu', 'ikut', 'ingat', 'ingat-ingat', 'ingin', 'inginkah', 'inginkan', 'ini',
-            'inikah', 'inilah', 'itu', 'itukah', 'itulah', 'jadi', 'jadilah', 'jadinya', 'jangan', 'jangankan',
-            'janganlah', 'jauh', 'jawab', 'jawaban', 'jawabnya', 'jelas', 'jelaskan', 'jelaslah', 'jelasnya',
-            'jika', 'jikalau', 'juga', 'jumlah', 'jumlahnya', 'justru', 'kala', 'kalau', 'kalaulah', 'kalaupun',
-            'kalian', 'kami', 'kamilah', 'kamu', 'kamulah', 'kan', 'kapan', 'kapankah', 'kapanpun', 'karena',
-            'karenanya', 'kasus', 'kata', 'katakan', 'katakanlah', 'katanya', 'ke', 'keadaan', 'kebetulan',
-            'kecil', 'kedua', 'keduanya', 'keinginan', 'kelamaan', 'kelihatan', 'kelihatannya', 'kelima',
-            'keluar', 'kembali', 'kemudian', 'kemungkinan', 'kemungkinannya', 'kenapa', 'kepada', 'kepadanya',
-            'kesamaan', 'keseluruhan', 'keseluruhannya', 'keterlaluan', 'ketika', 'khususnya', 'kini', 'kinilah',
-            'kira', 'kira-kira', 'kiranya', 'kita', 'kitalah', 'kok', 'kurang', 'lagi', 'lagian', 'lah', 'lain',
-            'lainnya', 'lalu', 'lama', 'lamanya', 'lanjut', 'lanjutnya', 'lebih', 'lewat', 'lima', 'luar', 'macam',
-            'maka', 'makanya', 'makin', 'malah', 'malahan', 'mampu', 'mampukah', 'mana', 'manakala', 'manalagi',
-            'masa', 'masalah', 'masalahnya', 'masih', 'masihkah', 'masing', 'masing-masing', 'mau', 'maupun',
-            'melainkan', 'melakukan', 'melalui', 'melihat', 'melihatnya', 'memang', 'memastikan', 'memberi',
-            'memberikan', 'membuat', 'memerlukan', 'memihak', 'meminta', 'memintakan', 'memisalkan', 'memperbuat',
-            'mempergunakan', 'memperkirakan', 'memperlihatkan', 'mempersiapkan', 'mempersoalkan', 'mempertanyakan',
-            'mempunyai', 'memulai', 'memungkinkan', 'menaiki', 'menambahkan', 'menandaskan', 'menanti', 'menanti-nanti',
-            'menantikan', 'menanya', 'menanyai', 'menanyakan', 'mendapat', 'mendapatkan', 'mendatang', 'mendatangi',
-            'mendatangkan', 'menegaskan', 'mengakhiri', 'mengapa', 'mengatakan', 'mengatakannya', 'mengenai',
-            'mengerjakan', 'mengetahui', 'menggunakan', 'menghendaki', 'mengibaratkan', 'mengibaratkannya',
-            'mengingat', 'mengingatkan', 'menginginkan', 'mengira', 'mengucapkan', 'mengucapkannya', 'mengungkapkan',
-            'menjadi', 'menjawab', 'menjelaskan', 'menuju', 'menunjuk', 'menunjuki', 'menunjukkan', 'menunjuknya',
-            'menurut', 'menuturkan', 'menyampaikan', 'menyangkut', 'menyatakan', 'menyebutkan', 'menyeluruh',
-            'menyiapkan', 'merasa', 'mereka', 'merekalah', 'merupakan', 'meski', 'meskipun', 'meyakini', 'meyakinkan',
-            'minta', 'mirip', 'misal', 'misalkan', 'misalnya', 'mula', 'mulai', 'mulailah', 'mulanya', 'mungkin',
-            'mungkinkah', 'nah', 'naik', 'namun', 'nanti', 'nantinya', 'nyaris', 'nyatanya', 'oleh', 'olehnya',
-            'pada', 'padahal', 'padanya', 'pak', 'paling', 'panjang', 'pantas', 'para', 'pasti', 'pastilah',
-            'penting', 'pentingnya', 'per', 'percuma', 'perlu', 'perlukah', 'perlunya', 'pernah', 'persoalan',
-            'pertama', 'pertama-tama', 'pertanyaan', 'pertanyakan', 'pihak', 'pihaknya', 'pukul', 'pula', 'pun',
-            'punya', 'rasa', 'rasanya', 'rata', 'rupanya', 'saat', 'saatnya', 'saja', 'sajalah', 'saling', 'sama',
-            'sama-sama', 'sambil', 'sampai', 'sampai-sampai', 'sampaikan', 'sana', 'sangat', 'sangatlah', 'satu',
-            'saya', 'sayalah', 'se', 'sebab', 'sebabnya', 'sebagai', 'sebagaimana', 'sebagainya', 'sebagian',
-            'sebaik', 'sebaik-baiknya', 'sebaiknya', 'sebaliknya', 'sebanyak', 'sebegini', 'sebegitu', 'sebelum',
-            'sebelumnya', 'sebenarnya', 'seberapa', 'sebesar', 'sebetulnya', 'sebisanya', 'sebuah', 'sebut',
-            'sebutlah', 'sebutnya', 'secara', 'secukupnya', 'sedang', 'sedangkan', 'sedemikian', 'sedikit',
-            'sedikitnya', 'seenaknya', 'segala', 'segalanya', 'segera', 'seharusnya', 'sehingga', 'seingat',
-            'sejak', 'sejauh', 'sejenak', 'sejumlah', 'sekadar', 'sekadarnya', 'sekali', 'sekali-kali', 'sekalian',
-            'sekaligus', 'sekalipun', 'sekarang', 'sekarang', 'sekecil', 'seketika', 'sekiranya', 'sekitar',
-            'sekitarnya', 'sekurang-kurangnya', 'sekurangnya', 'sela', 'selain', 'selaku', 'selalu', 'selama',
-            'selama-lamanya', 'selamanya', 'selanjutnya', 'seluruh', 'seluruhnya', 'semacam', 'semakin', 'semampu',
-            'semampunya', 'semasa', 'semasih', 'semata', 'semata-mata', 'semaunya', 'sementara', 'semisal', 'semisalnya',
-            'sempat', 'semua', 'semuanya', 'semula', 'sendiri', 'sendirian', 'sendirinya', 'seolah', 'seolah-olah',
-            'seorang', 'sepanjang', 'sepantasnya', 'sepantasnyalah', 'seperlunya', 'seperti', 'sepertinya', 'sepihak',
-            'sering', 'seringnya', 'serta', 'serupa', 'sesaat', 'sesama', 'sesampai', 'sesegera', 'sesekali',
-            'seseorang', 'sesuatu', 'sesuatunya', 'sesudah', 'sesudahnya', 'setelah', 'setempat', 'setengah',
-            'seterusnya', 'setiap', 'setiba', 'setibanya', 'setidak-tidaknya', 'setidaknya', 'setinggi', 'seusai',
-            'sewaktu', 'siap', 'siapa', 'siapakah', 'siapapun', 'sini', 'sinilah', 'soal', 'soalnya', 'suatu',
-            'sudah', 'sudahkah', 'sudahlah', 'supaya', 'tadi', 'tadinya', 'tahu', 'tahun', 'tak', 'tambah',
-            'tambahnya', 'tampak', 'tampaknya', 'tandas', 'tandasnya', 'tanpa', 'tanya', 'tanyakan', 'tanyanya',
-            'tapi', 'tegas', 'tegasnya', 'telah', 'tempat', 'tengah', 'tentang', 'tentu', 'tentulah', 'tentunya',
-            'tepat', 'terakhir', 'terasa', 'terbanyak', 'terdahulu', 'terdapat', 'terdiri', 'terhadap', 'terhadapnya',
-            'teringat', 'teringat-ingat', 'terjadi', 'terjadilah', 'terjadinya', 'terkira', 'terlalu', 'terlebih',
-            'terlihat', 'termasuk', 'ternyata', 'tersampaikan', 'tersebut', 'tersebutlah', 'tertentu', 'tertuju',
-            'terus', 'terutama', 'tetap', 'tetapi', 'tiap', 'tiba', 'tiba-tiba', 'tidak', 'tidakkah', 'tidaklah',
-            'tiga', 'tinggi', 'toh', 'tunjuk', 'turut', 'tutur', 'tuturnya', 'ucap', 'ucapnya', 'ujar', 'ujarnya',
-            'umum', 'umumnya', 'ungkap', 'ungkapnya', 'untuk', 'usah', 'usai', 'waduh', 'wah', 'wahai', 'waktu',
-            'waktunya', 'walau', 'walaupun', 'wong', 'yaitu', 'yakin', 'yakni', 'yang'
-        ])
-
-stemmer = PorterStemmer()
-# Gabungkan stopwords bahasa Inggris dan Indonesia
-stop_words = set(stopwords.words('english')).union(id_stop_words)
-
-def preprocess_text(text, language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False, return_details=False):
+# Nama paket model spaCy per bahasa
+SPACY_MODEL_NAMES = {'id': 'id_core_news_sm', 'en': 'en_core_web_sm'}
+LANGUAGE_LABELS = {'id': 'Indonesia', 'en': 'Inggris'}
+
+_load_lock = threading.Lock()
+
+
+def get_nlp(language):
+    """
+    Mengembalikan model spaCy untuk bahasa tertentu, memuatnya saat pertama kali diminta.
+
+    Jika model terlatih tidak terpasang, digunakan model blank; jika spaCy tidak
+    tersedia sama sekali, dikembalikan None. Hasilnya disimpan di `nlp_models`.
+
+    Parameter:
+    -----------
+    language : str
+        Kode bahasa ('id' atau 'en'). Bahasa lain mengembalikan None.
+
+    Mengembalikan:
+    -----------
+    spacy.Language or None
+        Model spaCy untuk bahasa tersebut.
+    """
+    if language in nlp_models:
+        return nlp_models[language]
+    if language not in SPACY_MODEL_NAMES:
+        return None
+
+    with _load_lock:
+        if language in nlp_models:
+            return nlp_models[language]
+
+        model_name = SPACY_MODEL_NAMES[language]
+        label = LANGUAGE_LABELS[language]
+        try:
+            import spacy
+            nlp_models[language] = spacy.load(model_name)
+            print(f"Model spaCy untuk bahasa {label} berhasil dimuat.")
+        except (OSError, ImportError):
+            try:
+                import spacy
+                nlp_models[language] = spacy.blank(language)
+                print(f"Menggunakan model spaCy blank untuk bahasa {label}. Lemmatization mungkin tidak optimal.")
+                print(f"Untuk hasil terbaik, install model bahasa {label} dengan: python -m spacy download {model_name}")
+            except (OSError, ImportError):
+                nlp_models[language] = None
+                print(f"Model spaCy untuk bahasa {label} tidak tersedia. Lemmatization tidak akan berfungsi.")
+                print(f"Untuk mengaktifkan lemmatization, install spaCy dan model bahasa dengan: pip install spacy dan python -m spacy download {model_name}")
+        return nlp_models[language]
+
+
+# Daftar stopwords bawaan, dipakai jika data stopwords NLTK tidak terpasang
+EN_STOP_WORDS_FALLBACK = frozenset([
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', "you're", "you've", "you'll", "you'd",
+    'your', 'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', "she's", 'her', 'hers',
+    'herself', 'it', "it's", 'its', 'itself', 'they', 'them', 'their', 'theirs', 'themselves', 'what',
+    'which', 'who', 'whom', 'this', 'that', "that'll", 'these', 'those', 'am', 'is', 'are', 'was', 'were',
+    'be', 'been', 'being', 'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an', 'the',
+    'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of', 'at', 'by', 'for', 'with', 'about',
+    'against', 'between', 'into', 'through', 'during', 'before', 'after', 'above', 'below', 'to', 'from',
+    'up', 'down', 'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then', 'once', 'here',
+    'there', 'when', 'where', 'why', 'how', 'all', 'any', 'both', 'each', 'few', 'more', 'most', 'other',
+    'some', 'such', 'no', 'nor', 'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 's', 't', 'can',
+    'will', 'just', 'don', "don't", 'should', "should've", 'now', 'd', 'll', 'm', 'o', 're', 've', 'y', 'ain',
+    'aren', "aren't", 'couldn', "couldn't", 'didn', "didn't", 'doesn', "doesn't", 'hadn', "hadn't", 'hasn',
+    "hasn't", 'haven', "haven't", 'isn', "isn't", 'ma', 'mightn', "mightn't", 'mustn', "mustn't", 'needn',
+    "needn't", 'shan', "shan't", 'shouldn', "shouldn't", 'wasn', "wasn't", 'weren', "weren't", 'won', "won't",
+    'wouldn', "wouldn't"
+])
+
+ID_STOP_WORDS_FALLBACK = frozenset([
+    'ada', 'adalah', 'adanya', 'adapun', 'agak', 'agaknya', 'agar', 'akan', 'akankah', 'akhir',
+    'akhiri', 'akhirnya', 'aku', 'akulah', 'amat', 'amatlah', 'anda', 'andalah', 'antar', 'antara',
+    'antaranya', 'apa', 'apaan', 'apabila', 'apakah', 'apalagi', 'apatah', 'artinya', 'asal', 'asalkan',
+    'atas', 'atau', 'ataukah', 'ataupun', 'awal', 'awalnya', 'bagai', 'bagaikan', 'bagaimana', 'bagaimanakah',
+    'bagaimanapun', 'bagi', 'bagian', 'bahkan', 'bahwa', 'bahwasanya', 'baik', 'bakal', 'bakalan', 'balik',
+    'banyak', 'bapak', 'baru', 'bawah', 'beberapa', 'begini', 'beginian', 'beginikah', 'beginilah', 'begitu',
+    'begitukah', 'begitulah', 'begitupun', 'bekerja', 'belakang', 'belakangan', 'belum', 'belumlah', 'benar',
+    'benarkah', 'benarlah', 'berada', 'berakhir', 'berakhirlah', 'berakhirnya', 'berapa', 'berapakah',
+    'berapalah', 'berapapun', 'berarti', 'berawal', 'berbagai', 'berdatangan', 'beri', 'berikan', 'berikut',
+    'berikutnya', 'berjumlah', 'berkali-kali', 'berkata', 'berkehendak', 'berkeinginan', 'berkenaan',
+    'berlainan', 'berlalu', 'berlangsung', 'berlebihan', 'bermacam', 'bermacam-macam', 'bermaksud',
+    'bermula', 'bersama', 'bersama-sama', 'bersiap', 'bersiap-siap', 'bertanya', 'bertanya-tanya', 'berturut',
+    'berturut-turut', 'bertutur', 'berujar', 'berupa', 'besar', 'betul', 'betulkah', 'biasa', 'biasanya',
+    'bila', 'bilakah', 'bisa', 'bisakah', 'boleh', 'bolehkah', 'bolehlah', 'buat', 'bukan', 'bukankah',
+    'bukanlah', 'bukannya', 'bulan', 'bung', 'cara', 'caranya', 'cukup', 'cukupkah', 'cukuplah', 'cuma',
+    'dahulu', 'dalam', 'dan', 'dapat', 'dari', 'daripada', 'datang', 'dekat', 'demi', 'demikian',
+    'demikianlah', 'dengan', 'depan', 'di', 'dia', 'diakhiri', 'diakhirinya', 'dialah', 'diantara',
+    'diantaranya', 'diberi', 'diberikan', 'diberikannya', 'dibuat', 'dibuatnya', 'didapat',
+    'didatangkan', 'digunakan', 'diibaratkan', 'diibaratkannya', 'diingat', 'diingatkan', 'diinginkan',
+    'dijawab', 'dijelaskan', 'dijelaskannya', 'dikarenakan', 'dikatakan', 'dikatakannya', 'dikerjakan',
+    'diketahui', 'diketahuinya', 'dikira', 'dilakukan', 'dilalui', 'dilihat', 'dimaksud', 'dimaksudkan',
+    'dimaksudkannya', 'dimaksudnya', 'diminta', 'dimintai', 'dimisalkan', 'dimulai', 'dimulailah',
+    'dimulainya', 'dimungkinkan', 'dini', 'dipastikan', 'diperbuat', 'diperbuatnya', 'dipergunakan',
+    'diperkirakan', 'diperlihatkan', 'diperlukan', 'diperlukannya', 'dipersoalkan', 'dipertanyakan',
+    'dipunyai', 'diri', 'dirinya', 'disampaikan', 'disebut', 'disebutkan', 'disebutkannya', 'disini',
+    'disinilah', 'ditambahkan', 'ditandaskan', 'ditanya', 'ditanyai', 'ditanyakan', 'ditegaskan',
+    'ditujukan', 'ditunjuk', 'ditunjuki', 'ditunjukkan', 'ditunjukkannya', 'ditunjuknya', 'dituturkan',
+    'dituturkannya', 'diucapkan', 'diucapkannya', 'diungkapkan', 'dong', 'dua', 'dulu', 'empat', 'enggak',
+    'enggaknya', 'entah', 'entahlah', 'guna', 'gunakan', 'hal', 'hampir', 'hanya', 'hanyalah', 'hari',
+    'harus', 'haruslah', 'harusnya', 'hendak', 'hendaklah', 'hendaknya', 'hingga', 'ia', 'ialah', 'ibarat',
+    'ibaratkan', 'ibaratnya', 'ibu', 'ikut', 'ingat', 'ingat-ingat', 'ingin', 'inginkah', 'inginkan', 'ini',
+    'inikah', 'inilah', 'itu', 'itukah', 'itulah', 'jadi', 'jadilah', 'jadinya', 'jangan', 'jangankan',
+    'janganlah', 'jauh', 'jawab', 'jawaban', 'jawabnya', 'jelas', 'jelaskan', 'jelaslah', 'jelasnya',
+    'jika', 'jikalau', 'juga', 'jumlah', 'jumlahnya', 'justru', 'kala', 'kalau', 'kalaulah', 'kalaupun',
+    'kalian', 'kami', 'kamilah', 'kamu', 'kamulah', 'kan', 'kapan', 'kapankah', 'kapanpun', 'karena',
+    'karenanya', 'kasus', 'kata', 'katakan', 'katakanlah', 'katanya', 'ke', 'keadaan', 'kebetulan',
+    'kecil', 'kedua', 'keduanya', 'keinginan', 'kelamaan', 'kelihatan', 'kelihatannya', 'kelima',
+    'keluar', 'kembali', 'kemudian', 'kemungkinan', 'kemungkinannya', 'kenapa', 'kepada', 'kepadanya',
+    'kesamaan', 'keseluruhan', 'keseluruhannya', 'keterlaluan', 'ketika', 'khususnya', 'kini', 'kinilah',
+    'kira', 'kira-kira', 'kiranya', 'kita', 'kitalah', 'kok', 'kurang', 'lagi', 'lagian', 'lah', 'lain',
+    'lainnya', 'lalu', 'lama', 'lamanya', 'lanjut', 'lanjutnya', 'lebih', 'lewat', 'lima', 'luar', 'macam',
+    'maka', 'makanya', 'makin', 'malah', 'malahan', 'mampu', 'mampukah', 'mana', 'manakala', 'manalagi',
+    'masa', 'masalah', 'masalahnya', 'masih', 'masihkah', 'masing', 'masing-masing', 'mau', 'maupun',
+    'melainkan', 'melakukan', 'melalui', 'melihat', 'melihatnya', 'memang', 'memastikan', 'memberi',
+    'memberikan', 'membuat', 'memerlukan', 'memihak', 'meminta', 'memintakan', 'memisalkan', 'memperbuat',
+    'mempergunakan', 'memperkirakan', 'memperlihatkan', 'mempersiapkan', 'mempersoalkan', 'mempertanyakan',
+    'mempunyai', 'memulai', 'memungkinkan', 'menaiki', 'menambahkan', 'menandaskan', 'menanti', 'menanti-nanti',
+    'menantikan', 'menanya', 'menanyai', 'menanyakan', 'mendapat', 'mendapatkan', 'mendatang', 'mendatangi',
+    'mendatangkan', 'menegaskan', 'mengakhiri', 'mengapa', 'mengatakan', 'mengatakannya', 'mengenai',
+    'mengerjakan', 'mengetahui', 'menggunakan', 'menghendaki', 'mengibaratkan', 'mengibaratkannya',
+    'mengingat', 'mengingatkan', 'menginginkan', 'mengira', 'mengucapkan', 'mengucapkannya', 'mengungkapkan',
+    'menjadi', 'menjawab', 'menjelaskan', 'menuju', 'menunjuk', 'menunjuki', 'menunjukkan', 'menunjuknya',
+    'menurut', 'menuturkan', 'menyampaikan', 'menyangkut', 'menyatakan', 'menyebutkan', 'menyeluruh',
+    'menyiapkan', 'merasa', 'mereka', 'merekalah', 'merupakan', 'meski', 'meskipun', 'meyakini', 'meyakinkan',
+    'minta', 'mirip', 'misal', 'misalkan', 'misalnya', 'mula', 'mulai', 'mulailah', 'mulanya', 'mungkin',
+    'mungkinkah', 'nah', 'naik', 'namun', 'nanti', 'nantinya', 'nyaris', 'nyatanya', 'oleh', 'olehnya',
+    'pada', 'padahal', 'padanya', 'pak', 'paling', 'panjang', 'pantas', 'para', 'pasti', 'pastilah',
+    'penting', 'pentingnya', 'per', 'percuma', 'perlu', 'perlukah', 'perlunya', 'pernah', 'persoalan',
+    'pertama', 'pertama-tama', 'pertanyaan', 'pertanyakan', 'pihak', 'pihaknya', 'pukul', 'pula', 'pun',
+    'punya', 'rasa', 'rasanya', 'rata', 'rupanya', 'saat', 'saatnya', 'saja', 'sajalah', 'saling', 'sama',
+    'sama-sama', 'sambil', 'sampai', 'sampai-sampai', 'sampaikan', 'sana', 'sangat', 'sangatlah', 'satu',
+    'saya', 'sayalah', 'se', 'sebab', 'sebabnya', 'sebagai', 'sebagaimana', 'sebagainya', 'sebagian',
+    'sebaik', 'sebaik-baiknya', 'sebaiknya', 'sebaliknya', 'sebanyak', 'sebegini', 'sebegitu', 'sebelum',
+    'sebelumnya', 'sebenarnya', 'seberapa', 'sebesar', 'sebetulnya', 'sebisanya', 'sebuah', 'sebut',
+    'sebutlah', 'sebutnya', 'secara', 'secukupnya', 'sedang', 'sedangkan', 'sedemikian', 'sedikit',
+    'sedikitnya', 'seenaknya', 'segala', 'segalanya', 'segera', 'seharusnya', 'sehingga', 'seingat',
+    'sejak', 'sejauh', 'sejenak', 'sejumlah', 'sekadar', 'sekadarnya', 'sekali', 'sekali-kali', 'sekalian',
+    'sekaligus', 'sekalipun', 'sekarang', 'sekarang', 'sekecil', 'seketika', 'sekiranya', 'sekitar',
+    'sekitarnya', 'sekurang-kurangnya', 'sekurangnya', 'sela', 'selain', 'selaku', 'selalu', 'selama',
+    'selama-lamanya', 'selamanya', 'selanjutnya', 'seluruh', 'seluruhnya', 'semacam', 'semakin', 'semampu',
+    'semampunya', 'semasa', 'semasih', 'semata', 'semata-mata', 'semaunya', 'sementara', 'semisal', 'semisalnya',
+    'sempat', 'semua', 'semuanya', 'semula', 'sendiri', 'sendirian', 'sendirinya', 'seolah', 'seolah-olah',
+    'seorang', 'sepanjang', 'sepantasnya', 'sepantasnyalah', 'seperlunya', 'seperti', 'sepertinya', 'sepihak',
+    'sering', 'seringnya', 'serta', 'serupa', 'sesaat', 'sesama', 'sesampai', 'sesegera', 'sesekali',
+    'seseorang', 'sesuatu', 'sesuatunya', 'sesudah', 'sesudahnya', 'setelah', 'setempat', 'setengah',
+    'seterusnya', 'setiap', 'setiba', 'setibanya', 'setidak-tidaknya', 'setidaknya', 'setinggi', 'seusai',
+    'sewaktu', 'siap', 'siapa', 'siapakah', 'siapapun', 'sini', 'sinilah', 'soal', 'soalnya', 'suatu',
+    'sudah', 'sudahkah', 'sudahlah', 'supaya', 'tadi', 'tadinya', 'tahu', 'tahun', 'tak', 'tambah',
+    'tambahnya', 'tampak', 'tampaknya', 'tandas', 'tandasnya', 'tanpa', 'tanya', 'tanyakan', 'tanyanya',
+    'tapi', 'tegas', 'tegasnya', 'telah', 'tempat', 'tengah', 'tentang', 'tentu', 'tentulah', 'tentunya',
+    'tepat', 'terakhir', 'terasa', 'terbanyak', 'terdahulu', 'terdapat', 'terdiri', 'terhadap', 'terhadapnya',
+    'teringat', 'teringat-ingat', 'terjadi', 'terjadilah', 'terjadinya', 'terkira', 'terlalu', 'terlebih',
+    'terlihat', 'termasuk', 'ternyata', 'tersampaikan', 'tersebut', 'tersebutlah', 'tertentu', 'tertuju',
+    'terus', 'terutama', 'tetap', 'tetapi', 'tiap', 'tiba', 'tiba-tiba', 'tidak', 'tidakkah', 'tidaklah',
+    'tiga', 'tinggi', 'toh', 'tunjuk', 'turut', 'tutur', 'tuturnya', 'ucap', 'ucapnya', 'ujar', 'ujarnya',
+    'umum', 'umumnya', 'ungkap', 'ungkapnya', 'untuk', 'usah', 'usai', 'waduh', 'wah', 'wahai', 'waktu',
+    'waktunya', 'walau', 'walaupun', 'wong', 'yaitu', 'yakin', 'yakni', 'yang'
+])
+
+_STOP_WORD_SOURCES = {
+    'en': ('english', EN_STOP_WORDS_FALLBACK),
+    'id': ('indonesian', ID_STOP_WORDS_FALLBACK)
+}
+_stop_word_sets = {}
+
+
+def get_stop_words(language):
+    """
+    Mengembalikan himpunan stopwords untuk bahasa tertentu ('id' atau 'en').
+
+    Stopwords dibaca dari data NLTK yang sudah terpasang secara lokal saat pertama
+    kali diminta; tidak ada unduhan. Jika data tidak ditemukan, dipakai daftar bawaan.
+    Bahasa selain 'id' menggunakan stopwords bahasa Inggris.
+    """
+    key = 'id' if language == 'id' else 'en'
+    words = _stop_word_sets.get(key)
+    if words is None:
+        corpus_name, fallback = _STOP_WORD_SOURCES[key]
+        try:
+            from nltk.corpus import stopwords
+            words = frozenset(stopwords.words(corpus_name))
+        except (LookupError, OSError, ImportError):
+            words = fallback
+        _stop_word_sets[key] = words
+    return words
+
+
+_stemmer = None
+_word_tokenize = None
+
+
+def get_stemmer():
+    """
+    Mengembalikan instance PorterStemmer bersama (dibuat saat pertama kali dipakai).
+    """
+    global _stemmer
+    if _stemmer is None:
+        from nltk.stem import PorterStemmer
+        _stemmer = PorterStemmer()
+    return _stemmer
+
+
+def _stem(token):
+    return get_stemmer().stem(token)
+
+
+def nltk_tokenize(cleaned_text):
+    """
+    Memecah teks yang sudah dibersihkan menjadi token dengan tokenizer Treebank NLTK.
+
+    `preserve_line=True` melewati pemisahan kalimat punkt: teks bersih tidak lagi
+    mengandung tanda baca kalimat, sehingga hasilnya sama dan data punkt tidak diperlukan.
+    """
+    global _word_tokenize
+    if _word_tokenize is None:
+        from nltk.tokenize import word_tokenize
+        _word_tokenize = word_tokenize
+    return _word_tokenize(cleaned_text, preserve_line=True)
+
+
+# Kata tanpa tanda baca yang tetap dipecah oleh tokenizer Treebank NLTK
+# (kata -> posisi pemisahan), misalnya "cannot" -> "can", "not"
+TREEBANK_SPLITS = {'cannot': 3, 'gimme': 3, 'gonna': 3, 'gotta': 3, 'lemme': 3, 'wanna': 3}
+_TREEBANK_SPLIT_PATTERN = re.compile('|'.join(TREEBANK_SPLITS), re.IGNORECASE)
+
+
+def fast_tokenize(cleaned_text):
+    """
+    Tokenizer cepat berbasis `str.split` untuk teks yang sudah dibersihkan.
+
+    Setelah tanda baca dihapus, tokenizer Treebank hanya memisahkan spasi dan
+    beberapa kata gabungan di `TREEBANK_SPLITS`, sehingga hasil fungsi ini sama
+    dengan `nltk_tokenize` untuk teks bersih. Kata gabungan hanya diperiksa per
+    token jika salah satunya muncul di teks.
+    """
+    tokens = cleaned_text.split()
+    if _TREEBANK_SPLIT_PATTERN.search(cleaned_text) is None:
+        return tokens
+
+    result = []
+    for token in tokens:
+        position = TREEBANK_SPLITS.get(token.lower())
+        if position is None:
+            result.append(token)
+        else:
+            result.extend((token[:position], token[position:]))
+    return result
+
+
+# Mode tokenizer yang dapat dipilih untuk preprocessing
+TOKENIZERS = {'nltk': nltk_tokenize, 'fast': fast_tokenize}
+
+
+def __getattr__(name):
+    # Nama lama (nlp, stemmer, stopwords) tetap tersedia, tetapi dimuat saat diakses
+    if name == 'nlp':
+        return get_nlp('id')
+    if name == 'stemmer':
+        return get_stemmer()
+    if name == 'id_stop_words':
+        return get_stop_words('id')
+    if name == 'stop_words':
+        # Gabungan stopwords bahasa Inggris dan Indonesia
+        return get_stop_words('en') | get_stop_words('id')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class TokenNormalizationCache:
+    """Tabel memo yang memetakan bentuk permukaan token ke bentuk ter-normalisasi.
+
+    Dalam korpus nyata, kata-kata yang sama di-stem jutaan kali. Dengan tabel ini,
+    setiap kata unik hanya dinormalisasi satu kali; kemunculan berikutnya cukup
+    satu lookup dict. Tabel dibatasi `max_size` entri: jika penuh, kata baru tetap
+    dinormalisasi tetapi tidak disimpan.
+
+    Parameter:
+    -----------
+    normalize_func : callable
+        Fungsi normalisasi untuk satu token (misalnya `PorterStemmer().stem`).
+    max_size : int, optional
+        Jumlah entri maksimum. Default adalah 500000.
+    """
+
+    def __init__(self, normalize_func, max_size=500000):
+        self.normalize_func = normalize_func
+        self.max_size = max_size
+        self.table = {}
+        self.lookups = 0
+        self.misses = 0
+        # Melindungi operasi massal (preload, snapshot) dari thread lain
+        self._lock = threading.Lock()
+
+    def normalize_tokens(self, tokens):
+        """
+        Menormalisasi daftar token menggunakan tabel memo.
+        """
+        table = self.table
+        normalized = []
+        for token in tokens:
+            result = table.get(token)
+            if result is None:
+                result = self.normalize_func(token)
+                self.misses += 1
+                if len(table) < self.max_size:
+                    table[token] = result
+            normalized.append(result)
+        self.lookups += len(tokens)
+        return normalized
+
+    def preload(self, mapping):
+        """
+        Mengisi tabel dengan pasangan token -> bentuk ter-normalisasi yang sudah diketahui,
+        misalnya dari proses lain atau dari indeks yang tersimpan di disk.
+        """
+        table = self.table
+        with self._lock:
+            for token, result in mapping.items():
+                if len(table) >= self.max_size:
+                    break
+                table.setdefault(token, result)
+
+    def snapshot(self, results=None):
+        """
+        Mengembalikan salinan tabel memo yang aman dipakai selagi thread lain menambah entri.
+
+        Jika `results` diberikan (misalnya kosakata sebuah indeks), hanya pasangan yang
+        bentuk ter-normalisasinya ada di `results` yang dikembalikan.
+        """
+        with self._lock:
+            # dict.copy tidak dapat disela thread lain (GIL), berbeda dengan iterasi tabel
+            table = self.table.copy()
+        if results is None:
+            return table
+        return {token: result for token, result in table.items() if result in results}
+
+    def stats(self):
+        """
+        Mengembalikan statistik tabel memo: ukuran, jumlah lookup, hit, miss, dan hit rate.
+        """
+        hits = self.lookups - self.misses
+        return {
+            'size': len(self.table),
+            'max_size': self.max_size,
+            'lookups': self.lookups,
+            'hits': hits,
+            'misses': self.misses,
+            'hit_rate': hits / self.lookups if self.lookups else 0.0
+        }
+
+
+# Memo stemming bersama untuk seluruh pemanggilan preprocess_text di proses ini.
+# Hasil Porter stemming hanya bergantung pada token, sehingga aman dipakai ulang
+# lintas bahasa dan opsi. Lemmatization spaCy bergantung pada konteks kalimat
+# (POS tag), sehingga tidak di-memo per token.
+stem_cache = TokenNormalizationCache(_stem)
+
+
+def preprocessing_stats():
+    """
+    Mengembalikan statistik instrumentasi preprocessing, termasuk hit rate memo stemming
+    (akumulasi dari proses ini dan worker `preprocess_corpus`).
+    """
+    return {'stem_cache': stem_cache.stats()}
+
+
+def _extract_lemmas(doc, current_stop_words):
+    """
+    Mengambil lemma dari dokumen spaCy untuk token yang bukan stopword.
+
+    Memunculkan ValueError jika tidak ada lemma yang valid (misalnya model blank
+    yang tidak memiliki lemmatizer).
+    """
+    lemmatized_tokens = [token.lemma_ for token in doc if token.text.lower() not in current_stop_words]
+
+    # Jika tidak ada token yang diproses atau model blank tidak mendukung lemmatization
+    if not lemmatized_tokens or all(token == '' for token in lemmatized_tokens):
+        raise ValueError("Lemmatization tidak menghasilkan output yang valid")
+    return lemmatized_tokens
+
+
+def _select_final_tokens(apply_stemming, apply_lemmatization, filtered_tokens, stemmed_tokens, lemmatized_tokens):
+    """
+    Menentukan token final berdasarkan prioritas: lemmatization, stemming, lalu filtering saja.
+    """
+    if apply_lemmatization and lemmatized_tokens != filtered_tokens:
+        # Jika lemmatization berhasil, gunakan hasil lemmatization
+        return lemmatized_tokens
+    elif apply_stemming:
+        # Jika lemmatization tidak diminta atau gagal, dan stemming diminta, gunakan hasil stemming
+        return stemmed_tokens
+    else:
+        # Jika tidak ada yang diminta atau keduanya gagal, gunakan token yang difilter
+        return filtered_tokens.copy()
+
+
+class Preprocessor:
+    """Pipeline preprocessing yang disiapkan sekali untuk satu kombinasi opsi.
+
+    Regex sudah dikompilasi, himpunan stopwords dimuat sekali (frozenset), dan jalur
+    cepat `process(text)` hanya menghitung teks akhir tanpa menyimpan hasil setiap
+    tahap. Detail per tahap hanya dibangun jika `return_details=True`. Hasilnya sama
+    dengan `preprocess_text` untuk opsi yang sama.
+
+    Parameter:
+    -----------
+    language : str, optional
+        Bahasa dari teks. Pilihan: 'en', 'id'. Default adalah 'id'.
+    use_spacy : bool, optional
+        Apakah menggunakan spaCy untuk pemrosesan. Default adalah True.
+    apply_stemming : bool, optional
+        Apakah menerapkan stemming pada token. Default adalah True.
+    apply_lemmatization : bool, optional
+        Apakah menerapkan lemmatization pada token. Default adalah False.
+    tokenizer : str, optional
+        Mode tokenizer: 'nltk' (Treebank NLTK) atau 'fast' (`fast_tokenize`, hasil sama
+        untuk teks bersih). Default adalah 'nltk'.
+    """
+
+    HTML_TAG_PATTERN = re.compile(r'<.*?>')
+    NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+
+    def __init__(self, language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False,
+                 tokenizer='nltk'):
+        if tokenizer not in TOKENIZERS:
+            raise ValueError(f"Tokenizer tidak dikenal: {tokenizer}. Pilihan: {', '.join(TOKENIZERS)}")
+        self.language = language
+        self.use_spacy = use_spacy
+        self.apply_stemming = apply_stemming
+        self.apply_lemmatization = apply_lemmatization
+        self.tokenizer = tokenizer
+        self.tokenize = TOKENIZERS[tokenizer]
+        self.stop_words = get_stop_words(language)
+
+    @property
+    def nlp(self):
+        # Diambil dari nlp_models pada setiap akses agar model yang diganti tetap terpakai
+        if self.use_spacy and self.apply_lemmatization:
+            return get_nlp(self.language)
+        return None
+
+    def info(self):
+        """
+        Mengembalikan opsi preprocessing dalam bentuk dictionary `preprocessing_info`.
+        """
+        return {
+            "language": self.language,
+            "use_spacy": self.use_spacy,
+            "apply_stemming": self.apply_stemming,
+            "apply_lemmatization": self.apply_lemmatization
+        }
+
+    def clean(self, text):
+        """
+        Menghapus tag HTML dan karakter non-alfanumerik, lalu mengubah teks menjadi huruf kecil.
+        """
+        cleaned_text = self.HTML_TAG_PATTERN.sub('', text)
+        cleaned_text = self.NON_WORD_PATTERN.sub('', cleaned_text)
+        return cleaned_text.lower()
+
+    def _lemmatize(self, current_nlp, cleaned_text, filtered_tokens):
+        try:
+            # Ambil lemma untuk token yang tidak dalam stopwords
+            return _extract_lemmas(current_nlp(cleaned_text), self.stop_words)
+        except Exception as e:
+            print(f"Peringatan: Lemmatization gagal ({str(e)}). Menggunakan metode alternatif.")
+            # Fallback ke filtered tokens
+            return filtered_tokens.copy()
+
+    def process(self, text, return_details=False):
+        """
+        Memproses satu teks. Mengembalikan teks akhir, atau dictionary detail setiap
+        tahap jika `return_details=True` (format sama dengan `preprocess_text`).
+        """
+        if return_details:
+            return self._process_details(text)
+        if not isinstance(text, str):
+            return ""
+
+        cleaned_text = self.clean(text)
+        stop_words = self.stop_words
+        filtered_tokens = [w for w in self.tokenize(cleaned_text) if w not in stop_words]
+
+        current_nlp = self.nlp
+        if current_nlp is not None:
+            lemmatized_tokens = self._lemmatize(current_nlp, cleaned_text, filtered_tokens)
+            if lemmatized_tokens != filtered_tokens:
+                return ' '.join(lemmatized_tokens)
+        if self.apply_stemming:
+            return ' '.join(stem_cache.normalize_tokens(filtered_tokens))
+        return ' '.join(filtered_tokens)
+
+    def process_many(self, texts, return_details=False):
+        """
+        Memproses teks satu per satu dari iterable dan menghasilkan (yield) hasilnya
+        secara berurutan, tanpa menampung seluruh input di memori.
+        """
+        for text in texts:
+            yield self.process(text, return_details)
+
+    def _process_details(self, text):
+        if not isinstance(text, str):
+            return {
+                "original_text": "",
+                "cleaned_text": "",
+                "tokenized_text": [],
+                "filtered_text": [],
+                "stemmed_text": "",
+                "stemmed_tokens": [],
+                "lemmatized_text": "",
+                "lemmatized_tokens": [],
+                "final_text": "",
+                "preprocessing_info": self.info()
+            }
+
+        cleaned_text = self.clean(text)
+
+        # Tokenisasi dasar (NLTK atau tokenizer cepat)
+        tokenized_tokens = self.tokenize(cleaned_text)
+
+        # Hapus stop words
+        filtered_tokens = [w for w in tokenized_tokens if w not in self.stop_words]
+
+        # Terapkan stemming jika diminta
+        if self.apply_stemming:
+            stemmed_tokens = stem_cache.normalize_tokens(filtered_tokens)
+        else:
+            stemmed_tokens = filtered_tokens.copy()
+
+        # Terapkan lemmatization jika diminta dan spaCy tersedia
+        current_nlp = self.nlp
+        if current_nlp is not None:
+            lemmatized_tokens = self._lemmatize(current_nlp, cleaned_text, filtered_tokens)
+        else:
+            lemmatized_tokens = filtered_tokens.copy()
+
+        # Tentukan token final berdasarkan prioritas
+        final_tokens = _select_final_tokens(self.apply_stemming, self.apply_lemmatization, filtered_tokens,
+                                            stemmed_tokens, lemmatized_tokens)
+
+        return {
+            "original_text": text,
+            "cleaned_text": cleaned_text,
+            "tokenized_text": tokenized_tokens,
+            "filtered_text": filtered_tokens,
+            "stemmed_text": ' '.join(stemmed_tokens),
+            "stemmed_tokens": stemmed_tokens,
+            "lemmatized_text": ' '.join(lemmatized_tokens),
+            "lemmatized_tokens": lemmatized_tokens,
+            "final_text": ' '.join(final_tokens),
+            "preprocessing_info": self.info()
+        }
+
+
+# Preprocessor yang sudah dibuat, per kombinasi opsi
+_preprocessors = {}
+
+
+def get_preprocessor(language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False,
+                     tokenizer='nltk'):
+    """
+    Mengembalikan `Preprocessor` bersama untuk kombinasi opsi tertentu (dibuat sekali).
+    """
+    key = (language, use_spacy, apply_stemming, apply_lemmatization, tokenizer)
+    preprocessor = _preprocessors.get(key)
+    if preprocessor is None:
+        preprocessor = _preprocessors[key] = Preprocessor(*key)
+    return preprocessor
+
+
+def preprocess_text(text, language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False, return_details=False,
+                    tokenizer='nltk'):
     """Melakukan pra-pemrosesan teks untuk information retrieval.
 
     Parameter:
@@ -178,6 +606,8 @@ def preprocess_text(text, language='id', use_spacy=True, apply_stemming=True, ap
     return_details : bool, optional
         Jika True, mengembalikan dictionary dengan detail setiap tahap preprocessing.
         Jika False, hanya mengembalikan teks akhir yang telah diproses.
+    tokenizer : str, optional
+        Mode tokenizer: 'nltk' atau 'fast' (lihat `fast_tokenize`). Default adalah 'nltk'.
 
     Mengembalikan:
     --------
@@ -185,122 +615,228 @@ def preprocess_text(text, language='id', use_spacy=True, apply_stemming=True, ap
         Jika return_details=False: Teks yang telah diproses.
         Jika return_details=True: Dictionary dengan detail setiap tahap preprocessing.
     """
-    # Define a complete default dictionary for return_details=True
-    default_details = {
-        "original_text": "",
-        "cleaned_text": "",
-        "tokenized_text": [],
-        "filtered_text": [],
-        "stemmed_text": "",
-        "stemmed_tokens": [],
-        "lemmatized_text": "",
-        "lemmatized_tokens": [],
-        "final_text": "",
-        "preprocessing_info": {
-            "language": language,
-            "use_spacy": use_spacy,
-            "apply_stemming": apply_stemming,
-            "apply_lemmatization": apply_lemmatization
-        }
+    preprocessor = get_preprocessor(language, use_spacy, apply_stemming, apply_lemmatization, tokenizer)
+    return preprocessor.process(text, return_details)
+
+
+# Jumlah proses default untuk preprocessing korpus (dapat diubah melalui variabel lingkungan)
+DEFAULT_N_JOBS = int(os.environ.get('IR_PREPROCESS_JOBS', 0)) or available_cpus()
+
+# Di bawah jumlah dokumen ini, biaya membuat process pool lebih besar dari manfaatnya
+MIN_PARALLEL_SIZE = 2000
+
+
+def _init_worker(stem_table):
+    """
+    Inisialisasi proses worker: memuat tabel memo stemming dari proses induk.
+    """
+    stem_cache.preload(stem_table)
+    stem_cache.lookups = stem_cache.misses = 0
+
+
+def _preprocess_chunk(args):
+    """
+    Memproses satu potongan teks di dalam proses worker.
+
+    Mengembalikan hasil preprocessing beserta statistik memo stemming dan entri baru
+    yang dipelajari worker, agar dapat digabungkan kembali ke proses induk.
+    """
+    texts, options, return_details = args
+    start_size = len(stem_cache.table)
+    start_lookups, start_misses = stem_cache.lookups, stem_cache.misses
+    preprocessor = get_preprocessor(**options)
+    results = list(preprocessor.process_many(texts, return_details))
+    new_entries = dict(islice(stem_cache.table.items(), start_size, None))
+    return results, stem_cache.lookups - start_lookups, stem_cache.misses - start_misses, new_entries
+
+
+def preprocess_pool(n_jobs=None):
+    """
+    Membuat process pool untuk `preprocess_corpus` yang workernya memulai dengan
+    salinan tabel memo stemming proses induk.
+
+    Pool dapat dipakai ulang untuk banyak pemanggilan `preprocess_corpus` (misalnya
+    per potongan pada ingestion streaming), sehingga worker hanya dibuat sekali.
+    Proses worker baru dijalankan saat pekerjaan pertama dikirim.
+
+    Parameter:
+    -----------
+    n_jobs : int, optional
+        Jumlah proses worker. Default adalah `DEFAULT_N_JOBS`.
+
+    Mengembalikan:
+    --------
+    concurrent.futures.ProcessPoolExecutor
+        Pool yang harus ditutup oleh pemanggil (misalnya dengan `with`).
+    """
+    return ProcessPoolExecutor(max_workers=n_jobs or DEFAULT_N_JOBS, initializer=_init_worker,
+                               initargs=(stem_cache.snapshot(),))
+
+
+def preprocess_corpus(texts, language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False,
+                      return_details=False, n_jobs=None, chunk_size=None, min_parallel_size=MIN_PARALLEL_SIZE,
+                      spacy_batch_size=256, spacy_n_process=1, tokenizer='nltk', executor=None):
+    """Melakukan pra-pemrosesan banyak teks sekaligus, secara paralel jika korpus cukup besar.
+
+    Teks dibagi menjadi potongan (chunk) yang diproses oleh process pool. Urutan
+    hasil selalu sama dengan urutan input. Untuk input kecil atau `n_jobs=1`,
+    pemrosesan dilakukan secara serial di proses saat ini.
+
+    Parameter:
+    -----------
+    texts : iterable of str
+        Teks yang akan diproses.
+    language, use_spacy, apply_stemming, apply_lemmatization, return_details, tokenizer :
+        Sama seperti pada `preprocess_text`.
+    n_jobs : int, optional
+        Jumlah proses worker. Default adalah `DEFAULT_N_JOBS` (jumlah core yang tersedia,
+        atau nilai variabel lingkungan `IR_PREPROCESS_JOBS`).
+    chunk_size : int, optional
+        Jumlah teks per potongan. Default dibagi rata menjadi 4 potongan per worker.
+    min_parallel_size : int, optional
+        Jumlah teks minimum agar pemrosesan paralel digunakan. Default adalah `MIN_PARALLEL_SIZE`.
+    spacy_batch_size : int, optional
+        Ukuran batch `nlp.pipe` untuk lemmatization. Default adalah 256.
+    spacy_n_process : int, optional
+        Jumlah proses `nlp.pipe` untuk lemmatization. Default adalah 1.
+    executor : concurrent.futures.ProcessPoolExecutor, optional
+        Pool dari `preprocess_pool` yang dipakai ulang. Default adalah None (pool baru
+        dibuat dan ditutup pada pemanggilan ini).
+
+    Mengembalikan:
+    --------
+    list
+        Hasil `preprocess_text` untuk setiap teks, sesuai urutan input.
+    """
+    texts = list(texts)
+    options = {
+        'language': language,
+        'use_spacy': use_spacy,
+        'apply_stemming': apply_stemming,
+        'apply_lemmatization': apply_lemmatization,
+        'tokenizer': tokenizer
     }
+    n_jobs = n_jobs or DEFAULT_N_JOBS
 
-    if not isinstance(text, str):
-        return "" if not return_details else default_details
+    # Lemmatization dijalankan per batch dengan nlp.pipe, bukan per dokumen
+    if apply_lemmatization and use_spacy:
+        return lemmatize_corpus(texts, language=language, apply_stemming=apply_stemming,
+                                return_details=return_details, batch_size=spacy_batch_size,
+                                n_process=spacy_n_process, n_jobs=n_jobs, chunk_size=chunk_size,
+                                min_parallel_size=min_parallel_size, tokenizer=tokenizer, executor=executor)
 
-    # Simpan teks asli
-    original_text = text
+    if n_jobs <= 1 or len(texts) < min_parallel_size:
+        return list(get_preprocessor(**options).process_many(texts, return_details))
 
-    # Hapus tag HTML dan karakter non-alfanumerik
-    cleaned_text = re.sub(r'<.*?>', '', text)
-    cleaned_text = re.sub(r'[^\w\s]', '', cleaned_text)
-    cleaned_text = cleaned_text.lower()
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(texts) // (n_jobs * 4)))
+    chunks = [(texts[i:i + chunk_size], options, return_details) for i in range(0, len(texts), chunk_size)]
 
-    # Pilih model spaCy berdasarkan bahasa
-    current_nlp = nlp_models.get(language)
-    
-    # Pilih stopwords berdasarkan bahasa yang dipilih
-    current_stop_words = id_stop_words if language == 'id' else set(stopwords.words('english'))
-
-    # Variabel untuk menyimpan token di setiap tahap
-    tokenized_tokens = []
-    filtered_tokens = []
-    stemmed_tokens = []
-    lemmatized_tokens = []
-    final_tokens = []
-
-    # Gunakan pendekatan tokenisasi NLTK untuk tokenisasi dasar
-    tokenized_tokens = word_tokenize(cleaned_text)
-    
-    # Hapus stop words
-    filtered_tokens = [w for w in tokenized_tokens if w not in current_stop_words]
-    
-    # Simpan versi token yang difilter (tanpa stemming/lemmatization)
-    filtered_only_tokens = filtered_tokens.copy()
-    
-    # Terapkan stemming jika diminta
-    if apply_stemming:
-        stemmed_tokens = [stemmer.stem(token) for token in filtered_tokens]
-    else:
-        stemmed_tokens = filtered_tokens.copy()
-    
-    # Terapkan lemmatization jika diminta dan spaCy tersedia
-    if apply_lemmatization and current_nlp is not None and use_spacy:
+    if executor is None:
+        with preprocess_pool(n_jobs) as executor:
+            return _map_chunks(executor, chunks)
+    return _map_chunks(executor, chunks)
+
+
+def _map_chunks(executor, chunks):
+    results = []
+    # executor.map mempertahankan urutan potongan sesuai input
+    for chunk_result, lookups, misses, new_entries in executor.map(_preprocess_chunk, chunks):
+        results.extend(chunk_result)
+        # Gabungkan statistik dan kata baru dari worker ke proses induk
+        stem_cache.lookups += lookups
+        stem_cache.misses += misses
+        stem_cache.preload(new_entries)
+    return results
+
+
+# Komponen spaCy yang dibutuhkan untuk menghasilkan lemma. Komponen lain
+# (parser, NER, dll.) tidak memengaruhi token.lemma_ sehingga dimatikan.
+LEMMA_COMPONENTS = {
+    'tok2vec', 'transformer', 'tagger', 'morphologizer', 'attribute_ruler',
+    'lemmatizer', 'trainable_lemmatizer'
+}
+
+
+def lemmatize_corpus(texts, language='id', apply_stemming=True, return_details=False, batch_size=256,
+                     n_process=1, n_jobs=None, chunk_size=None, min_parallel_size=MIN_PARALLEL_SIZE,
+                     tokenizer='nltk', executor=None):
+    """Melakukan pra-pemrosesan dengan lemmatization spaCy untuk banyak teks sekaligus.
+
+    Tahap pembersihan, tokenisasi, stopword, dan stemming dijalankan oleh
+    `preprocess_corpus`, lalu seluruh teks bersih dilemmatisasi dengan `nlp.pipe`
+    per batch. Hanya komponen di `LEMMA_COMPONENTS` yang aktif. Hasil per baris
+    sama dengan `preprocess_text(..., use_spacy=True, apply_lemmatization=True)`.
+
+    Parameter:
+    -----------
+    texts : iterable of str
+        Teks yang akan diproses.
+    language : str, optional
+        Bahasa dari teks. Pilihan: 'en', 'id'. Default adalah 'id'.
+    apply_stemming : bool, optional
+        Apakah menerapkan stemming (dipakai jika lemmatization gagal). Default adalah True.
+    return_details : bool, optional
+        Sama seperti pada `preprocess_text`.
+    batch_size : int, optional
+        Jumlah dokumen per batch `nlp.pipe`. Default adalah 256.
+    n_process : int, optional
+        Jumlah proses `nlp.pipe`. Default adalah 1.
+    n_jobs, chunk_size, min_parallel_size, tokenizer, executor :
+        Diteruskan ke `preprocess_corpus` untuk tahap sebelum lemmatization.
+
+    Mengembalikan:
+    --------
+    list
+        Hasil preprocessing untuk setiap teks, sesuai urutan input.
+    """
+    texts = list(texts)
+    base_results = preprocess_corpus(texts, language=language, use_spacy=True, apply_stemming=apply_stemming,
+                                     apply_lemmatization=False, return_details=True, n_jobs=n_jobs,
+                                     chunk_size=chunk_size, min_parallel_size=min_parallel_size,
+                                     tokenizer=tokenizer, executor=executor)
+
+    current_nlp = get_nlp(language)
+    current_stop_words = get_stop_words(language)
+    rows = [i for i, text in enumerate(texts) if isinstance(text, str)]
+
+    # Lemmatisasi semua teks bersih sekaligus; None berarti lemmatization gagal untuk baris tersebut
+    lemmas = {}
+    if current_nlp is not None and rows:
+        disabled = [name for name in current_nlp.pipe_names if name not in LEMMA_COMPONENTS]
         try:
-            # Proses teks dengan spaCy
-            doc = current_nlp(cleaned_text)
-            # Ambil lemma untuk token yang tidak dalam stopwords
-            lemmatized_tokens = [token.lemma_ for token in doc if token.text.lower() not in current_stop_words]
-            
-            # Jika tidak ada token yang diproses atau model blank tidak mendukung lemmatization
-            if not lemmatized_tokens or all(token == '' for token in lemmatized_tokens):
-                raise ValueError("Lemmatization tidak menghasilkan output yang valid")
+            docs = current_nlp.pipe((base_results[i]['cleaned_text'] for i in rows),
+                                    batch_size=batch_size, n_process=n_process, disable=disabled)
+            for i, doc in zip(rows, docs):
+                try:
+                    lemmas[i] = _extract_lemmas(doc, current_stop_words)
+                except ValueError:
+                    lemmas[i] = None
         except Exception as e:
-            print(f"Peringatan: Lemmatization gagal ({str(e)}). Menggunakan metode alternatif.")
-            # Fallback ke filtered tokens
-            lemmatized_tokens = filtered_tokens.copy()
-    else:
-        lemmatized_tokens = filtered_tokens.copy()
-    
-    # Tentukan token final berdasarkan prioritas
-    if apply_lemmatization and lemmatized_tokens != filtered_tokens:
-        # Jika lemmatization berhasil, gunakan hasil lemmatization
-        final_tokens = lemmatized_tokens
-    elif apply_stemming:
-        # Jika lemmatization tidak diminta atau gagal, dan stemming diminta, gunakan hasil stemming
-        final_tokens = stemmed_tokens
-    else:
-        # Jika tidak ada yang diminta atau keduanya gagal, gunakan token yang difilter
-        final_tokens = filtered_tokens.copy()
+            print(f"Peringatan: Lemmatization batch gagal ({str(e)}). Menggunakan metode alternatif.")
+            lemmas = {}
 
-    # Gabungkan token menjadi teks akhir
-    final_text = ' '.join(final_tokens)
+    failed = 0
+    results = []
+    for i, details in enumerate(base_results):
+        details['preprocessing_info']['apply_lemmatization'] = True
+        if current_nlp is not None and isinstance(texts[i], str):
+            filtered_tokens = details['filtered_text']
+            lemmatized_tokens = lemmas.get(i)
+            if lemmatized_tokens is None:
+                # Fallback ke filtered tokens
+                failed += 1
+                lemmatized_tokens = filtered_tokens.copy()
+            final_tokens = _select_final_tokens(apply_stemming, True, filtered_tokens,
+                                                details['stemmed_tokens'], lemmatized_tokens)
+            details['lemmatized_tokens'] = lemmatized_tokens
+            details['lemmatized_text'] = ' '.join(lemmatized_tokens)
+            details['final_text'] = ' '.join(final_tokens)
+        results.append(details if return_details else details['final_text'])
 
-    # Gabungkan token menjadi teks untuk setiap tahap
-    stemmed_text = ' '.join(stemmed_tokens)
-    lemmatized_text = ' '.join(lemmatized_tokens)
-    filtered_only_text = ' '.join(filtered_only_tokens)
-    
-    # Kembalikan hasil sesuai dengan parameter return_details
-    if return_details:
-        return {
-            "original_text": original_text,
-            "cleaned_text": cleaned_text,
-            "tokenized_text": tokenized_tokens,
-            "filtered_text": filtered_only_tokens,
-            "stemmed_text": stemmed_text,
-            "stemmed_tokens": stemmed_tokens,
-            "lemmatized_text": lemmatized_text,
-            "lemmatized_tokens": lemmatized_tokens,
-            "final_text": final_text,
-            "preprocessing_info": {
-                "language": language,
-                "use_spacy": use_spacy,
-                "apply_stemming": apply_stemming,
-                "apply_lemmatization": apply_lemmatization
-            }
-        }
-    else:
-        return final_text
+    if failed:
+        print(f"Peringatan: Lemmatization gagal untuk {failed} dokumen. Menggunakan metode alternatif.")
+    return results
 
 
 def contoh_penggunaan():
@@ -382,7 +918,7 @@ def contoh_penggunaan():
     print("===== SELESAI =====\n")
 
 
-def save_preprocessing_results(df, text_column, output_path, language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False, output_format='csv'):
+def save_preprocessing_results(df, text_column, output_path, language='id', use_spacy=True, apply_stemming=True, apply_lemmatization=False, output_format='csv', n_jobs=None):
     """
     Menyimpan hasil preprocessing dari DataFrame ke file dengan kolom terpisah untuk setiap tahap preprocessing.
     
@@ -404,6 +940,8 @@ def save_preprocessing_results(df, text_column, output_path, language='id', use_
         Apakah menerapkan lemmatization pada token. Default adalah False.
     output_format : str, optional
         Format output file. Pilihan: 'csv', 'json'. Default adalah 'csv'.
+    n_jobs : int, optional
+        Jumlah proses worker untuk preprocessing. Default mengikuti `preprocess_corpus`.
     
     Returns:
     --------
@@ -419,13 +957,10 @@ def save_preprocessing_results(df, text_column, output_path, language='id', use_
     # Buat DataFrame baru untuk menyimpan hasil preprocessing
     results_df = df.copy() # Salin DataFrame asli untuk menjaga kolom lain
     
-    # Lakukan preprocessing dan tambahkan kolom hasil preprocessing
-    preprocessing_results = []
-    for text_value in df[text_column]: # Gunakan nama variabel yang berbeda untuk menghindari konflik dengan parameter
-        result = preprocess_text(text_value, language=language, use_spacy=use_spacy, 
-                                 apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization,
-                                 return_details=True)
-        preprocessing_results.append(result)
+    # Lakukan preprocessing (paralel untuk data besar) dan tambahkan kolom hasil preprocessing
+    preprocessing_results = preprocess_corpus(df[text_column], language=language, use_spacy=use_spacy,
+                                              apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization,
+                                              return_details=True, n_jobs=n_jobs)
     
     # Tambahkan kolom hasil preprocessing ke DataFrame baru
     results_df['original_text'] = [result['original_text'] for result in preprocessing_results]
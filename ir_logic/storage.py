@@ -0,0 +1,242 @@
+import errno
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+
+from ir_logic.indexing import BM25Index, ScoringIndex
+
+# Versi format indeks di disk; naikkan jika struktur file berubah
+INDEX_FORMAT_VERSION = 2
+
+# Nama direktori indeks persisten untuk aplikasi (relatif terhadap direktori kerja)
+INDEX_DIR_NAME = 'index_store'
+
+# Cache fingerprint per proses agar file yang sama tidak di-hash berulang kali
+_fingerprint_cache = {}
+
+
+def dataset_fingerprint(filepath):
+    """
+    Menghitung hash SHA-256 dari isi file dataset.
+
+    Hasil disimpan per (path, ukuran, waktu modifikasi) sehingga file yang tidak
+    berubah hanya di-hash satu kali per proses.
+    """
+    stat = os.stat(filepath)
+    stat_key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+    if stat_key in _fingerprint_cache:
+        return _fingerprint_cache[stat_key]
+
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    fingerprint = digest.hexdigest()
+    _fingerprint_cache[stat_key] = fingerprint
+    return fingerprint
+
+
+def default_index_dir():
+    """
+    Mengembalikan direktori indeks persisten untuk aplikasi (Streamlit, layanan HTTP).
+
+    Dibaca saat dipanggil: variabel lingkungan `IR_INDEX_DIR` jika di-set (string
+    kosong menonaktifkan penyimpanan, None), atau 'index_store' di direktori kerja
+    saat ini. Fungsi pencarian di `ir_system` tidak menyimpan indeks ke disk kecuali
+    `index_dir` diberikan.
+    """
+    index_dir = os.environ.get('IR_INDEX_DIR')
+    if index_dir is None:
+        return os.path.join(os.getcwd(), INDEX_DIR_NAME)
+    return index_dir or None
+
+
+def index_key(fingerprint, **options):
+    """
+    Membuat kunci indeks dari hash isi dataset dan opsi yang memengaruhi indeks
+    (kolom, model, bahasa, dan opsi preprocessing).
+    """
+    payload = json.dumps({'dataset': fingerprint, 'version': INDEX_FORMAT_VERSION, **options}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+def write_index(index_dir, key, index, processed_text, options=None, stem_table=None):
+    """
+    Menyimpan indeks siap-skor beserta teks hasil preprocessing ke disk.
+
+    Struktur direktori `<index_dir>/<key>/`:
+    - meta.json              : metadata (versi, ukuran, jenis vectorizer, tokenizer, penilaian, opsi)
+    - vocabulary.txt         : term per baris sesuai urutan kolom matriks
+    - idf.npy                : bobot IDF (hanya untuk TF-IDF)
+    - doc_{data,indices,indptr}.npy      : matriks dokumen CSR ter-normalisasi (atau bobot BM25)
+    - postings_{data,indices,indptr}.npy : matriks yang sama dalam format CSC
+    - processed_text.json    : teks hasil preprocessing sebagai array JSON, satu elemen per dokumen (jika ada)
+    - stem_table.json        : memo stemming token -> stem (opsional)
+
+    File .npy dapat dibuka dengan memory-map sehingga indeks tidak perlu dibaca
+    seluruhnya ke RAM saat dimuat. Penulisan dilakukan ke direktori sementara lalu
+    dipindahkan secara atomik. Jika proses lain menyimpan indeks dengan kunci yang
+    sama lebih dulu, indeks tersebut dipertahankan dan salinan ini dibuang.
+
+    Returns:
+    --------
+    str
+        Path direktori indeks yang disimpan.
+    """
+    os.makedirs(index_dir, exist_ok=True)
+    target = os.path.join(index_dir, key)
+    staging = tempfile.mkdtemp(prefix=f".{key}-", dir=index_dir)
+
+    try:
+        vectorizer = index.vectorizer
+        terms = vectorizer.get_feature_names_out()
+        is_tfidf = hasattr(vectorizer, 'idf_')
+
+        meta = {
+            'version': INDEX_FORMAT_VERSION,
+            'n_docs': int(index.n_docs),
+            'n_terms': int(index.n_terms),
+            'vectorizer': 'tfidf' if is_tfidf else 'count',
+            'tokenizer': 'default' if vectorizer.tokenizer is None else 'fast',
+            'scoring': 'bm25' if isinstance(index, BM25Index) else 'cosine',
+            'options': options or {}
+        }
+        with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        # Term tidak pernah mengandung spasi/baris baru (token sudah dipisah spasi)
+        with open(os.path.join(staging, 'vocabulary.txt'), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(terms))
+        if is_tfidf:
+            np.save(os.path.join(staging, 'idf.npy'), vectorizer.idf_)
+
+        # Indeks ringkas tidak menyimpan matriks dokumen; susun ulang dari posting
+        doc_matrix = index.doc_matrix if index.doc_matrix is not None else sparse.csr_matrix(index.postings)
+        for prefix, matrix in (('doc', doc_matrix), ('postings', index.postings)):
+            np.save(os.path.join(staging, f'{prefix}_data.npy'), matrix.data)
+            np.save(os.path.join(staging, f'{prefix}_indices.npy'), matrix.indices)
+            np.save(os.path.join(staging, f'{prefix}_indptr.npy'), matrix.indptr)
+
+        # Mode streaming tidak menyimpan teks hasil preprocessing (None)
+        # Disimpan sebagai array JSON karena teks hasil preprocessing dapat berisi baris baru
+        if processed_text is not None:
+            with open(os.path.join(staging, 'processed_text.json'), 'w', encoding='utf-8') as f:
+                json.dump(list(processed_text), f, ensure_ascii=False)
+
+        if stem_table:
+            with open(os.path.join(staging, 'stem_table.json'), 'w', encoding='utf-8') as f:
+                json.dump(stem_table, f, ensure_ascii=False)
+
+        # Ganti indeks lama (jika ada) dengan yang baru. Indeks lama dipindahkan secara
+        # atomik sebelum dihapus, agar tidak terhapus sebagian saat proses lain menulis
+        if os.path.exists(target):
+            retired = tempfile.mkdtemp(prefix=f".{key}-old-", dir=index_dir)
+            try:
+                os.replace(target, retired)
+            except FileNotFoundError:
+                pass
+            shutil.rmtree(retired, ignore_errors=True)
+        while True:
+            try:
+                os.replace(staging, target)
+                break
+            except OSError as e:
+                if e.errno not in (errno.EEXIST, errno.ENOTEMPTY):
+                    raise
+                # Proses lain sudah menyimpan indeks dengan kunci (dan isi) yang sama lebih
+                # dulu; pertahankan indeks tersebut (coba lagi jika sempat dipindahkan)
+                if os.path.isdir(target):
+                    shutil.rmtree(staging, ignore_errors=True)
+                    break
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return target
+
+
+def read_index(index_dir, key, mmap=True):
+    """
+    Membuka indeks yang sudah disimpan oleh `write_index`.
+
+    Parameters:
+    -----------
+    index_dir : str
+        Direktori penyimpanan indeks.
+    key : str
+        Kunci indeks (lihat `index_key`).
+    mmap : bool, optional
+        Jika True, array dibuka dengan memory-map (read-only). Default adalah True.
+
+    Returns:
+    --------
+    tuple or None
+        (ScoringIndex, list of str teks hasil preprocessing atau None jika tidak
+        disimpan), atau None jika indeks tidak ada, versinya tidak cocok, atau jumlah
+        teks tidak sama dengan jumlah dokumen.
+    """
+    path = os.path.join(index_dir, key)
+    meta_path = os.path.join(path, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if meta.get('version') != INDEX_FORMAT_VERSION:
+        return None
+
+    n_docs, n_terms = meta['n_docs'], meta['n_terms']
+    mmap_mode = 'r' if mmap else None
+
+    with open(os.path.join(path, 'vocabulary.txt'), 'r', encoding='utf-8') as f:
+        terms = f.read().split('\n') if n_terms else []
+    vocabulary = {term: i for i, term in enumerate(terms)}
+
+    from ir_logic.vectorization import tokenizer_options
+
+    # Bangun ulang vectorizer dari kosakata (dan IDF) tanpa fit ulang
+    tokenizer_options = tokenizer_options(meta.get('tokenizer') == 'fast')
+    if meta['vectorizer'] == 'tfidf':
+        vectorizer = TfidfVectorizer(vocabulary=vocabulary, **tokenizer_options)
+        vectorizer.idf_ = np.load(os.path.join(path, 'idf.npy'))
+    else:
+        vectorizer = CountVectorizer(vocabulary=vocabulary, **tokenizer_options)
+
+    def load_matrix(prefix, matrix_class, shape):
+        arrays = [np.load(os.path.join(path, f'{prefix}_{name}.npy'), mmap_mode=mmap_mode)
+                  for name in ('data', 'indices', 'indptr')]
+        matrix = matrix_class(tuple(arrays), shape=shape, copy=False)
+        matrix.has_sorted_indices = True
+        return matrix
+
+    doc_matrix = load_matrix('doc', sparse.csr_matrix, (n_docs, n_terms))
+    postings = load_matrix('postings', sparse.csc_matrix, (n_docs, n_terms))
+    index_class = BM25Index if meta.get('scoring') == 'bm25' else ScoringIndex
+    index = index_class.from_normalized(vectorizer, doc_matrix, postings)
+
+    processed_text = None
+    processed_path = os.path.join(path, 'processed_text.json')
+    if os.path.exists(processed_path):
+        with open(processed_path, 'r', encoding='utf-8') as f:
+            processed_text = json.load(f)
+        # Teks yang tidak sesuai jumlah dokumen akan menggeser indeks baris terhadap dataset
+        if len(processed_text) != n_docs:
+            return None
+
+    return index, processed_text
+
+
+def read_stem_table(index_dir, key):
+    """
+    Membaca memo stemming yang disimpan bersama indeks, atau None jika tidak ada.
+    """
+    path = os.path.join(index_dir, key, 'stem_table.json')
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
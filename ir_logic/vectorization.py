@@ -1,8 +1,82 @@
+import re
+from collections import Counter
+
 import numpy as np
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.preprocessing import normalize
+from ir_logic.display import PackedStrings, display_fields
+from ir_logic.indexing import BM25_B, BM25_K1, BM25Index, ScoringIndex, ShardedIndex, select_top_k
+from ir_logic.instrumentation import record_stats, stage
+
+# Jenis model yang didukung: cosine similarity (BoW, TF-IDF, TF-IDF hashing) dan peringkat BM25
+MODEL_TYPES = ('bow', 'tfidf', 'bm25', 'hashing')
+
+# Model yang dibangun dari kosakata hasil fit (bukan feature hashing)
+VOCABULARY_MODEL_TYPES = ('bow', 'tfidf', 'bm25')
+
+# Jumlah bucket default model 'hashing' (2^20 kolom; tabrakan jarang untuk kosakata < ~100 ribu term)
+DEFAULT_N_BUCKETS = 2 ** 20
+
+# Pola token default CountVectorizer/TfidfVectorizer
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+
+
+def fast_word_tokens(document):
+    """
+    Tokenizer cepat untuk vectorizer, setara dengan `token_pattern` default sklearn.
+
+    Dokumen hasil preprocessing hanya berisi kata yang dipisah spasi, sehingga cukup
+    dipecah dengan `str.split` dan token satu karakter dibuang. Jika dokumen masih
+    mengandung karakter non-kata, digunakan pola default.
+    """
+    if _NON_WORD_PATTERN.search(document) is None:
+        return [token for token in document.split() if len(token) > 1]
+    return TOKEN_PATTERN.findall(document)
+
+
+def tokenizer_options(fast_tokenizer):
+    """
+    Mengembalikan argumen konstruktor vectorizer untuk mode tokenizer yang dipilih.
+    """
+    # token_pattern=None mencegah peringatan sklearn saat tokenizer kustom dipakai
+    return {'tokenizer': fast_word_tokens, 'token_pattern': None} if fast_tokenizer else {}
+
+
+# Pemangkasan kosakata default: tanpa pemangkasan (sama dengan default sklearn)
+DEFAULT_MIN_DF = 1
+DEFAULT_MAX_DF = 1.0
+DEFAULT_MAX_FEATURES = None
+
+
+def pruning_options(min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES):
+    """
+    Mengembalikan argumen pemangkasan kosakata untuk vectorizer, atau dict kosong jika
+    semuanya default (sehingga kunci cache dan indeks di disk yang lama tetap berlaku).
+    """
+    options = {'min_df': min_df, 'max_df': max_df, 'max_features': max_features}
+    defaults = {'min_df': DEFAULT_MIN_DF, 'max_df': DEFAULT_MAX_DF, 'max_features': DEFAULT_MAX_FEATURES}
+    return {} if options == defaults else options
 
-def vectorize_bow(documents):
+
+def _pruned_vocabulary_error():
+    return ValueError(
+        "Gagal membuat indeks: tidak ada term yang tersisa setelah pemangkasan kosakata. "
+        "Coba turunkan min_df atau naikkan max_df."
+    )
+
+
+def _empty_vocabulary_error(model_name):
+    return ValueError(
+        f"Gagal membuat matriks {model_name}: Kosakata kosong. "
+        "Ini kemungkinan terjadi karena semua dokumen hanya berisi 'stop words' "
+        "atau karakter yang diabaikan setelah pra-pemrosesan. "
+        "Coba periksa kembali data Anda atau sesuaikan langkah pra-pemrosesan."
+    )
+
+
+def vectorize_bow(documents, fast_tokenizer=False, min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES):
     """
     Membuat representasi Bag-of-Words (BoW) dari dokumen.
 
@@ -10,6 +84,11 @@ def vectorize_bow(documents):
     -----------
     documents : list of str
         Daftar dokumen (teks yang sudah diproses).
+    fast_tokenizer : bool, optional
+        Jika True, gunakan `fast_word_tokens` sebagai tokenizer. Default adalah False.
+    min_df, max_df, max_features : optional
+        Pemangkasan kosakata seperti pada sklearn (lihat `prune_vocabulary`).
+        Default tanpa pemangkasan.
 
     Returns:
     --------
@@ -18,11 +97,21 @@ def vectorize_bow(documents):
     scipy.sparse.csr_matrix
         Matriks BoW dari dokumen.
     """
-    vectorizer = CountVectorizer()
-    bow_matrix = vectorizer.fit_transform(documents)
+    # Frekuensi term per dokumen selalu muat di int32 (separuh ukuran default int64)
+    vectorizer = CountVectorizer(dtype=np.int32, min_df=min_df, max_df=max_df, max_features=max_features,
+                                 **tokenizer_options(fast_tokenizer))
+    try:
+        bow_matrix = vectorizer.fit_transform(documents)
+    except ValueError as e:
+        if 'empty vocabulary' in str(e):
+            raise _empty_vocabulary_error('BoW')
+        elif 'no terms remain' in str(e):
+            raise _pruned_vocabulary_error()
+        else:
+            raise e
     return vectorizer, bow_matrix
 
-def vectorize_tfidf(documents):
+def vectorize_tfidf(documents, fast_tokenizer=False, min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES):
     """
     Membuat representasi TF-IDF dari dokumen.
 
@@ -30,6 +119,11 @@ def vectorize_tfidf(documents):
     -----------
     documents : list of str
         Daftar dokumen (teks yang sudah diproses).
+    fast_tokenizer : bool, optional
+        Jika True, gunakan `fast_word_tokens` sebagai tokenizer. Default adalah False.
+    min_df, max_df, max_features : optional
+        Pemangkasan kosakata seperti pada sklearn (lihat `prune_vocabulary`).
+        Default tanpa pemangkasan.
 
     Returns:
     --------
@@ -38,60 +132,528 @@ def vectorize_tfidf(documents):
     scipy.sparse.csr_matrix
         Matriks TF-IDF dari dokumen.
     """
-    vectorizer = TfidfVectorizer()
+    vectorizer = TfidfVectorizer(min_df=min_df, max_df=max_df, max_features=max_features,
+                                 **tokenizer_options(fast_tokenizer))
     try:
         tfidf_matrix = vectorizer.fit_transform(documents)
     except ValueError as e:
         if 'empty vocabulary' in str(e):
-            raise ValueError(
-                "Gagal membuat matriks TF-IDF: Kosakata kosong. "
-                "Ini kemungkinan terjadi karena semua dokumen hanya berisi 'stop words' "
-                "atau karakter yang diabaikan setelah pra-pemrosesan. "
-                "Coba periksa kembali data Anda atau sesuaikan langkah pra-pemrosesan."
-            )
+            raise _empty_vocabulary_error('TF-IDF')
+        elif 'no terms remain' in str(e):
+            raise _pruned_vocabulary_error()
         else:
             raise e
     return vectorizer, tfidf_matrix
 
-def search(query, vectorizer, doc_vectors, df, search_column):
+def vectorize_tfidf_from_counts(count_vectorizer, count_matrix):
     """
-    Mencari dokumen yang relevan dengan query menggunakan cosine similarity.
+    Membuat representasi TF-IDF dari matriks BoW yang sudah ada tanpa tokenisasi ulang.
+
+    Hasilnya sama dengan `vectorize_tfidf` pada dokumen yang sama, karena keduanya
+    memakai tokenisasi dan kosakata default yang sama.
+
+    Parameters:
+    -----------
+    count_vectorizer : CountVectorizer
+        Objek vectorizer BoW yang sudah di-fit.
+    count_matrix : scipy.sparse.csr_matrix
+        Matriks BoW dari dokumen.
+
+    Returns:
+    --------
+    TfidfVectorizer
+        Objek vectorizer TF-IDF dengan kosakata dan bobot IDF yang sudah ditetapkan.
+    scipy.sparse.csr_matrix
+        Matriks TF-IDF dari dokumen.
+    """
+    transformer = TfidfTransformer()
+    tfidf_matrix = transformer.fit_transform(count_matrix)
+
+    vectorizer = TfidfVectorizer(vocabulary=count_vectorizer.vocabulary_, tokenizer=count_vectorizer.tokenizer,
+                                 token_pattern=count_vectorizer.token_pattern)
+    vectorizer.idf_ = transformer.idf_
+    return vectorizer, tfidf_matrix
+
+def count_into_vocabulary(documents, vocabulary, fast_tokenizer=False):
+    """
+    Menghitung matriks BoW untuk sekumpulan dokumen dengan id kolom dari kosakata global.
+
+    Dokumen di-vektorisasi dengan CountVectorizer (tokenisasi sama dengan `vectorize_bow`),
+    lalu kolomnya dipetakan ke `vocabulary`. Term yang belum ada ditambahkan ke akhir
+    `vocabulary` (dict diubah langsung).
+
+    Parameters:
+    -----------
+    documents : list of str
+        Daftar dokumen (teks yang sudah diproses).
+    vocabulary : dict
+        Kosakata global term -> id kolom.
+    fast_tokenizer : bool, optional
+        Jika True, gunakan `fast_word_tokens` sebagai tokenizer. Default adalah False.
+
+    Returns:
+    --------
+    scipy.sparse.csr_matrix
+        Matriks BoW berukuran len(documents) x len(vocabulary) (indeks kolom per baris
+        belum tentu terurut).
+    """
+    chunk_vectorizer = CountVectorizer(dtype=np.int32, **tokenizer_options(fast_tokenizer))
+    try:
+        chunk_matrix = chunk_vectorizer.fit_transform(documents)
+    except ValueError as e:
+        if 'empty vocabulary' not in str(e):
+            raise
+        # Tidak ada term sama sekali: semua baris kosong
+        return sparse.csr_matrix((len(documents), len(vocabulary)), dtype=np.int32)
+
+    # Petakan kolom lokal ke id term global
+    column_map = np.empty(len(chunk_vectorizer.vocabulary_), dtype=np.int32)
+    for term, local_id in chunk_vectorizer.vocabulary_.items():
+        global_id = vocabulary.get(term)
+        if global_id is None:
+            global_id = vocabulary[term] = len(vocabulary)
+        column_map[local_id] = global_id
+
+    return sparse.csr_matrix((chunk_matrix.data, column_map[chunk_matrix.indices], chunk_matrix.indptr),
+                             shape=(len(documents), len(vocabulary)))
+
+
+class IncrementalBowBuilder:
+    """
+    Membangun kosakata dan matriks BoW secara bertahap, satu potongan dokumen per panggilan.
+
+    Setiap potongan di-vektorisasi dengan `count_into_vocabulary`, sehingga kolomnya
+    dipetakan ke kosakata global yang terus bertambah.
+    Teks dokumen tidak disimpan; hanya array matriks sparse per potongan. Hasil
+    `finalize` sama dengan `vectorize_bow` pada seluruh dokumen sekaligus.
+
+    Parameters:
+    -----------
+    fast_tokenizer : bool, optional
+        Jika True, gunakan `fast_word_tokens` sebagai tokenizer. Default adalah False.
+    """
+
+    def __init__(self, fast_tokenizer=False):
+        self.fast_tokenizer = fast_tokenizer
+        self.vocabulary = {}
+        self.n_docs = 0
+        self._indices = []
+        self._data = []
+        self._row_lengths = []
+
+    def partial_fit(self, documents):
+        """
+        Menambahkan satu potongan dokumen (teks yang sudah diproses) ke matriks.
+        """
+        documents = list(documents)
+        if not documents:
+            return self
+        chunk_matrix = count_into_vocabulary(documents, self.vocabulary, self.fast_tokenizer)
+        self._indices.append(chunk_matrix.indices)
+        self._data.append(chunk_matrix.data)
+        self._row_lengths.append(np.diff(chunk_matrix.indptr))
+        self.n_docs += len(documents)
+        return self
+
+    def finalize(self):
+        """
+        Menyusun matriks BoW akhir dengan kosakata terurut seperti CountVectorizer.
+
+        Potongan dilepaskan satu per satu saat disalin ke array akhir, sehingga builder
+        tidak dapat dipakai lagi setelah `finalize`.
+
+        Returns:
+        --------
+        CountVectorizer
+            Objek vectorizer dengan kosakata yang sudah ditetapkan.
+        scipy.sparse.csr_matrix
+            Matriks BoW dari seluruh dokumen yang ditambahkan.
+        """
+        if not self.vocabulary:
+            raise _empty_vocabulary_error('BoW')
+
+        indptr = np.zeros(self.n_docs + 1, dtype=np.int64)
+        np.cumsum(np.concatenate(self._row_lengths), out=indptr[1:])
+        nnz = int(indptr[-1])
+        n_terms = len(self.vocabulary)
+        index_dtype = np.int32 if max(nnz, n_terms) <= np.iinfo(np.int32).max else np.int64
+
+        # CountVectorizer mengurutkan kosakata secara alfabetis: rank[id global] = kolom akhir
+        terms = sorted(self.vocabulary)
+        rank = np.empty(n_terms, dtype=index_dtype)
+        rank[[self.vocabulary[term] for term in terms]] = np.arange(n_terms, dtype=index_dtype)
+        vocabulary = {term: i for i, term in enumerate(terms)}
+
+        indices = np.empty(nnz, dtype=index_dtype)
+        data = np.empty(nnz, dtype=np.int32)
+        position = 0
+        while self._indices:
+            chunk_indices, chunk_data = self._indices.pop(0), self._data.pop(0)
+            end = position + len(chunk_indices)
+            np.take(rank, chunk_indices, out=indices[position:end])
+            data[position:end] = chunk_data
+            position = end
+        self._row_lengths = []
+
+        matrix = sparse.csr_matrix((data, indices, indptr.astype(index_dtype)), shape=(self.n_docs, n_terms),
+                                   copy=False)
+        matrix.sort_indices()
+
+        vectorizer = CountVectorizer(vocabulary=vocabulary, dtype=np.int32, **tokenizer_options(self.fast_tokenizer))
+        vectorizer.fit(())
+        return vectorizer, matrix
+
+
+def prune_vocabulary(count_vectorizer, count_matrix, min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF,
+                     max_features=DEFAULT_MAX_FEATURES):
+    """
+    Memangkas kosakata matriks BoW yang sudah ada tanpa tokenisasi ulang.
+
+    Aturannya sama dengan `min_df`, `max_df`, dan `max_features` pada CountVectorizer:
+    term dengan frekuensi dokumen di bawah `min_df` atau di atas `max_df` dibuang
+    (int = jumlah dokumen, float = proporsi dokumen), lalu hanya `max_features` term
+    dengan frekuensi total tertinggi yang disimpan (seri diurutkan secara alfabetis).
+
+    Parameters:
+    -----------
+    count_vectorizer : CountVectorizer
+        Objek vectorizer BoW yang sudah di-fit.
+    count_matrix : scipy.sparse.csr_matrix
+        Matriks BoW dari dokumen.
+    min_df : int or float, optional
+        Frekuensi dokumen minimum. Default adalah 1.
+    max_df : int or float, optional
+        Frekuensi dokumen maksimum. Default adalah 1.0.
+    max_features : int or None, optional
+        Jumlah term maksimum. Default adalah None (tanpa batas).
+
+    Returns:
+    --------
+    CountVectorizer
+        Objek vectorizer dengan kosakata hasil pemangkasan.
+    scipy.sparse.csr_matrix
+        Matriks BoW yang hanya berisi kolom term yang disimpan.
+    """
+    count_matrix = sparse.csr_matrix(count_matrix)
+    n_docs, n_terms = count_matrix.shape
+    min_count = min_df if isinstance(min_df, (int, np.integer)) else min_df * n_docs
+    max_count = max_df if isinstance(max_df, (int, np.integer)) else max_df * n_docs
+    if max_count < min_count:
+        raise ValueError("max_df corresponds to < documents than min_df")
+
+    doc_freq = np.bincount(count_matrix.indices, minlength=n_terms)
+    keep = (doc_freq >= min_count) & (doc_freq <= max_count)
+    if max_features is not None and keep.sum() > max_features:
+        term_freq = np.bincount(count_matrix.indices, weights=count_matrix.data, minlength=n_terms)
+        candidates = np.flatnonzero(keep)
+        top = candidates[np.argsort(-term_freq[candidates], kind='stable')[:max_features]]
+        keep = np.zeros(n_terms, dtype=bool)
+        keep[top] = True
+    columns = np.flatnonzero(keep)
+    if columns.size == 0:
+        raise _pruned_vocabulary_error()
+
+    terms = count_vectorizer.get_feature_names_out()[columns]
+    vectorizer = CountVectorizer(vocabulary={term: i for i, term in enumerate(terms)}, dtype=np.int32,
+                                 tokenizer=count_vectorizer.tokenizer, token_pattern=count_vectorizer.token_pattern)
+    vectorizer.fit(())
+    return vectorizer, count_matrix[:, columns]
+
+def build_scoring_index(documents, model_type, counts=None, fast_tokenizer=False, k1=BM25_K1, b=BM25_B,
+                        min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES,
+                        n_buckets=DEFAULT_N_BUCKETS, n_jobs=None):
+    """
+    Membuat indeks siap-skor untuk model BoW, TF-IDF, BM25, atau TF-IDF hashing.
+
+    Semua model dibangun dari matriks BoW; TF-IDF dan BM25 diturunkan dari matriks
+    tersebut sehingga matriks BoW yang sudah di-cache dapat dipakai ulang saat
+    berganti model. Model 'hashing' tidak memerlukan kosakata: dokumen di-hash
+    langsung, atau kolom matriks BoW yang sudah ada dipetakan ke bucket-nya
+    (lihat `ir_logic.hashing.HashingIndex`).
+
+    Parameters:
+    -----------
+    documents : list of str
+        Daftar dokumen (teks yang sudah diproses).
+    model_type : str
+        Jenis model. Pilihan: 'bow', 'tfidf', 'bm25', 'hashing'.
+    counts : tuple, optional
+        Pasangan (CountVectorizer, matriks BoW) yang sudah dihitung untuk `documents`.
+        Jika None, dihitung dengan `vectorize_bow`.
+    fast_tokenizer : bool, optional
+        Diteruskan ke `vectorize_bow` jika `counts` tidak diberikan. Default adalah False.
+    k1 : float, optional
+        Parameter BM25 saturasi frekuensi term (hanya untuk 'bm25'). Default adalah 1.2.
+    b : float, optional
+        Parameter BM25 normalisasi panjang dokumen (hanya untuk 'bm25'). Default adalah 0.75.
+    min_df, max_df, max_features : optional
+        Pemangkasan kosakata yang diterapkan pada matriks BoW sebelum indeks dibangun
+        (lihat `prune_vocabulary`). Default tanpa pemangkasan. Tidak berlaku untuk 'hashing'.
+    n_buckets : int, optional
+        Jumlah bucket model 'hashing'. Default adalah 2^20.
+    n_jobs : int, optional
+        Jumlah proses untuk hashing dokumen (hanya untuk 'hashing'). Default adalah 1.
+
+    Returns:
+    --------
+    ScoringIndex or HashingIndex
+        Indeks dengan matriks dokumen ter-normalisasi (atau bobot BM25) dan daftar posting per term.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError("Invalid model type specified")
+
+    if model_type == 'hashing':
+        from ir_logic.hashing import HashingIndex
+
+        if pruning_options(min_df, max_df, max_features):
+            raise ValueError("Pemangkasan kosakata tidak didukung untuk model 'hashing'.")
+        if counts is not None:
+            return HashingIndex.from_counts(*counts, n_buckets=n_buckets)
+        return HashingIndex.from_documents(documents, n_buckets, fast_tokenizer, n_jobs=n_jobs)
+
+    count_vectorizer, count_matrix = counts if counts is not None else vectorize_bow(documents, fast_tokenizer)
+    pruning = pruning_options(min_df, max_df, max_features)
+    if pruning:
+        count_vectorizer, count_matrix = prune_vocabulary(count_vectorizer, count_matrix, **pruning)
+    if model_type == 'bow':
+        return ScoringIndex(count_vectorizer, count_matrix)
+    if model_type == 'bm25':
+        return BM25Index(count_vectorizer, count_matrix, k1=k1, b=b)
+    return ScoringIndex(*vectorize_tfidf_from_counts(count_vectorizer, count_matrix))
+
+class CompactVectorizer:
+    """
+    Pengganti ringkas vectorizer yang sudah di-fit, untuk indeks yang disimpan di cache.
+
+    Kosakata disimpan sebagai array term terurut (`PackedStrings`) dan dicari dengan
+    pencarian biner, bukan dict term -> id; IDF TF-IDF disimpan sebagai float32.
+    `transform` menghasilkan matriks yang sama dengan vectorizer asalnya (tokenisasi
+    default sklearn atau `fast_word_tokens`, huruf kecil, unigram).
+
+    Parameters:
+    -----------
+    terms : list of str
+        Term untuk setiap kolom (urutan kolom matriks).
+    idf : numpy.ndarray, optional
+        Bobot IDF per kolom (hanya untuk TF-IDF). Default adalah None.
+    tokenizer : callable, optional
+        Tokenizer kustom vectorizer asal, atau None untuk pola token default.
+    """
+
+    def __init__(self, terms, idf=None, tokenizer=None):
+        order = sorted(range(len(terms)), key=terms.__getitem__)
+        self.terms = PackedStrings(terms[i] for i in order)
+        # Kolom untuk setiap posisi term terurut; None jika kosakata sudah terurut
+        column_ids = np.asarray(order, dtype=np.int32)
+        self.column_ids = None if np.array_equal(column_ids, np.arange(len(terms))) else column_ids
+        self.tokenizer = tokenizer
+        if idf is not None:
+            self.idf_ = np.asarray(idf, dtype=np.float32)
+
+    @classmethod
+    def from_vectorizer(cls, vectorizer):
+        """
+        Membuat CompactVectorizer dari CountVectorizer/TfidfVectorizer yang sudah di-fit.
+        """
+        if isinstance(vectorizer, cls):
+            return vectorizer
+        return cls(list(vectorizer.get_feature_names_out()), getattr(vectorizer, 'idf_', None), vectorizer.tokenizer)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def lookup(self, term):
+        """
+        Mengembalikan id kolom sebuah term, atau -1 jika term tidak ada di kosakata.
+        """
+        key = term.encode('utf-8')
+        blob, offsets = self.terms.blob, self.terms.offsets
+        low, high = 0, len(self.terms)
+        # Urutan byte UTF-8 sama dengan urutan code point, sehingga sama dengan urutan str
+        while low < high:
+            middle = (low + high) // 2
+            if blob[offsets[middle]:offsets[middle + 1]] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self.terms) or blob[offsets[low]:offsets[low + 1]] != key:
+            return -1
+        return low if self.column_ids is None else int(self.column_ids[low])
+
+    def get_feature_names_out(self):
+        """
+        Mengembalikan term untuk setiap kolom, seperti vectorizer sklearn.
+        """
+        terms = np.empty(len(self.terms), dtype=object)
+        sorted_terms = self.terms.take(np.arange(len(self.terms)))
+        if self.column_ids is None:
+            terms[:] = sorted_terms
+        else:
+            terms[self.column_ids] = sorted_terms
+        return terms
+
+    def transform(self, documents):
+        """
+        Mengubah dokumen menjadi matriks frekuensi term (atau TF-IDF ter-normalisasi L2
+        jika IDF tersedia), seperti `transform` vectorizer asal.
+        """
+        analyze = self.tokenizer or TOKEN_PATTERN.findall
+        indices, data, indptr = [], [], [0]
+        for document in documents:
+            counts = Counter(column for column in map(self.lookup, analyze(document.lower())) if column >= 0)
+            for column in sorted(counts):
+                indices.append(column)
+                data.append(counts[column])
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix((np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32),
+                                    np.asarray(indptr, dtype=np.int32)), shape=(len(indptr) - 1, len(self.terms)))
+        if not hasattr(self, 'idf_'):
+            return matrix
+        matrix.data *= self.idf_[matrix.indices]
+        return normalize(matrix, norm='l2')
+
+
+def compact_index(index, dtype=np.float32):
+    """
+    Membuat salinan ringkas sebuah indeks untuk disimpan di cache.
+
+    Bobot posting disimpan sebagai `dtype` (default float32) dengan indeks int32,
+    matriks dokumen per baris (salinan kedua bobot yang tidak dipakai untuk penilaian)
+    dibuang, dan vectorizer diganti dengan `CompactVectorizer`. Skor dihitung dengan
+    jalur yang sama; selisihnya hanya pembulatan float32 (sekitar 1e-7).
+
+    Parameters:
+    -----------
+    index : ScoringIndex
+        Indeks yang dibangun oleh `build_scoring_index` atau dibaca dari disk.
+    dtype : numpy.dtype or None, optional
+        Tipe bobot posting. None mempertahankan tipe (dan memory-map) bobot yang ada,
+        misalnya untuk indeks yang dibuka dari disk. Default adalah numpy.float32.
+
+    Returns:
+    --------
+    ScoringIndex
+        Indeks dengan kelas yang sama (ScoringIndex atau BM25Index).
+    """
+    postings = index.postings
+    data = postings.data if dtype is None else postings.data.astype(dtype, copy=False)
+    compact_postings = sparse.csc_matrix((data, postings.indices, postings.indptr), shape=postings.shape, copy=False)
+    compact_postings.has_sorted_indices = True
+    compact = type(index).from_normalized(CompactVectorizer.from_vectorizer(index.vectorizer), None, compact_postings)
+    for name in ('k1', 'b'):
+        if hasattr(index, name):
+            setattr(compact, name, getattr(index, name))
+    return compact
+
+def search(query, index, df, search_column, top_k=10, min_score=0.01, ids_only=False):
+    """
+    Mencari dokumen yang relevan dengan query menggunakan cosine similarity (atau skor BM25).
 
     Parameters:
     -----------
     query : str
         Query yang sudah diproses.
-    vectorizer : CountVectorizer or TfidfVectorizer
-        Objek vectorizer yang sudah di-fit.
-    doc_vectors : scipy.sparse.csr_matrix
-        Matriks vektor dari seluruh dokumen.
-    df : pandas.DataFrame
-        DataFrame yang berisi data dokumen.
+    index : ScoringIndex or ShardedIndex
+        Indeks siap-skor yang dibangun dari vectorizer dan matriks dokumen.
+    df : pandas.DataFrame or DisplayStore
+        DataFrame yang berisi data dokumen, atau kolom tampilan yang sudah disiapkan.
     search_column : str
         Nama kolom di DataFrame yang berisi teks asli untuk ditampilkan.
+    top_k : int or None, optional
+        Jumlah hasil maksimum yang dikembalikan. None berarti tanpa batas. Default adalah 10.
+    min_score : float, optional
+        Skor minimum (eksklusif) agar dokumen ditampilkan. Default adalah 0.01.
+    ids_only : bool, optional
+        Jika True, hasil hanya berisi 'original_index' dan 'score'. Default adalah False.
 
     Returns:
     --------
     list
         Daftar hasil pencarian.
     """
-    # Ubah query menjadi vektor
-    query_vector = vectorizer.transform([query])
+    # Ubah query menjadi vektor ter-normalisasi
+    with stage('query_transform'):
+        query_vector = index.transform(query)
+
+    # Hitung cosine similarity hanya untuk dokumen di posting term query.
+    # Indeks ber-shard menilai shard secara paralel dan hanya mengembalikan top-k per shard.
+    with stage('scoring'):
+        if isinstance(index, ShardedIndex):
+            doc_indices, similarities, n_candidates = index.score_top_k(query_vector, top_k=top_k, min_score=min_score)
+        else:
+            doc_indices, similarities = index.score(query_vector)
+            n_candidates = len(doc_indices)
+
+    # Pilih k hasil teratas di atas ambang batas skor (seleksi parsial)
+    with stage('top_k'):
+        top_indices, top_scores = select_top_k(doc_indices, similarities, top_k=top_k, min_score=min_score)
+    record_stats(query_nnz=int(query_vector.nnz), candidates=int(n_candidates), n_results=int(len(top_indices)))
+
+    with stage('formatting'):
+        return format_results(top_indices, top_scores, df, search_column, ids_only=ids_only)
 
-    # Hitung cosine similarity
-    similarities = cosine_similarity(query_vector, doc_vectors).flatten()
+def search_many(queries, index, df, search_column, top_k=10, min_score=0.01, ids_only=False):
+    """
+    Mencari dokumen untuk banyak query sekaligus menggunakan satu perkalian matriks sparse.
 
-    # Dapatkan 10 hasil teratas
-    top_indices = similarities.argsort()[-10:][::-1]
+    Parameters:
+    -----------
+    queries : list of str
+        Daftar query yang sudah diproses.
+    index : ScoringIndex
+        Indeks siap-skor yang dibangun dari vectorizer dan matriks dokumen.
+    df : pandas.DataFrame or DisplayStore
+        DataFrame yang berisi data dokumen, atau kolom tampilan yang sudah disiapkan.
+    search_column : str
+        Nama kolom di DataFrame yang berisi teks asli untuk ditampilkan.
+    top_k : int or None, optional
+        Jumlah hasil maksimum per query. None berarti tanpa batas. Default adalah 10.
+    min_score : float, optional
+        Skor minimum (eksklusif) agar dokumen ditampilkan. Default adalah 0.01.
+    ids_only : bool, optional
+        Jika True, hasil hanya berisi 'original_index' dan 'score'. Default adalah False.
 
-    results = []
-    for i in top_indices:
-        if similarities[i] > 0.01:  # Filter hasil yang tidak relevan
-            results.append({
-                'original_index': int(i),
-                'title': df.iloc[i].get('title', f"Dokumen {i}"),
-                'snippet': df.iloc[i][search_column][:150] + '...',
-                'score': float(similarities[i])
-            })
+    Returns:
+    --------
+    list of list
+        Daftar hasil pencarian untuk setiap query, sesuai urutan input.
+    """
+    if len(queries) == 0:
+        return []
+
+    # Ubah semua query menjadi satu matriks lalu hitung skor sekaligus
+    with stage('query_transform'):
+        query_matrix = index.transform_many(queries)
+    with stage('scoring'):
+        score_matrix = index.score_many(query_matrix)
+    record_stats(query_nnz=int(query_matrix.nnz), candidates=int(score_matrix.nnz))
+
+    all_results = []
+    for row in range(score_matrix.shape[0]):
+        start, end = score_matrix.indptr[row], score_matrix.indptr[row + 1]
+        top_indices, top_scores = select_top_k(
+            score_matrix.indices[start:end], score_matrix.data[start:end],
+            top_k=top_k, min_score=min_score
+        )
+        all_results.append(format_results(top_indices, top_scores, df, search_column, ids_only=ids_only))
+    return all_results
+
+def format_results(doc_indices, scores, df, search_column, ids_only=False):
+    """
+    Mengubah indeks dokumen dan skor menjadi daftar hasil pencarian untuk ditampilkan.
+
+    Judul dan cuplikan diambil sekaligus untuk semua hasil (lihat `display_fields`);
+    `df` dapat berupa DataFrame atau `DisplayStore`. Dengan `ids_only=True`, hasil
+    hanya berisi 'original_index' dan 'score'.
+    """
+    ids = np.asarray(doc_indices, dtype=np.int64)
+    scores = np.asarray(scores, dtype=np.float64).tolist()
+    if ids_only:
+        return [{'original_index': i, 'score': score} for i, score in zip(ids.tolist(), scores)]
 
-    return results
\ No newline at end of file
+    titles, snippets = display_fields(df, search_column, ids)
+    return [
+        {'original_index': i, 'title': title, 'snippet': snippet, 'score': score}
+        for i, title, snippet, score in zip(ids.tolist(), titles, snippets, scores)
+    ]
\ No newline at end of file
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Layanan pencarian HTTP/JSON lokal di atas `ir_system`, hanya dengan pustaka standar (asyncio).
+
+Indeks dimuat (atau dibangun) sekali saat layanan dimulai dan tetap hangat di cache
+proses, sehingga setiap permintaan hanya menjalankan preprocessing query, scoring,
+dan pembentukan hasil. Event loop asyncio menerima banyak koneksi bersamaan;
+pekerjaan CPU (`search_documents`, `search_documents_batch`, `fetch_documents`)
+dijalankan di worker pool berupa thread yang berbagi cache indeks yang sama.
+
+Endpoint:
+    GET  /health        status layanan
+    GET  /stats         statistik permintaan, cache, dan worker pool
+    POST /search        {"query": str, "dataset": str, "search_column": str, ...opsi}
+    POST /search/batch  {"queries": [str], "dataset": str, ...opsi}
+    POST /documents     {"doc_ids": [int], "dataset": str, "search_column": str}
+
+`dataset` adalah nama file di `--data-dir` (default dataset pertama di `--warm`);
+opsi lain mengikuti argumen `search_documents` (lihat `SEARCH_OPTIONS`).
+
+    python ir_service.py --data-dir uploads --warm gojek.csv --column content --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from ir_logic.caching import cache, query_cache
+from ir_logic.indexing import SCORING_THREADS
+from ir_logic.storage import default_index_dir
+from ir_system import fetch_documents, search_documents, search_documents_batch
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# Jumlah thread worker default (dapat diubah melalui variabel lingkungan)
+DEFAULT_WORKERS = int(os.environ.get('IR_SERVICE_WORKERS', 0)) or SCORING_THREADS
+
+# Ukuran body permintaan maksimum (byte)
+MAX_BODY_BYTES = 1 << 20
+
+# Opsi permintaan yang diteruskan ke `search_documents`/`search_documents_batch`
+SEARCH_OPTIONS = (
+    'search_column', 'model_type', 'language', 'use_spacy', 'apply_stemming', 'apply_lemmatization',
+    'top_k', 'min_score', 'tokenizer', 'streaming', 'live', 'k1', 'b', 'ids_only',
+    'min_df', 'max_df', 'max_features', 'n_buckets', 'n_shards'
+)
+
+
+class ServiceError(Exception):
+    """
+    Kesalahan permintaan dengan kode status HTTP (juga dipakai oleh `ServiceClient`).
+    """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = HTTPStatus(status)
+        self.message = message
+
+
+def _json_default(value):
+    # Nilai NumPy di hasil, metrik, dan statistik diubah menjadi tipe Python
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Objek {type(value).__name__} tidak dapat diubah menjadi JSON")
+
+
+class SearchService:
+    """
+    Layanan pencarian asyncio yang menjalankan pencarian di worker pool.
+
+    Parameters:
+    -----------
+    data_dir : str
+        Direktori dataset; permintaan hanya dapat memakai file di dalamnya.
+    defaults : dict, optional
+        Nilai default opsi pencarian (lihat `SEARCH_OPTIONS`), misalnya kolom dan model.
+    index_dir : str or None, optional
+        Direktori indeks di disk (lihat `load_index`). Default adalah None (tanpa penyimpanan).
+    workers : int, optional
+        Jumlah thread worker. Default adalah jumlah core (`IR_SERVICE_WORKERS`).
+    default_dataset : str, optional
+        Dataset yang dipakai jika permintaan tidak menyebut `dataset`.
+    """
+
+    def __init__(self, data_dir, defaults=None, index_dir=None, workers=DEFAULT_WORKERS,
+                 default_dataset=None):
+        self.data_dir = os.path.realpath(data_dir)
+        self.defaults = dict(defaults or {})
+        self.index_dir = index_dir
+        self.workers = workers
+        self.default_dataset = default_dataset
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ir-service')
+        self.started = time.time()
+        self.warmed = []
+        self.in_flight = 0
+        self.requests = {}
+        self._routes = {
+            ('GET', '/health'): self.health,
+            ('GET', '/stats'): self.stats,
+            ('POST', '/search'): self.search,
+            ('POST', '/search/batch'): self.search_batch,
+            ('POST', '/documents'): self.documents
+        }
+
+    def resolve_dataset(self, name):
+        """
+        Mengubah nama dataset menjadi path file di `data_dir`.
+        """
+        name = name or self.default_dataset
+        if not isinstance(name, str) or not name:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Field 'dataset' wajib diisi.")
+        filepath = os.path.realpath(os.path.join(self.data_dir, name))
+        if os.path.dirname(filepath) != self.data_dir or not os.path.isfile(filepath):
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"Dataset '{name}' tidak ditemukan.")
+        return filepath
+
+    def search_options(self, payload):
+        """
+        Menggabungkan opsi default layanan dengan opsi di permintaan.
+        """
+        unknown = set(payload) - set(SEARCH_OPTIONS) - {'query', 'queries', 'dataset', 'doc_ids'}
+        if unknown:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"Opsi tidak dikenal: {', '.join(sorted(unknown))}")
+        options = {**self.defaults, **{name: payload[name] for name in SEARCH_OPTIONS if name in payload}}
+        if 'search_column' not in options:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Field 'search_column' wajib diisi.")
+        return options
+
+    async def run(self, func, *args, **kwargs):
+        """
+        Menjalankan pekerjaan CPU di worker pool tanpa memblokir event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, partial(func, *args, **kwargs))
+
+    async def warm(self, datasets):
+        """
+        Memuat atau membangun indeks dan kolom tampilan untuk `datasets` dengan opsi default.
+        """
+        for name in datasets:
+            filepath = self.resolve_dataset(name)
+            options = self.search_options({})
+            # Pencarian kosong memuat lapisan cache yang sama dengan query sungguhan
+            await self.run(search_documents, filepath, '', index_dir=self.index_dir, **options)
+            self.warmed.append(name)
+
+    async def health(self, payload):
+        return {'status': 'ok', 'uptime_seconds': time.time() - self.started, 'datasets': self.warmed}
+
+    async def stats(self, payload):
+        return {
+            'uptime_seconds': time.time() - self.started,
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'requests': self.requests,
+            'cache': cache.stats(),
+            'query_cache': query_cache.stats(),
+            'datasets': self.warmed
+        }
+
+    async def search(self, payload):
+        query = payload.get('query')
+        if not isinstance(query, str):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Field 'query' (string) wajib diisi.")
+        filepath = self.resolve_dataset(payload.get('dataset'))
+        return await self.run(search_documents, filepath, query, index_dir=self.index_dir, **self.search_options(payload))
+
+    async def search_batch(self, payload):
+        queries = payload.get('queries')
+        if not isinstance(queries, list) or not all(isinstance(query, str) for query in queries):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Field 'queries' (list of string) wajib diisi.")
+        filepath = self.resolve_dataset(payload.get('dataset'))
+        return {'outputs': await self.run(search_documents_batch, filepath, queries, index_dir=self.index_dir,
+                                          **self.search_options(payload))}
+
+    async def documents(self, payload):
+        doc_ids = payload.get('doc_ids')
+        if not isinstance(doc_ids, list) or not all(isinstance(i, int) for i in doc_ids):
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Field 'doc_ids' (list of int) wajib diisi.")
+        filepath = self.resolve_dataset(payload.get('dataset'))
+        options = self.search_options(payload)
+        return {'documents': await self.run(fetch_documents, filepath, options['search_column'], doc_ids,
+                                            streaming=options.get('streaming', False))}
+
+    async def dispatch(self, method, target, body):
+        """
+        Menjalankan handler untuk satu permintaan.
+
+        Returns:
+        --------
+        tuple
+            (status HTTP, payload JSON)
+        """
+        path = urlsplit(target).path.rstrip('/') or '/'
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': f"Metode {method} tidak didukung untuk {path}."}
+            return HTTPStatus.NOT_FOUND, {'error': f"Endpoint {path} tidak ditemukan."}
+
+        counters = self.requests.setdefault(path, {'count': 0, 'errors': 0, 'total_seconds': 0.0, 'max_seconds': 0.0})
+        counters['count'] += 1
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "Body permintaan harus berupa objek JSON.")
+            return HTTPStatus.OK, await handler(payload)
+        except ServiceError as e:
+            counters['errors'] += 1
+            return e.status, {'error': e.message}
+        except (ValueError, TypeError, KeyError) as e:
+            # Opsi atau kolom yang tidak valid (misalnya model_type atau search_column)
+            counters['errors'] += 1
+            return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+        except Exception as e:
+            counters['errors'] += 1
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': f"{type(e).__name__}: {e}"}
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight -= 1
+            counters['total_seconds'] += elapsed
+            counters['max_seconds'] = max(counters['max_seconds'], elapsed)
+
+    async def handle_connection(self, reader, writer):
+        """
+        Melayani satu koneksi HTTP/1.1 (mendukung keep-alive).
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                parts = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = len(parts) == 3 and parts[2] == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if len(parts) != 3 or length < 0:
+                    status, payload, keep_alive = HTTPStatus.BAD_REQUEST, {'error': "Permintaan HTTP tidak valid."}, False
+                elif length > MAX_BODY_BYTES:
+                    status, payload, keep_alive = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': "Body permintaan terlalu besar."}, False
+                else:
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = await self.dispatch(parts[0], parts[1], body)
+
+                data = json.dumps(payload, default=_json_default).encode('utf-8')
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            # Koneksi terputus atau baris header melebihi batas StreamReader
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Mulai menerima koneksi; port 0 memilih port bebas (lihat `server.sockets`).
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, warm=()):
+        """
+        Menghangatkan indeks untuk `warm`, lalu melayani permintaan sampai dihentikan.
+        """
+        await self.warm(warm)
+        server = await self.start(host, port)
+        print(f"Layanan pencarian siap di http://{host}:{server.sockets[0].getsockname()[1]} "
+              f"({self.workers} worker, dataset hangat: {', '.join(self.warmed) or '-'})", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+
+
+class ServiceClient:
+    """
+    Klien sinkron untuk `SearchService` (dipakai oleh Streamlit sebagai thin client).
+
+    Setiap metode mengembalikan JSON hasil layanan; status selain 200 menghasilkan
+    `ServiceError` dengan pesan dari layanan.
+
+    Parameters:
+    -----------
+    url : str
+        Alamat layanan, misalnya 'http://127.0.0.1:8765'.
+    timeout : float, optional
+        Batas waktu per permintaan (detik). Default adalah 300.
+    """
+
+    def __init__(self, url, timeout=300):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+
+    def _request(self, method, path, payload=None):
+        data = json.dumps(payload).encode('utf-8') if payload is not None else None
+        request = urllib.request.Request(self.url + path, data=data, method=method,
+                                         headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get('error', e.reason)
+            except ValueError:
+                message = e.reason
+            raise ServiceError(e.code, message) from None
+
+    def health(self):
+        return self._request('GET', '/health')
+
+    def stats(self):
+        return self._request('GET', '/stats')
+
+    def search(self, query, **options):
+        """
+        Sama dengan `search_documents`: {'results', 'metrics', 'timings', 'stats'}.
+        """
+        return self._request('POST', '/search', {'query': query, **options})
+
+    def search_batch(self, queries, **options):
+        """
+        Sama dengan `search_documents_batch`: list {'query', 'results', 'metrics'}.
+        """
+        return self._request('POST', '/search/batch', {'queries': list(queries), **options})['outputs']
+
+    def fetch_documents(self, doc_ids, **options):
+        """
+        Sama dengan `fetch_documents`: list {'original_index', 'title', 'snippet'}.
+        """
+        return self._request('POST', '/documents', {'doc_ids': [int(i) for i in doc_ids], **options})['documents']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Layanan pencarian HTTP/JSON sistem IR")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--data-dir', default='uploads', help="Direktori dataset yang boleh dicari")
+    parser.add_argument('--warm', nargs='*', default=[], help="Dataset yang indeksnya dimuat saat mulai")
+    parser.add_argument('--column', default='content', help="Kolom teks default untuk pencarian")
+    parser.add_argument('--model', default='tfidf', help="Model default (bow, tfidf, bm25, hashing)")
+    parser.add_argument('--language', default='auto', choices=['id', 'en', 'auto'])
+    parser.add_argument('--no-spacy', action='store_true', help="Nonaktifkan preprocessing spaCy")
+    parser.add_argument('--no-stemming', action='store_true', help="Nonaktifkan stemming")
+    parser.add_argument('--tokenizer', default='nltk', choices=['nltk', 'fast'])
+    parser.add_argument('--shards', type=int, default=1, help="Jumlah shard indeks (lihat ShardedIndex)")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Jumlah thread worker")
+    parser.add_argument('--index-dir', default=None, help="Direktori indeks di disk ('' = nonaktif, default `IR_INDEX_DIR` atau index_store)")
+    args = parser.parse_args()
+
+    defaults = {
+        'search_column': args.column,
+        'model_type': args.model,
+        'language': args.language,
+        'use_spacy': not args.no_spacy,
+        'apply_stemming': not args.no_stemming,
+        'tokenizer': args.tokenizer,
+        'n_shards': args.shards
+    }
+    index_dir = default_index_dir() if args.index_dir is None else args.index_dir or None
+    service = SearchService(args.data_dir, defaults, index_dir=index_dir, workers=args.workers,
+                            default_dataset=args.warm[0] if args.warm else None)
+    try:
+        asyncio.run(service.serve(args.host, args.port, warm=args.warm))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
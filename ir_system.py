@@ -1,58 +1,523 @@
+import threading
+from contextlib import contextmanager
+
+import numpy as np
 import pandas as pd
-from ir_logic.preprocessing import preprocess_text
-from ir_logic.caching import cache
-from ir_logic.vectorization import vectorize_bow, vectorize_tfidf, search
+from ir_logic.preprocessing import preprocess_text, preprocess_corpus, stem_cache
+from ir_logic.caching import cache, query_cache
+from ir_logic.display import DisplayStore
+from ir_logic.indexing import BM25_B, BM25_K1, DEFAULT_N_SHARDS, ShardedIndex
+from ir_logic.vectorization import DEFAULT_MAX_DF, DEFAULT_MAX_FEATURES, DEFAULT_MIN_DF, DEFAULT_N_BUCKETS, MODEL_TYPES, build_scoring_index, compact_index, pruning_options, search, search_many, vectorize_bow
 from ir_logic.evaluation import calculate_metrics
+from ir_logic.instrumentation import emit_metrics, record_cache, record_stats, stage, trace_search
+from ir_logic.incremental import IncrementalIndex, file_state, file_version, read_appended_rows
+from ir_logic.ingestion import DEFAULT_CHUNK_SIZE, display_chunk, display_columns, ingest_dataset, read_columns, read_display_frame
+from ir_logic.storage import dataset_fingerprint, index_key, read_index, read_stem_table, write_index
+
+def load_dataset(filepath, columns=None):
+    """
+    Memuat dataset dari file CSV/JSON (lapisan cache pertama, dikunci oleh path file
+    dan versinya, sehingga file yang berubah dimuat ulang).
+
+    Jika `columns` diberikan, hanya kolom tersebut yang dibaca dan di-cache (lihat
+    `load_search_frame`); kolom lain dataset tidak disimpan di memori.
+    """
+    columns = list(columns) if columns is not None else None
+    dataset_key = ('dataset', filepath, file_version(filepath), None if columns is None else tuple(columns))
+    df = cache.get(dataset_key)
+    record_cache('dataset', df is not None)
+    if df is None:
+        with stage('file_read'):
+            if filepath.endswith('.csv'):
+                df = pd.read_csv(filepath, usecols=columns)
+            elif filepath.endswith('.json'):
+                df = pd.read_json(filepath, lines=True)
+                if columns is not None:
+                    df = df.reindex(columns=columns)
+            else:
+                raise ValueError("Unsupported file format")
+        cache.put(dataset_key, df)
+    return df
+
+def load_display_frame(filepath, search_column, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Memuat hanya kolom tampilan dataset (judul dan cuplikan teks) secara bertahap,
+    untuk mode streaming (lapisan cache pertama, dikunci oleh path file dan kolom).
+    """
+    display_key = ('display', filepath, file_version(filepath), search_column)
+    df = cache.get(display_key)
+    record_cache('display', df is not None)
+    if df is None:
+        with stage('file_read'):
+            df = read_display_frame(filepath, search_column, chunk_size=chunk_size)
+        cache.put(display_key, df)
+    return df
+
+def load_search_frame(filepath, search_column, streaming=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Memuat DataFrame yang dipakai untuk pencarian: hanya kolom judul (jika ada) dan
+    kolom pencarian. Dengan `streaming=True`, kolom pencarian berisi cuplikan saja
+    (lihat `load_display_frame`).
+    """
+    if streaming:
+        return load_display_frame(filepath, search_column, chunk_size)
+    return load_dataset(filepath, display_columns(filepath, search_column))
+
+def load_display_store(filepath, search_column, streaming=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Memuat judul dan cuplikan teks semua dokumen sebagai `DisplayStore` (dikunci oleh
+    path file, versinya, dan kolom), sehingga hasil pencarian tidak perlu membaca
+    baris DataFrame satu per satu.
+    """
+    store_key = ('display_store', filepath, file_version(filepath), search_column)
+    store = cache.get(store_key)
+    record_cache('display_store', store is not None)
+    if store is None:
+        df = load_search_frame(filepath, search_column, streaming, chunk_size)
+        with stage('display_build'):
+            store = DisplayStore.from_frame(df, search_column)
+        cache.put(store_key, store)
+    return store
+
+def fetch_documents(filepath, search_column, doc_ids, streaming=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Mengambil kolom tampilan (judul dan cuplikan) untuk dokumen tertentu, misalnya
+    untuk hasil `search_documents(..., ids_only=True)` yang ditampilkan belakangan.
+
+    Mengembalikan:
+    --------
+    list of dict
+        {'original_index', 'title', 'snippet'} sesuai urutan `doc_ids`.
+    """
+    store = load_display_store(filepath, search_column, streaming=streaming, chunk_size=chunk_size)
+    titles, snippets = store.take(doc_ids)
+    return [
+        {'original_index': int(i), 'title': title, 'snippet': snippet}
+        for i, title, snippet in zip(doc_ids, titles, snippets)
+    ]
+
+def load_corpus(filepath, search_column, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False, with_counts=True, n_jobs=None, tokenizer='nltk', streaming=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Memuat korpus hasil preprocessing (lapisan cache kedua).
+
+    Lapisan ini hanya dikunci oleh dataset, kolom, dan opsi preprocessing, sehingga
+    dipakai bersama oleh semua model. Matriks BoW juga disimpan di sini agar model
+    TF-IDF dapat diturunkan darinya tanpa tokenisasi ulang. Preprocessing dijalankan
+    secara paralel dengan `n_jobs` proses (lihat `preprocess_corpus`).
+
+    `tokenizer='fast'` memakai tokenizer cepat untuk preprocessing dan vectorizer.
+    Hasilnya sama dengan mode 'nltk', sehingga tidak menjadi bagian kunci cache.
+
+    Dengan `streaming=True`, dataset dibaca per `chunk_size` baris dan matriks BoW
+    dibangun bertahap (lihat `ingest_dataset`). Teks lengkap dan teks hasil
+    preprocessing tidak disimpan ('processed_text' bernilai None); hanya kolom
+    tampilan yang di-cache (lihat `load_display_frame`).
+
+    Mengembalikan:
+    --------
+    dict
+        {'processed_text': list of str, 'counts': (CountVectorizer, matriks BoW) atau None}
+    """
+    version = file_version(filepath)
+    corpus_key = ('corpus', filepath, version, search_column, language, use_spacy, apply_stemming, apply_lemmatization)
+    corpus = cache.get(corpus_key)
+    record_cache('corpus', corpus is not None)
+    if corpus is None and streaming:
+        with stage('ingestion'):
+            df, counts = ingest_dataset(filepath, search_column, chunk_size=chunk_size, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, n_jobs=n_jobs, tokenizer=tokenizer)
+        cache.put(('display', filepath, version, search_column), df)
+        corpus = {'processed_text': None, 'counts': counts}
+        cache.put(corpus_key, corpus)
+    elif corpus is None:
+        df = load_search_frame(filepath, search_column)
+        with stage('preprocessing'):
+            processed_text = preprocess_corpus(df[search_column], language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, n_jobs=n_jobs, tokenizer=tokenizer)
+        corpus = {'processed_text': processed_text, 'counts': None}
+        cache.put(corpus_key, corpus)
+
+    if with_counts and corpus['counts'] is None:
+        with stage('vectorization'):
+            corpus['counts'] = vectorize_bow(corpus['processed_text'], fast_tokenizer=tokenizer == 'fast')
+        # Simpan ulang agar ukuran entri dihitung kembali
+        cache.put(corpus_key, corpus)
+    return corpus
+
+def _model_key(model_type, k1, b, n_buckets):
+    # Parameter BM25 hanya memengaruhi indeks BM25, jumlah bucket hanya indeks hashing
+    if model_type == 'bm25':
+        return (model_type, k1, b)
+    if model_type == 'hashing':
+        return (model_type, n_buckets)
+    return model_type
+
+# Kunci per indeks agar indeks yang sama tidak dibangun bersamaan oleh beberapa thread
+_index_locks = {}
+_index_locks_guard = threading.Lock()
+
+@contextmanager
+def _index_lock(key):
+    with _index_locks_guard:
+        lock, users = _index_locks.get(key, (None, 0))
+        lock = lock or threading.Lock()
+        _index_locks[key] = (lock, users + 1)
+    try:
+        with lock:
+            yield
+    finally:
+        with _index_locks_guard:
+            users = _index_locks[key][1] - 1
+            if users:
+                _index_locks[key] = (lock, users)
+            else:
+                del _index_locks[key]
+
+def load_index(filepath, search_column, model_type, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False, index_dir=None, n_jobs=None, tokenizer='nltk', streaming=False, chunk_size=DEFAULT_CHUNK_SIZE, k1=BM25_K1, b=BM25_B, min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES, n_buckets=DEFAULT_N_BUCKETS, n_shards=DEFAULT_N_SHARDS):
+    """
+    Memuat dataset dan indeks siap-skor dari cache, dari disk, atau membangunnya jika belum ada.
+
+    Cache terdiri dari tiga lapisan: dataset (per file), korpus hasil preprocessing
+    (per kolom dan opsi preprocessing), dan indeks per model. Berganti model pada
+    dataset dan opsi yang sama hanya membangun ulang lapisan indeks.
+
+    Jika `index_dir` diberikan, indeks disimpan di disk dengan kunci berupa hash isi
+    dataset dan opsi preprocessing, sehingga proses baru dapat membuka indeks yang
+    sudah ada tanpa preprocessing dan vektorisasi ulang. Default adalah None (tanpa
+    penyimpanan di disk; lihat `default_index_dir` untuk direktori aplikasi).
+
+    Dengan `streaming=True`, dataset dibaca bertahap (lihat `load_corpus`) dan
+    DataFrame yang dikembalikan hanya berisi kolom tampilan.
+
+    Model 'bm25' memakai parameter `k1` dan `b` (lihat `BM25Index`); model lain
+    mengabaikannya.
+
+    `min_df`, `max_df`, dan `max_features` memangkas kosakata indeks (lihat
+    `prune_vocabulary`). Korpus dan matriks BoW di cache tidak dipangkas, sehingga
+    berganti pengaturan hanya membangun ulang lapisan indeks. Ukuran indeks di cache
+    dicatat sebagai statistik 'index_bytes'.
+
+    Model 'hashing' (lihat `HashingIndex`) memakai `n_buckets` bucket dan tidak
+    memerlukan matriks BoW: dokumen di-hash langsung dari teks hasil preprocessing,
+    atau dari matriks BoW jika sudah ada di cache. Indeks hashing tidak disimpan ke
+    disk (`index_dir` diabaikan) dan tidak mendukung pemangkasan kosakata.
+
+    Dengan `n_shards` > 1, indeks dibagi menjadi shard dokumen yang dinilai paralel
+    (lihat `ShardedIndex`); hanya indeks ber-shard yang disimpan di cache. Shard
+    dibentuk di memori, sehingga indeks dari disk tidak lagi memory-map.
+
+    Pemanggilan bersamaan untuk indeks yang sama membangun indeks hanya satu kali:
+    thread lain menunggu lalu memakai indeks dari cache.
+
+    Mengembalikan:
+    --------
+    tuple
+        (DataFrame dataset, ScoringIndex, ShardedIndex, atau HashingIndex)
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError("Invalid model type specified")
+    if model_type == 'hashing' and n_shards > 1:
+        raise ValueError("Sharding tidak didukung untuk model 'hashing'.")
+    if model_type == 'hashing':
+        # Membangun indeks hashing sebanding dengan membaca indeks dari disk
+        index_dir = None
+
+    pruning = pruning_options(min_df, max_df, max_features)
+    index_cache_key = ('index', filepath, file_version(filepath), search_column, language, use_spacy, apply_stemming, apply_lemmatization, _model_key(model_type, k1, b, n_buckets), tuple(pruning.values()), n_shards)
+    index = cache.get(index_cache_key)
+    record_cache('index', index is not None)
+    if index is not None:
+        record_stats(index_bytes=cache.size_of(index_cache_key))
+        return load_search_frame(filepath, search_column, streaming, chunk_size), index
+
+    # Hanya satu thread yang membangun indeks untuk kunci yang sama; thread lain menunggu
+    # lalu memakai hasilnya dari cache
+    with _index_lock(index_cache_key):
+        index = cache.get(index_cache_key)
+        if index is not None:
+            record_stats(index_bytes=cache.size_of(index_cache_key))
+            return load_search_frame(filepath, search_column, streaming, chunk_size), index
 
-def search_documents(filepath, query, search_column, model_type, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False):
-    # Buat kunci cache unik untuk dataset, kolom, model, dan opsi preprocessing
-    cache_key = f"{filepath}_{search_column}_{model_type}_{language}_{use_spacy}_{apply_stemming}_{apply_lemmatization}"
+        if not streaming:
+            df = load_search_frame(filepath, search_column)
 
-    # Muat dan proses dataset jika tidak ada di cache
-    if 'df' not in cache.get(cache_key, {}):
-        if filepath.endswith('.csv'):
-            df = pd.read_csv(filepath)
-        elif filepath.endswith('.json'):
-            df = pd.read_json(filepath, lines=True)
+        # Coba buka indeks yang sudah tersimpan di disk
+        stored = None
+        if index_dir is not None:
+            options = {
+                'search_column': search_column,
+                'model_type': model_type,
+                'language': language,
+                'use_spacy': use_spacy,
+                'apply_stemming': apply_stemming,
+                'apply_lemmatization': apply_lemmatization
+            }
+            if model_type == 'bm25':
+                options.update(k1=k1, b=b)
+            options.update(pruning)
+            with stage('index_read'):
+                key = index_key(dataset_fingerprint(filepath), **options)
+                stored = read_index(index_dir, key)
+            record_cache('disk_index', stored is not None)
+
+        if stored is not None:
+            index, processed_text = stored
+            # Muat memo stemming yang tersimpan agar query dan pembaruan berikutnya tidak men-stem ulang
+            stem_table = read_stem_table(index_dir, key)
+            if stem_table:
+                stem_cache.preload(stem_table)
+            # Isi lapisan korpus agar model lain tidak perlu preprocessing ulang
+            # (indeks dari mode streaming tidak menyimpan teks hasil preprocessing)
+            corpus_key = ('corpus', filepath, index_cache_key[2], search_column, language, use_spacy, apply_stemming, apply_lemmatization)
+            if processed_text is not None and corpus_key not in cache:
+                cache.put(corpus_key, {'processed_text': processed_text, 'counts': None})
         else:
-            raise ValueError("Unsupported file format")
+            corpus = load_corpus(filepath, search_column, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, with_counts=model_type != 'hashing', n_jobs=n_jobs, tokenizer=tokenizer, streaming=streaming, chunk_size=chunk_size)
+
+            # Vektorisasi dokumen menjadi indeks siap-skor (TF-IDF diturunkan dari matriks BoW)
+            with stage('index_build'):
+                index = build_scoring_index(corpus['processed_text'], model_type, counts=corpus['counts'], fast_tokenizer=tokenizer == 'fast', k1=k1, b=b, n_buckets=n_buckets, n_jobs=n_jobs, **pruning)
+            if index_dir is not None:
+                with stage('index_write'):
+                    # Simpan hanya memo stemming untuk kosakata indeks ini, bukan seluruh memo proses
+                    write_index(index_dir, key, index, corpus['processed_text'], options, stem_table=stem_cache.snapshot(index.vectorizer.vocabulary_) if apply_stemming else None)
+
+        if streaming:
+            df = load_display_frame(filepath, search_column, chunk_size)
+
+        # Simpan indeks dalam bentuk ringkas (float32, tanpa matriks dokumen, kosakata terurut).
+        # Bobot indeks yang dibuka dari disk tetap memory-map. Indeks hashing sudah ringkas.
+        if model_type != 'hashing':
+            index = compact_index(index, dtype=None if stored is not None else np.float32)
+        if n_shards > 1:
+            with stage('sharding'):
+                index = ShardedIndex(index, n_shards)
+        cache.put(index_cache_key, index)
+        record_stats(index_bytes=cache.size_of(index_cache_key))
+        return df, index
 
-        if search_column not in df.columns:
-            raise ValueError(f"Column '{search_column}' not found in the dataset.")
+# Pembaruan indeks live dijalankan berurutan agar baris baru tidak dibaca dua kali
+_live_lock = threading.Lock()
 
-        df['processed_text'] = df[search_column].apply(lambda x: preprocess_text(x, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization))
+def _live_key(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, streaming, k1, b, n_buckets):
+    return ('live', filepath, search_column, language, use_spacy, apply_stemming, apply_lemmatization, _model_key(model_type, k1, b, n_buckets), streaming)
 
-        # Inisialisasi cache untuk kunci ini
-        cache[cache_key] = {'df': df}
-    else:
-        df = cache[cache_key]['df']
+def load_live_index(filepath, search_column, model_type, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False, n_jobs=None, tokenizer='nltk', streaming=False, chunk_size=DEFAULT_CHUNK_SIZE, k1=BM25_K1, b=BM25_B, n_buckets=DEFAULT_N_BUCKETS):
+    """
+    Memuat indeks live (`IncrementalIndex`) untuk dataset yang terus bertambah.
 
-    # Vektorisasi dokumen atau muat dari cache
-    if 'vectorizer' not in cache[cache_key] or 'doc_matrix' not in cache[cache_key]:
-        if model_type == 'bow':
-            vectorizer, doc_matrix = vectorize_bow(df['processed_text'])
-        elif model_type == 'tfidf':
-            vectorizer, doc_matrix = vectorize_tfidf(df['processed_text'])
+    Berbeda dengan `load_index`, kunci cache indeks live tidak memuat versi file:
+    indeks yang sama diperbarui oleh `update_index` ketika baris baru ditambahkan
+    ke file. Indeks live tidak disimpan ke disk. Model 'hashing' memakai `HashingIndex`,
+    yang menambahkan dokumen baru tanpa memperluas kosakata.
+
+    Mengembalikan:
+    --------
+    dict
+        {'df': DataFrame, 'index': IncrementalIndex atau HashingIndex, 'columns': kolom file, 'state': posisi baca (lihat `file_state`)}
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError("Invalid model type specified")
+
+    live_key = _live_key(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, streaming, k1, b, n_buckets)
+    live = cache.get(live_key)
+    record_cache('live', live is not None)
+    if live is None:
+        # Ulangi jika file berubah selama pemuatan, agar posisi baca sesuai dengan isi indeks
+        while True:
+            version = file_version(filepath)
+            corpus = load_corpus(filepath, search_column, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, with_counts=model_type != 'hashing', n_jobs=n_jobs, tokenizer=tokenizer, streaming=streaming, chunk_size=chunk_size)
+            df = load_search_frame(filepath, search_column, streaming, chunk_size)
+            if file_version(filepath) == version:
+                break
+        if model_type == 'hashing':
+            index = build_scoring_index(corpus['processed_text'], model_type, counts=corpus['counts'], fast_tokenizer=tokenizer == 'fast', n_buckets=n_buckets, n_jobs=n_jobs)
         else:
-            raise ValueError("Invalid model type specified")
-        cache[cache_key]['vectorizer'] = vectorizer
-        cache[cache_key]['doc_matrix'] = doc_matrix
-    else:
-        vectorizer = cache[cache_key]['vectorizer']
-        doc_matrix = cache[cache_key]['doc_matrix']
+            index = IncrementalIndex(*corpus['counts'], model_type, k1=k1, b=b)
+        live = {
+            'df': df,
+            'index': index,
+            'columns': read_columns(filepath),
+            'state': file_state(filepath, len(df), offset=version[0])
+        }
+        cache.put(live_key, live)
+    return live
+
+def update_index(filepath, search_column, model_type, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False, n_jobs=None, tokenizer='nltk', streaming=False, chunk_size=DEFAULT_CHUNK_SIZE, k1=BM25_K1, b=BM25_B, n_buckets=DEFAULT_N_BUCKETS):
+    """
+    Menambahkan baris yang baru ditambahkan ke file dataset ke indeks live.
+
+    Hanya baris setelah posisi baca terakhir yang dibaca, diproses, dan di-vektorisasi
+    (lihat `read_appended_rows` dan `IncrementalIndex.append`/`HashingIndex.append`). Jika file tidak hanya
+    bertambah (misalnya ditulis ulang), indeks live dibangun ulang dari awal.
+
+    Mengembalikan:
+    --------
+    dict
+        {'appended_rows': int, 'rebuilt': bool, 'version': versi indeks}
+    """
+    options = dict(language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, n_jobs=n_jobs, tokenizer=tokenizer, streaming=streaming, chunk_size=chunk_size, k1=k1, b=b, n_buckets=n_buckets)
+    with _live_lock:
+        live = load_live_index(filepath, search_column, model_type, **options)
+        appended = read_appended_rows(filepath, live['state'], live['columns'])
+        if appended is None:
+            cache.pop(_live_key(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, streaming, k1, b, n_buckets))
+            live = load_live_index(filepath, search_column, model_type, **options)
+            return {'appended_rows': 0, 'rebuilt': True, 'version': live['index'].version}
+
+        # Posisi baca baru disimpan setelah indeks berhasil diperbarui, agar baris yang
+        # gagal diproses dibaca ulang pada pembaruan berikutnya
+        new_rows, state = appended
+        record_stats(appended_rows=len(new_rows))
+        if len(new_rows):
+            with stage('live_update'):
+                processed_text = preprocess_corpus(new_rows[search_column], language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, n_jobs=n_jobs, tokenizer=tokenizer)
+                new_rows = new_rows[display_columns(filepath, search_column)]
+                if streaming:
+                    new_rows = display_chunk(new_rows, search_column)
+                # DataFrame diperbarui sebelum indeks, sehingga query yang berjalan bersamaan
+                # tidak pernah mendapat dokumen yang belum memiliki baris tampilan; jika
+                # penambahan ke indeks gagal, DataFrame dikembalikan
+                df = live['df']
+                live['df'] = pd.concat([df, new_rows], ignore_index=True)
+                try:
+                    live['index'].append(processed_text)
+                except Exception:
+                    live['df'] = df
+                    raise
+        live['state'] = state
+        if len(new_rows):
+            # Simpan ulang agar ukuran entri dihitung kembali
+            cache.put(_live_key(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, streaming, k1, b, n_buckets), live)
+        return {'appended_rows': len(new_rows), 'rebuilt': False, 'version': live['index'].version}
+
+def _load_search_index(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, index_dir, tokenizer, streaming, live, k1, b, min_df, max_df, max_features, n_buckets, n_shards, n_jobs):
+    # Mode live: tambahkan baris baru dari file terlebih dahulu, lalu cari di indeks live.
+    # Indeks live yang terus bertambah memakai DataFrame-nya sendiri (kolom tetap diambil
+    # sekaligus, lihat `display_fields`)
+    if live:
+        if pruning_options(min_df, max_df, max_features):
+            raise ValueError("Pemangkasan kosakata (min_df, max_df, max_features) tidak didukung untuk indeks live.")
+        if n_shards > 1:
+            raise ValueError("Sharding tidak didukung untuk indeks live.")
+        update_index(filepath, search_column, model_type, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, n_jobs=n_jobs, tokenizer=tokenizer, streaming=streaming, k1=k1, b=b, n_buckets=n_buckets)
+        live_index = load_live_index(filepath, search_column, model_type, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, n_jobs=n_jobs, tokenizer=tokenizer, streaming=streaming, k1=k1, b=b, n_buckets=n_buckets)
+        return live_index['df'], live_index['index']
+    # Hasil dibentuk dari `DisplayStore` yang di-cache
+    _, index = load_index(filepath, search_column, model_type, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, index_dir=index_dir, n_jobs=n_jobs, tokenizer=tokenizer, streaming=streaming, k1=k1, b=b, min_df=min_df, max_df=max_df, max_features=max_features, n_buckets=n_buckets, n_shards=n_shards)
+    return load_display_store(filepath, search_column, streaming=streaming), index
+
+def search_documents(filepath, query, search_column, model_type, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False, top_k=10, min_score=0.01, index_dir=None, tokenizer='nltk', streaming=False, live=False, k1=BM25_K1, b=BM25_B, metrics_sink=None, ids_only=False, min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES, n_buckets=DEFAULT_N_BUCKETS, n_shards=DEFAULT_N_SHARDS, n_jobs=None):
+    """
+    Mencari dokumen yang relevan dengan satu query.
+
+    Hasil juga berisi instrumentasi per tahap. 'timings' berisi waktu (detik) setiap
+    tahap yang dijalankan, misalnya 'file_read', 'preprocessing', 'vectorization',
+    'index_build', 'query_preprocessing', 'query_transform', 'scoring', 'top_k',
+    'formatting', 'metrics', dan 'total'; tahap yang dilewati karena cache tidak
+    muncul. 'stats' berisi status hit/miss per lapisan cache, dimensi dan nnz matriks
+    indeks dan query, jumlah kandidat, serta perubahan RSS per tahap.
+
+    Jika `metrics_sink` diberikan (atau sink global diatur dengan `set_metrics_sink`),
+    satu record {'query', 'model_type', 'filepath', 'timings', 'stats'} dikirim ke
+    sink tersebut untuk setiap pencarian.
+
+    Dengan `ids_only=True`, setiap hasil hanya berisi 'original_index' dan 'score';
+    judul dan cuplikan dapat diambil belakangan dengan `fetch_documents`.
 
-    # Pra-pemrosesan dan vektorisasi kueri
-    processed_query = preprocess_text(query, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization)
-    query_vector = vectorizer.transform([processed_query])
+    `min_df`, `max_df`, dan `max_features` memangkas kosakata indeks (lihat
+    `load_index`); ukuran kosakata, nnz, dan memori indeks dilaporkan di 'stats'
+    sebagai 'n_terms', 'nnz', dan 'index_bytes'. Pemangkasan tidak tersedia untuk
+    `live=True`.
 
-    # Lakukan pencarian
-    results = search(processed_query, vectorizer, doc_matrix, df, search_column)
+    `model_type='hashing'` memakai TF-IDF berbasis feature hashing dengan `n_buckets`
+    bucket (lihat `HashingIndex`), tanpa fit kosakata; 'n_terms' berisi jumlah bucket.
 
-    # Hitung metrik evaluasi menggunakan pendekatan heuristik (tidak ada ground truth yang tersedia)
-    # Berikan None sebagai ground_truth_indices untuk menggunakan evaluasi heuristik
-    metrics = calculate_metrics(results, ground_truth_indices=None)
+    `n_shards` > 1 membagi indeks menjadi shard dokumen yang dinilai paralel oleh
+    thread pool, lalu top-k per shard digabung (lihat `ShardedIndex`). Tidak tersedia
+    untuk `live=True` dan model 'hashing'.
+
+    `n_jobs` adalah jumlah proses untuk preprocessing korpus saat indeks dibangun atau
+    diperbarui (lihat `preprocess_corpus`). Default adalah `DEFAULT_N_JOBS`; tidak
+    memengaruhi hasil maupun kunci cache.
+
+    Mengembalikan:
+    --------
+    dict
+        {'results', 'metrics', 'timings', 'stats'}
+    """
+    with trace_search() as trace:
+        df, index = _load_search_index(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, index_dir, tokenizer, streaming, live, k1, b, min_df, max_df, max_features, n_buckets, n_shards, n_jobs)
+        record_stats(n_docs=int(index.n_docs), n_terms=int(index.n_terms), nnz=int(index.nnz))
+
+        # Pra-pemrosesan kueri
+        with stage('query_preprocessing'):
+            processed_query = preprocess_text(query, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, tokenizer=tokenizer)
+
+        # Lakukan pencarian; hasil untuk query yang sama pada indeks yang sama diambil dari cache
+        cache_key = query_cache.key(index, processed_query, (search_column, top_k, min_score, ids_only))
+        cached = query_cache.get(cache_key, index)
+        record_cache('query', cached is not None)
+        if cached is not None:
+            results, metrics = cached
+        else:
+            results = search(processed_query, index, df, search_column, top_k=top_k, min_score=min_score, ids_only=ids_only)
+
+            # Hitung metrik evaluasi menggunakan pendekatan heuristik (tidak ada ground truth yang tersedia)
+            # Berikan None sebagai ground_truth_indices untuk menggunakan evaluasi heuristik
+            with stage('metrics'):
+                metrics = calculate_metrics(results, ground_truth_indices=None)
+            query_cache.put(cache_key, index, results, metrics)
+
+    instrumentation = trace.as_dict()
+    emit_metrics({'query': query, 'model_type': model_type, 'filepath': filepath, **instrumentation}, sink=metrics_sink)
 
     return {
         'results': results,
-        'metrics': metrics
-    }
\ No newline at end of file
+        'metrics': metrics,
+        **instrumentation
+    }
+
+def search_documents_batch(filepath, queries, search_column, model_type, language='auto', use_spacy=True, apply_stemming=True, apply_lemmatization=False, top_k=10, min_score=0.01, index_dir=None, tokenizer='nltk', streaming=False, live=False, k1=BM25_K1, b=BM25_B, ids_only=False, min_df=DEFAULT_MIN_DF, max_df=DEFAULT_MAX_DF, max_features=DEFAULT_MAX_FEATURES, n_buckets=DEFAULT_N_BUCKETS, n_shards=DEFAULT_N_SHARDS, n_jobs=None):
+    """
+    Menjalankan banyak query sekaligus terhadap satu dataset.
+
+    Semua query diproses bersama, diubah menjadi satu matriks query sparse, lalu
+    dinilai dengan satu perkalian matriks. Indeks yang di-cache sama dengan yang
+    digunakan oleh `search_documents`; query yang hasilnya sudah ada di cache hasil
+    query (`query_cache`) tidak dinilai ulang.
+
+    Dengan `live=True`, baris yang baru ditambahkan ke file dimasukkan ke indeks live
+    sebelum pencarian (lihat `update_index`); `index_dir` tidak digunakan.
+    `ids_only`, `min_df`, `max_df`, `max_features`, `n_buckets`, `n_shards`, dan `n_jobs`
+    berlaku seperti pada `search_documents`.
+
+    Mengembalikan:
+    --------
+    list of dict
+        Untuk setiap query (sesuai urutan input): {'query', 'results', 'metrics'}.
+    """
+    df, index = _load_search_index(filepath, search_column, model_type, language, use_spacy, apply_stemming, apply_lemmatization, index_dir, tokenizer, streaming, live, k1, b, min_df, max_df, max_features, n_buckets, n_shards, n_jobs)
+
+    # Pra-pemrosesan semua query
+    processed_queries = [
+        preprocess_text(query, language=language, use_spacy=use_spacy, apply_stemming=apply_stemming, apply_lemmatization=apply_lemmatization, tokenizer=tokenizer)
+        for query in queries
+    ]
+
+    # Ambil hasil yang sudah ada di cache, lalu cari sisanya sekaligus
+    cache_keys = [query_cache.key(index, processed_query, (search_column, top_k, min_score, ids_only)) for processed_query in processed_queries]
+    outputs = [query_cache.get(cache_key, index) for cache_key in cache_keys]
+    missing = [i for i, output in enumerate(outputs) if output is None]
+    if missing:
+        missing_results = search_many([processed_queries[i] for i in missing], index, df, search_column, top_k=top_k, min_score=min_score, ids_only=ids_only)
+        for i, results in zip(missing, missing_results):
+            outputs[i] = (results, calculate_metrics(results, ground_truth_indices=None))
+            query_cache.put(cache_keys[i], index, *outputs[i])
+
+    return [
+        {
+            'query': query,
+            'results': results,
+            'metrics': metrics
+        }
+        for query, (results, metrics) in zip(queries, outputs)
+    ]
@@ -2,12 +2,16 @@ import streamlit as st
 import pandas as pd
 import os
 import glob
-from ir_system import search_documents
+from ir_system import fetch_documents, search_documents
+from ir_service import DEFAULT_HOST, DEFAULT_PORT, ServiceClient
+from ir_logic.indexing import BM25_B, BM25_K1
+from ir_logic.storage import default_index_dir
+from ir_logic.vectorization import DEFAULT_N_BUCKETS
 
 st.set_page_config(page_title="Information Retrieval", layout="wide")
 
 st.title("Sistem Temu Kembali Informasi")
-st.markdown("""Sebuah sistem untuk mencari informasi dari dokumen menggunakan model **Bag-of-Words** dan **TF-IDF**.""")
+st.markdown("""Sebuah sistem untuk mencari informasi dari dokumen menggunakan model **Bag-of-Words**, **TF-IDF**, **BM25**, dan **TF-IDF hashing**.""")
 
 # --- Konfigurasi Sidebar ---
 with st.sidebar:
@@ -26,6 +30,30 @@ with st.sidebar:
     if language == 'en':
         apply_lemmatization = st.toggle("Terapkan Lemmatization", value=False, help="Mengubah kata menjadi bentuk lemma (memerlukan model spaCy lengkap)")
     
+    # Opsi dataset besar
+    streaming = st.toggle("Mode Streaming (Dataset Besar)", value=False, help="Membaca dataset per potongan dan hanya menyimpan kolom judul dan cuplikan teks, sehingga memori tidak bergantung pada ukuran file")
+    live = st.toggle("Mode Live (Dataset Bertambah)", value=False, help="Menambahkan baris baru yang ditulis ke akhir file dataset ke indeks sebelum setiap pencarian, tanpa membangun ulang indeks")
+    n_shards = st.number_input("Jumlah Shard Indeks", min_value=1, max_value=64, value=1, step=1, disabled=live, help="Membagi indeks menjadi beberapa bagian dokumen yang dinilai paralel di beberapa core (tidak tersedia untuk indeks live dan model hashing)")
+
+    # Opsi pemangkasan kosakata (tidak tersedia untuk indeks live dan model hashing)
+    st.subheader("Pemangkasan Kosakata")
+    min_df = st.number_input("Frekuensi Dokumen Minimum (min_df)", min_value=1, value=1, step=1, disabled=live, help="Term yang muncul di kurang dari jumlah dokumen ini dibuang (misalnya salah ketik dan ID unik)")
+    max_df = st.slider("Proporsi Dokumen Maksimum (max_df)", min_value=0.05, max_value=1.0, value=1.0, step=0.05, disabled=live, help="Term yang muncul di lebih dari proporsi dokumen ini dibuang (kata yang terlalu umum)")
+    max_features = st.number_input("Jumlah Term Maksimum (0 = tanpa batas)", min_value=0, value=0, step=1000, disabled=live, help="Hanya term dengan frekuensi total tertinggi yang disimpan di indeks")
+
+    # Opsi hasil pencarian
+    st.subheader("Opsi Hasil Pencarian")
+    top_k = st.number_input("Jumlah Hasil Maksimum (k)", min_value=1, max_value=10000, value=10, step=1, help="Jumlah dokumen teratas yang dikembalikan")
+    min_score = st.slider("Skor Minimum", min_value=0.0, max_value=1.0, value=0.01, step=0.01, help="Dokumen dengan skor di bawah atau sama dengan nilai ini tidak ditampilkan")
+    ids_only = st.toggle("Hanya ID dan Skor", value=False, help="Pencarian hanya mengembalikan ID dokumen dan skor; judul dan cuplikan dimuat saat detail hasil dibuka")
+
+    # Opsi layanan pencarian: Streamlit hanya mengirim query ke ir_service yang indeksnya sudah hangat
+    st.subheader("Layanan Pencarian")
+    use_service = st.toggle("Gunakan Layanan Pencarian (ir_service)", value=False, help="Mengirim pencarian ke layanan HTTP yang berjalan terpisah (python ir_service.py --data-dir uploads); dataset harus berada di direktori data layanan")
+    service_url = None
+    if use_service:
+        service_url = st.text_input("Alamat Layanan", value=os.environ.get('IR_SERVICE_URL', f"http://{DEFAULT_HOST}:{DEFAULT_PORT}"))
+
     # Opsi untuk menyimpan hasil preprocessing
     st.subheader("Simpan Hasil Preprocessing")
     save_preprocessing = st.toggle("Simpan Hasil Preprocessing", value=False, help="Menyimpan hasil preprocessing ke file dengan kolom terpisah untuk setiap tahap")
@@ -73,7 +101,24 @@ if filepath:
         with search_col:
             search_column = st.selectbox("Pilih kolom teks untuk pencarian:", columns)
         with model_col:
-            model_type = st.selectbox("Pilih Model:", ['tfidf', 'bow'], format_func=lambda x: {'tfidf': 'TF-IDF', 'bow': 'Bag-of-Words'}.get(x))
+            model_type = st.selectbox("Pilih Model:", ['tfidf', 'bow', 'bm25', 'hashing'], format_func=lambda x: {'tfidf': 'TF-IDF', 'bow': 'Bag-of-Words', 'bm25': 'BM25', 'hashing': 'Hashing TF-IDF'}.get(x))
+
+        bm25_k1, bm25_b = BM25_K1, BM25_B
+        if model_type == 'bm25':
+            k1_col, b_col = st.columns(2)
+            with k1_col:
+                bm25_k1 = st.slider("BM25 k1", min_value=0.0, max_value=3.0, value=BM25_K1, step=0.1, help="Saturasi frekuensi term: semakin besar, semakin berpengaruh kemunculan berulang")
+            with b_col:
+                bm25_b = st.slider("BM25 b", min_value=0.0, max_value=1.0, value=BM25_B, step=0.05, help="Normalisasi panjang dokumen: 0 = tanpa normalisasi, 1 = normalisasi penuh")
+
+        n_buckets = DEFAULT_N_BUCKETS
+        pruning = {'min_df': int(min_df), 'max_df': float(max_df), 'max_features': int(max_features) or None}
+        index_shards = 1 if live else int(n_shards)
+        if model_type == 'hashing':
+            n_buckets = st.select_slider("Jumlah Bucket Hashing", options=[2 ** p for p in range(14, 23)], value=DEFAULT_N_BUCKETS, format_func=lambda x: f"2^{x.bit_length() - 1}", help="Lebih banyak bucket mengurangi tabrakan antar term, dengan memori frekuensi dokumen lebih besar")
+            # Model hashing tidak memiliki kosakata untuk dipangkas dan tidak dibagi menjadi shard
+            pruning = {}
+            index_shards = 1
 
         query = st.text_input("Masukkan query pencarian:", key="search_query")
 
@@ -163,41 +208,85 @@ if filepath:
         if st.button("Cari Dokumen", type="primary"):
             if query:
                 with st.spinner(f"Mencari '{query}' menggunakan {model_type.upper()}..."):
-                    search_output = search_documents(
-                        filepath=filepath,
-                        query=query,
+                    search_options = dict(
                         search_column=search_column,
                         model_type=model_type,
                         language=language,
                         use_spacy=use_spacy,
                         apply_stemming=apply_stemming if 'apply_stemming' in locals() else True,
-                        apply_lemmatization=apply_lemmatization if 'apply_lemmatization' in locals() else False
+                        apply_lemmatization=apply_lemmatization if 'apply_lemmatization' in locals() else False,
+                        top_k=int(top_k),
+                        min_score=min_score,
+                        streaming=streaming,
+                        live=live,
+                        k1=bm25_k1,
+                        b=bm25_b,
+                        ids_only=ids_only,
+                        n_buckets=n_buckets,
+                        n_shards=index_shards,
+                        **pruning
                     )
-                
-                results = search_output['results']
-                metrics = search_output['metrics']
-
-                st.header("3. Hasil Pencarian")
-                st.success(f"Ditemukan {len(results)} hasil yang relevan.")
-
-                # --- Tampilan Metrik ---
-                st.subheader("Metrik Evaluasi (Heuristik)")
-                col1, col2, col3 = st.columns(3)
-                col1.metric("Presisi", f"{metrics.get('precision', 0):.2f}", help="Dari dokumen yang diambil, berapa persen yang relevan?")
-                col2.metric("Recall", f"{metrics.get('recall', 0):.2f}", help="Dari semua dokumen relevan, berapa persen yang berhasil diambil? (Placeholder)")
-                col3.metric("F1-Score", f"{metrics.get('f1_score', 0):.2f}", help="Keseimbangan antara Presisi dan Recall. (Placeholder)")
-                st.caption("Catatan: Recall dan F1-Score adalah placeholder karena tidak ada ground truth.")
-
-                # --- Tampilan Hasil ---
-                st.subheader("Dokumen Ditemukan")
-                for result in results:
-                    with st.container(border=True):
-                        st.markdown(f"**Skor Relevansi:** `{result['score']:.4f}`")
+                    if service_url:
+                        search_output = ServiceClient(service_url).search(query, dataset=os.path.basename(filepath), **search_options)
+                    else:
+                        search_output = search_documents(filepath=filepath, query=query, index_dir=default_index_dir(), **search_options)
+                # Simpan hasil agar tetap tampil ketika detail hasil dibuka (rerun Streamlit)
+                st.session_state['search_output'] = {'filepath': filepath, 'search_column': search_column, 'ids_only': ids_only, 'service_url': service_url, **search_output}
+            else:
+                st.session_state.pop('search_output', None)
+                st.warning("Mohon masukkan query untuk memulai pencarian.")
+
+        search_output = st.session_state.get('search_output')
+        if search_output and search_output['filepath'] == filepath and search_output['search_column'] == search_column:
+            results = search_output['results']
+            metrics = search_output['metrics']
+
+            st.header("3. Hasil Pencarian")
+            st.success(f"Ditemukan {len(results)} hasil yang relevan.")
+
+            # --- Tampilan Metrik ---
+            st.subheader("Metrik Evaluasi (Heuristik)")
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Presisi", f"{metrics.get('precision', 0):.2f}", help="Dari dokumen yang diambil, berapa persen yang relevan?")
+            col2.metric("Recall", f"{metrics.get('recall', 0):.2f}", help="Dari semua dokumen relevan, berapa persen yang berhasil diambil? (Placeholder)")
+            col3.metric("F1-Score", f"{metrics.get('f1_score', 0):.2f}", help="Keseimbangan antara Presisi dan Recall. (Placeholder)")
+            st.caption("Catatan: Recall dan F1-Score adalah placeholder karena tidak ada ground truth.")
+
+            # --- Detail Performa per Tahap ---
+            with st.expander("Detail Performa"):
+                timings = search_output.get('timings', {})
+                stats = search_output.get('stats', {})
+                memory = stats.get('memory', {})
+                size_col1, size_col2, size_col3 = st.columns(3)
+                size_col1.metric("Ukuran Kosakata", f"{stats.get('n_terms', 0):,}")
+                size_col2.metric("Elemen Non-nol (nnz)", f"{stats.get('nnz', 0):,}")
+                if stats.get('index_bytes') is not None:
+                    size_col3.metric("Memori Indeks", f"{stats['index_bytes'] / 2 ** 20:.1f} MiB")
+                st.dataframe(pd.DataFrame({
+                    'Tahap': list(timings),
+                    'Waktu (ms)': [round(seconds * 1000, 3) for seconds in timings.values()],
+                    'Perubahan RSS (KiB)': [round(memory[name] / 1024, 1) if name in memory else None for name in timings]
+                }), hide_index=True)
+                st.json({key: value for key, value in stats.items() if key != 'memory'})
+
+            # --- Tampilan Hasil ---
+            st.subheader("Dokumen Ditemukan")
+            for result in results:
+                with st.container(border=True):
+                    st.markdown(f"**Skor Relevansi:** `{result['score']:.4f}`")
+                    if search_output['ids_only']:
+                        # Judul dan cuplikan hanya dimuat untuk hasil yang detailnya dibuka
+                        st.markdown(f"**ID Dokumen:** `{result['original_index']}`")
+                        if st.toggle("Tampilkan detail", key=f"detail_{result['original_index']}"):
+                            if search_output['service_url']:
+                                document = ServiceClient(search_output['service_url']).fetch_documents([result['original_index']], dataset=os.path.basename(filepath), search_column=search_column, streaming=streaming)[0]
+                            else:
+                                document = fetch_documents(filepath, search_column, [result['original_index']], streaming=streaming)[0]
+                            st.json({k: v for k, v in document.items() if k != 'original_index'})
+                    else:
                         # Menampilkan semua kolom dari hasil, kecuali yang tidak perlu
                         display_data = {k: v for k, v in result.items() if k not in ['score', 'original_index', 'processed_text']}
                         st.json(display_data)
-            else:
-                st.warning("Mohon masukkan query untuk memulai pencarian.")
 
         # --- Tab untuk melihat detail dataset ---
         with st.expander("Lihat Detail Dataset"):
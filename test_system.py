@@ -3,9 +3,10 @@
 Script pengujian untuk memverifikasi bahwa semua komponen sistem IR bekerja dengan benar.
 """
 
+import numpy as np
 import pandas as pd
 import os
-from ir_system import search_documents
+from ir_system import search_documents, search_documents_batch
 
 def test_ir_system():
     """
@@ -46,7 +47,8 @@ def test_ir_system():
             search_column='content',
             model_type='tfidf',
             language='en',
-            use_spacy=False
+            use_spacy=False,
+            index_dir=None
         )
         
         print(f"✓ TF-IDF: Ditemukan {len(result_tfidf['results'])} hasil")
@@ -69,7 +71,8 @@ def test_ir_system():
             search_column='content',
             model_type='bow',
             language='en',
-            use_spacy=False
+            use_spacy=False,
+            index_dir=None
         )
         
         print(f"✓ BoW: Ditemukan {len(result_bow['results'])} hasil")
@@ -83,7 +86,8 @@ def test_ir_system():
             search_column='content',
             model_type='tfidf',
             language='id',
-            use_spacy=True
+            use_spacy=True,
+            index_dir=None
         )
         
         print(f"✓ Bahasa ID: Ditemukan {len(result_id['results'])} hasil")
@@ -97,7 +101,8 @@ def test_ir_system():
             search_column='content',
             model_type='tfidf',
             language='en',
-            use_spacy=False
+            use_spacy=False,
+            index_dir=None
         )
         
         print(f"✓ Query tidak relevan: Ditemukan {len(result_empty['results'])} hasil")
@@ -120,6 +125,902 @@ def test_ir_system():
     
     return True
 
+def test_scoring_index_matches_cosine_similarity():
+    """
+    Memastikan skor dari indeks siap-skor sama dengan cosine similarity brute-force.
+    """
+    from sklearn.metrics.pairwise import cosine_similarity
+    from ir_logic.indexing import ScoringIndex
+    from ir_logic.vectorization import vectorize_bow, vectorize_tfidf
+
+    documents = [
+        'machine learning data',
+        'deep learning neural network',
+        'python programming data science',
+        'bisnis data analisis prediksi',
+        ''
+    ]
+    for vectorize in (vectorize_bow, vectorize_tfidf):
+        vectorizer, doc_matrix = vectorize(documents)
+        index = ScoringIndex(vectorizer, doc_matrix)
+        for query in ['data learning', 'python', 'tidak ada']:
+            query_vector = index.transform(query)
+            expected = cosine_similarity(query_vector, doc_matrix).flatten()
+            doc_indices, scores = index.score(query_vector)
+            actual = np.zeros(len(documents))
+            actual[doc_indices] = scores
+            assert np.allclose(actual, expected)
+
+
+def test_bm25_index_matches_formula(tmp_path):
+    """
+    Memastikan skor BM25 sama dengan rumus BM25 yang dihitung langsung per dokumen,
+    termasuk setelah indeks disimpan ke disk dan dimuat kembali.
+    """
+    import math
+    from collections import Counter
+    from ir_logic.indexing import BM25Index
+    from ir_logic.storage import read_index, write_index
+    from ir_logic.vectorization import build_scoring_index
+
+    documents = [
+        'machine learning data data',
+        'deep learning neural network learning',
+        'python programming data science',
+        'bisnis data analisis prediksi data data data',
+        ''
+    ]
+    k1, b = 1.5, 0.6
+    tokenized = [document.split() for document in documents]
+    avgdl = sum(len(tokens) for tokens in tokenized) / len(documents)
+    doc_freq = Counter(term for tokens in tokenized for term in set(tokens))
+
+    def bm25(query, tokens):
+        counts = Counter(tokens)
+        score = 0.0
+        for term in query.split():
+            if term in counts:
+                idf = math.log(1 + (len(documents) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+                tf = counts[term]
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / avgdl))
+        return score
+
+    index = build_scoring_index(documents, 'bm25', k1=k1, b=b)
+    write_index(str(tmp_path), 'bm25', index, documents)
+    stored, _ = read_index(str(tmp_path), 'bm25')
+    assert isinstance(stored, BM25Index)
+
+    queries = ['data learning', 'python data data', 'tidak ada']
+    for candidate in (index, stored):
+        score_matrix = candidate.score_many(candidate.transform_many(queries)).toarray()
+        for row, query in enumerate(queries):
+            expected = np.array([bm25(query, tokens) for tokens in tokenized])
+            doc_indices, scores = candidate.score(candidate.transform(query))
+            actual = np.zeros(len(documents))
+            actual[doc_indices] = scores
+            assert np.allclose(actual, expected) and np.allclose(score_matrix[row], expected)
+
+
+def test_tfidf_from_counts_matches_tfidf_vectorizer():
+    """
+    Memastikan TF-IDF yang diturunkan dari matriks BoW sama dengan TfidfVectorizer langsung.
+    """
+    from ir_logic.vectorization import vectorize_bow, vectorize_tfidf, vectorize_tfidf_from_counts
+
+    documents = ['machine learning data', 'deep learning neural network', 'data data bisnis', '']
+    expected_vectorizer, expected = vectorize_tfidf(documents)
+    vectorizer, actual = vectorize_tfidf_from_counts(*vectorize_bow(documents))
+
+    assert np.allclose(actual.toarray(), expected.toarray())
+    assert np.allclose(vectorizer.transform(['data learning xyz']).toarray(),
+                       expected_vectorizer.transform(['data learning xyz']).toarray())
+
+
+def test_select_top_k_matches_full_sort():
+    """
+    Memastikan seleksi parsial top-k sama dengan pengurutan penuh.
+    """
+    from ir_logic.indexing import select_top_k
+
+    rng = np.random.default_rng(0)
+    doc_indices = np.arange(1000)
+    scores = rng.random(1000)
+    for top_k in (1, 10, 999, 1000, 5000, None):
+        expected = doc_indices[np.argsort(-scores, kind='stable')]
+        expected = expected[scores[expected] > 0.3][:top_k]
+        actual, actual_scores = select_top_k(doc_indices, scores, top_k=top_k, min_score=0.3)
+        assert np.array_equal(actual, expected)
+        assert np.all(np.diff(actual_scores) <= 0)
+
+
+def test_select_top_k_breaks_ties_by_document_index():
+    """
+    Memastikan skor yang sama di batas top-k dipilih berdasarkan indeks dokumen terkecil,
+    termasuk untuk kandidat yang tidak terurut (seperti gabungan hasil per shard).
+    """
+    from ir_logic.indexing import select_top_k
+
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        n = int(rng.integers(1, 60))
+        doc_indices = rng.permutation(n * 3)[:n]
+        # Skor terkuantisasi agar banyak skor yang sama
+        scores = rng.integers(0, 5, n) / 4
+        top_k = int(rng.integers(1, n + 2))
+        order = np.lexsort((doc_indices, -scores))
+        order = order[scores[order] > 0.01][:top_k]
+        actual, actual_scores = select_top_k(doc_indices, scores, top_k=top_k)
+        assert np.array_equal(actual, doc_indices[order]) and np.array_equal(actual_scores, scores[order])
+
+
+def test_batch_search_matches_single_search(tmp_path):
+    """
+    Memastikan search_documents_batch memberikan hasil yang sama dengan search_documents per query.
+    """
+    test_file = str(tmp_path / 'batch_data.csv')
+    pd.DataFrame({
+        'title': ['A', 'B', 'C', 'D'],
+        'content': [
+            'machine learning for business data',
+            'deep learning and neural networks',
+            'python programming for data science',
+            'statistics and data analysis'
+        ]
+    }).to_csv(test_file, index=False)
+
+    queries = ['data', 'learning networks', 'python', 'quantum']
+    for model_type in ('bow', 'tfidf'):
+        batch = search_documents_batch(test_file, queries, 'content', model_type, language='en', use_spacy=False, index_dir=None)
+        assert [item['query'] for item in batch] == queries
+        for query, item in zip(queries, batch):
+            single = search_documents(test_file, query, 'content', model_type, language='en', use_spacy=False, index_dir=None)
+            assert [(r['original_index'], round(r['score'], 9)) for r in item['results']] == \
+                   [(r['original_index'], round(r['score'], 9)) for r in single['results']]
+
+
+def test_streaming_ingestion_matches_in_memory(tmp_path):
+    """
+    Memastikan mode streaming (baca per potongan) memberikan hasil yang sama dengan
+    pemuatan penuh, dan hanya menyimpan kolom tampilan.
+    """
+    from ir_system import load_index
+
+    data = pd.DataFrame({
+        'title': ['A', 'B', 'C', 'D', 'E'],
+        'content': [
+            'machine learning for business data ' * 10,
+            'deep learning and neural networks',
+            None,
+            'python programming for data science',
+            'statistics and data analysis'
+        ],
+        'extra': [1, 2, 3, 4, 5]
+    })
+    reference_file = str(tmp_path / 'reference.csv')
+    data.to_csv(reference_file, index=False)
+    csv_file = str(tmp_path / 'stream.csv')
+    data.to_csv(csv_file, index=False)
+    json_file = str(tmp_path / 'stream.json')
+    data.to_json(json_file, orient='records', lines=True)
+
+    queries = ['data', 'learning networks', 'quantum']
+    for model_type in ('bow', 'tfidf'):
+        expected = search_documents_batch(reference_file, queries, 'content', model_type, language='en',
+                                          use_spacy=False, index_dir=None)
+        for stream_file in (csv_file, json_file):
+            df, _ = load_index(stream_file, 'content', model_type, language='en', use_spacy=False,
+                               index_dir=str(tmp_path / 'index'), streaming=True, chunk_size=2)
+            assert df.columns.tolist() == ['title', 'content'] and len(df) == len(data)
+            actual = search_documents_batch(stream_file, queries, 'content', model_type, language='en',
+                                            use_spacy=False, index_dir=str(tmp_path / 'index'), streaming=True)
+            for expected_item, actual_item in zip(expected, actual):
+                assert [(r['original_index'], r['title'], r['snippet'], round(r['score'], 6)) for r in actual_item['results']] == \
+                       [(r['original_index'], r['title'], r['snippet'], round(r['score'], 6)) for r in expected_item['results']]
+
+
+def test_live_index_appends_new_rows(tmp_path):
+    """
+    Memastikan indeks live hanya memproses baris yang ditambahkan ke file, dengan hasil
+    yang sama dengan membangun ulang seluruh indeks, dan dibangun ulang jika file ditulis ulang.
+    """
+    from ir_system import load_live_index, update_index
+
+    data = pd.DataFrame({
+        'title': ['A', 'B', 'C', 'D', 'E', 'F'],
+        'content': [
+            'machine learning for business data',
+            'deep learning and neural networks',
+            'python programming for data science',
+            'statistics and data analysis',
+            'quantum data networks',
+            'quantum computing research'
+        ]
+    })
+    def write(filepath, frame, mode):
+        with open(filepath, mode) as f:
+            if filepath.endswith('.csv'):
+                frame.to_csv(f, index=False, header=mode == 'w')
+            else:
+                f.write(frame.to_json(orient='records', lines=True))
+
+    queries = ['data', 'quantum networks', 'learning']
+    options = {'language': 'en', 'use_spacy': False}
+    for live_file in (str(tmp_path / 'live.csv'), str(tmp_path / 'live.json')):
+        for model_type in ('bow', 'tfidf', 'bm25', 'hashing'):
+            write(live_file, data.iloc[:4], 'w')
+            search_documents_batch(live_file, queries, 'content', model_type, index_dir=None, live=True, **options)
+            live = load_live_index(live_file, 'content', model_type, **options)
+            version = live['index'].version
+
+            # Tambahkan baris baru ke akhir file; compact_ratio besar agar tidak langsung digabung
+            live['index'].compact_ratio = 10
+            write(live_file, data.iloc[4:], 'a')
+            assert update_index(live_file, 'content', model_type, **options) == \
+                   {'appended_rows': 2, 'rebuilt': False, 'version': version + 1}
+            assert len(live['df']) == len(data) and live['index'].n_docs == len(data)
+
+            # TF-IDF dan BM25 memakai IDF lama sampai digabung; BoW dan hashing langsung sama
+            if model_type not in ('bow', 'hashing'):
+                live['index'].compact()
+            actual = search_documents_batch(live_file, queries, 'content', model_type, index_dir=None, live=True, **options)
+            expected = search_documents_batch(live_file, queries, 'content', model_type, index_dir=None, **options)
+            for expected_item, actual_item in zip(expected, actual):
+                assert [(r['original_index'], r['title'], round(r['score'], 6)) for r in actual_item['results']] == \
+                       [(r['original_index'], r['title'], round(r['score'], 6)) for r in expected_item['results']]
+
+        # Jika penambahan ke indeks gagal, posisi baca dan DataFrame tidak berubah
+        # sehingga baris yang sama dibaca ulang pada pembaruan berikutnya
+        live = load_live_index(live_file, 'content', 'tfidf', **options)
+        write(live_file, data.iloc[:1], 'a')
+        state, append = live['state'], live['index'].append
+        live['index'].append = lambda documents: 1 / 0
+        try:
+            update_index(live_file, 'content', 'tfidf', **options)
+            assert False, "Pembaruan harus gagal"
+        except ZeroDivisionError:
+            pass
+        live['index'].append = append
+        assert live['state'] == state and len(live['df']) == live['index'].n_docs == len(data)
+        assert update_index(live_file, 'content', 'tfidf', **options)['appended_rows'] == 1
+        assert len(live['df']) == live['index'].n_docs == len(data) + 1
+
+        # Record yang baru ditulis sebagian (termasuk field CSV multi-baris) dibaca setelah lengkap
+        record = data.iloc[1:2].assign(content='quantum\nbusiness, "data"')
+        text = record.to_csv(index=False, header=False) if live_file.endswith('.csv') else record.to_json(orient='records', lines=True)
+        split = text.index('\n') + 1 if live_file.endswith('.csv') else len(text) // 2
+        with open(live_file, 'a') as f:
+            f.write(text[:split])
+        assert update_index(live_file, 'content', 'tfidf', **options)['appended_rows'] == 0
+        with open(live_file, 'a') as f:
+            f.write(text[split:])
+        assert update_index(live_file, 'content', 'tfidf', **options)['appended_rows'] == 1
+        assert live['df']['content'].iloc[-1] == 'quantum\nbusiness, "data"'
+
+        # Menulis ulang file (bukan menambah) membangun ulang indeks live
+        write(live_file, data.iloc[:2], 'w')
+        assert update_index(live_file, 'content', 'tfidf', **options)['rebuilt']
+        assert len(load_live_index(live_file, 'content', 'tfidf', **options)['df']) == 2
+
+
+def test_query_cache_hits_and_invalidation(tmp_path):
+    """
+    Memastikan query berulang diambil dari cache hasil query dengan hasil yang sama,
+    dan cache tidak dipakai setelah indeks berubah.
+    """
+    from ir_logic.caching import query_cache
+
+    data = pd.DataFrame({
+        'title': ['A', 'B', 'C'],
+        'content': ['machine learning for business data', 'deep learning networks', 'data analysis']
+    })
+    csv_file = str(tmp_path / 'queries.csv')
+    data.to_csv(csv_file, index=False)
+    options = {'language': 'en', 'use_spacy': False, 'index_dir': None, 'live': True}
+
+    query_cache.clear()
+    first = search_documents(csv_file, 'data', 'content', 'tfidf', **options)['results']
+    # Bentuk permukaan berbeda, query hasil preprocessing sama
+    first[0]['title'] = 'diubah'
+    second = search_documents(csv_file, 'Data!', 'content', 'tfidf', **options)['results']
+    assert query_cache.stats()['hits'] == 1 and second[0]['title'] != 'diubah'
+    assert search_documents_batch(csv_file, ['data', 'learning'], 'content', 'tfidf', **options)[0]['results'] == second
+    assert query_cache.stats()['hits'] == 2
+
+    # Baris baru menaikkan versi indeks live sehingga hasil lama tidak dipakai
+    pd.DataFrame({'title': ['D'], 'content': ['data data']}).to_csv(csv_file, mode='a', index=False, header=False)
+    third = search_documents(csv_file, 'data', 'content', 'tfidf', **options)['results']
+    assert query_cache.stats()['hits'] == 2 and [r['title'] for r in third][0] == 'D'
+
+
+def test_search_documents_reports_stage_timings(tmp_path):
+    """
+    Memastikan `search_documents` mengembalikan waktu per tahap dan statistik, dan
+    mengirim record yang sama ke sink metrik.
+    """
+    from ir_logic.caching import query_cache
+
+    data = pd.DataFrame({
+        'title': ['A', 'B', 'C'],
+        'content': ['machine learning for business data', 'deep learning networks', 'data analysis']
+    })
+    csv_file = str(tmp_path / 'timings.csv')
+    data.to_csv(csv_file, index=False)
+    records = []
+    options = {'language': 'en', 'use_spacy': False, 'index_dir': None, 'metrics_sink': records.append}
+
+    query_cache.clear()
+    cold = search_documents(csv_file, 'data', 'content', 'tfidf', **options)
+    for name in ('file_read', 'preprocessing', 'vectorization', 'index_build', 'query_preprocessing',
+                 'query_transform', 'scoring', 'top_k', 'formatting', 'metrics', 'total'):
+        assert cold['timings'][name] >= 0
+    assert cold['stats']['cache'] == {'index': 'miss', 'dataset': 'miss', 'corpus': 'miss', 'display_store': 'miss', 'query': 'miss'}
+    assert cold['stats']['n_docs'] == 3 and cold['stats']['nnz'] > 0 and cold['stats']['candidates'] == 2
+
+    warm = search_documents(csv_file, 'data', 'content', 'tfidf', **options)
+    assert 'preprocessing' not in warm['timings'] and 'scoring' not in warm['timings']
+    assert warm['stats']['cache']['index'] == 'hit' and warm['stats']['cache']['query'] == 'hit'
+    assert warm['results'] == cold['results']
+
+    assert [record['timings'] for record in records] == [cold['timings'], warm['timings']]
+    assert records[0]['query'] == 'data' and records[0]['model_type'] == 'tfidf'
+
+
+def test_display_store_matches_dataframe_results(tmp_path):
+    """
+    Memastikan hasil dari `DisplayStore` sama dengan hasil dari DataFrame, dan hasil
+    `ids_only` dapat dilengkapi belakangan dengan `fetch_documents`.
+    """
+    import json
+    from ir_logic.display import DisplayStore, SNIPPET_LENGTH
+    from ir_logic.vectorization import format_results
+    from ir_system import fetch_documents
+
+    data = pd.DataFrame({
+        'title': ['Ringkasan', None, 'Ulasan ü', float('nan'), 7],
+        'content': ['data ' * 60, 'machine learning untuk data bisnis', 'analisis data dan visualisasi ü', 'bisnis data', None]
+    })
+    doc_ids, scores = [2, 0, 1, 3, 4], [0.9, 0.5, 0.25, 0.2, 0.1]
+    store = DisplayStore.from_frame(data, 'content')
+    from_store = format_results(doc_ids, scores, store, 'content')
+    from_frame = format_results(doc_ids, scores, data, 'content')
+    assert from_store == from_frame
+    assert from_store[0] == {'original_index': 2, 'title': 'Ulasan ü', 'snippet': 'analisis data dan visualisasi ü...', 'score': 0.9}
+    assert from_store[1]['snippet'] == data['content'][0][:SNIPPET_LENGTH] + '...'
+    # Judul kosong (None/NaN) menjadi None dan judul bukan string menjadi str, di kedua jalur
+    assert [result['title'] for result in from_store[2:]] == [None, None, '7']
+    assert 'NaN' not in json.dumps(from_frame)
+    assert format_results(doc_ids[:3], scores[:3], None, 'content', ids_only=True) == [
+        {'original_index': 2, 'score': 0.9}, {'original_index': 0, 'score': 0.5}, {'original_index': 1, 'score': 0.25}
+    ]
+
+    csv_file = str(tmp_path / 'display.csv')
+    data.to_csv(csv_file, index=False)
+    options = {'language': 'id', 'use_spacy': False, 'index_dir': None}
+    full = search_documents(csv_file, 'data bisnis', 'content', 'tfidf', **options)['results']
+    ids_only = search_documents(csv_file, 'data bisnis', 'content', 'tfidf', ids_only=True, **options)['results']
+    assert [set(result) for result in ids_only] == [{'original_index', 'score'}] * len(full)
+    fetched = fetch_documents(csv_file, 'content', [result['original_index'] for result in ids_only])
+    assert [{**document, 'score': result['score']} for document, result in zip(fetched, ids_only)] == full
+    # Indeks live membentuk hasil dari DataFrame; judul kosong tetap None seperti DisplayStore
+    live = search_documents(csv_file, 'data bisnis', 'content', 'tfidf', live=True, **options)['results']
+    assert [(r['original_index'], r['title'], r['snippet']) for r in live] == \
+           [(r['original_index'], r['title'], r['snippet']) for r in full]
+    assert None in [r['title'] for r in live]
+
+
+def test_compact_index_matches_full_index():
+    """
+    Memastikan indeks ringkas (float32, kosakata terurut) memberi skor yang sama
+    dengan indeks penuh, dan `CompactVectorizer` setara dengan vectorizer sklearn.
+    """
+    from ir_logic.vectorization import CompactVectorizer, build_scoring_index, compact_index, vectorize_bow
+
+    documents = ['machine learning for business data', 'deep learning networks ünïcode',
+                 'data analysis and business intelligence', 'quantum computing', '']
+    queries = ['learning data', 'BUSINESS intelligence', 'ünïcode networks', 'unknown term', '']
+    for fast_tokenizer in (False, True):
+        counts = vectorize_bow(documents, fast_tokenizer=fast_tokenizer)
+        for model_type in ('bow', 'tfidf', 'bm25'):
+            full = build_scoring_index(documents, model_type, counts=counts)
+            compact = compact_index(full)
+            assert type(compact) is type(full) and compact.doc_matrix is None
+            assert compact.posting_weights.dtype == np.float32 and compact.posting_docs.dtype == np.int32
+            assert list(compact.vectorizer.get_feature_names_out()) == list(full.vectorizer.get_feature_names_out())
+            assert abs(compact.vectorizer.transform(queries) - full.vectorizer.transform(queries)).max() < 1e-6
+            for query in queries:
+                expected_docs, expected_scores = full.score(full.transform(query))
+                actual_docs, actual_scores = compact.score(compact.transform(query))
+                assert list(actual_docs) == list(expected_docs)
+                assert np.allclose(actual_scores, expected_scores, atol=1e-6)
+
+    # Kosakata yang tidak terurut (misalnya dari indeks live) tetap dipetakan ke kolom yang benar
+    vectorizer = CompactVectorizer(['zeta', 'alpha', 'mu'])
+    assert [vectorizer.lookup(term) for term in ('alpha', 'mu', 'zeta', 'beta')] == [1, 2, 0, -1]
+    assert list(vectorizer.get_feature_names_out()) == ['zeta', 'alpha', 'mu']
+    assert vectorizer.transform(['mu zeta mu']).toarray().tolist() == [[1.0, 0.0, 2.0]]
+
+
+def test_vocabulary_pruning(tmp_path):
+    """
+    Memastikan `prune_vocabulary` sama dengan pemangkasan CountVectorizer dan opsi
+    pemangkasan diteruskan dari `search_documents` ke indeks.
+    """
+    from ir_logic.vectorization import prune_vocabulary, vectorize_bow
+
+    documents = ['data data data bisnis analisis', 'data bisnis model', 'data model model jaringan',
+                 'data sistem x1 x1 x1 x1', 'data jaringan saraf saraf']
+    counts = vectorize_bow(documents)
+    for pruning in ({'min_df': 2}, {'max_df': 0.8}, {'min_df': 2, 'max_df': 3}, {'max_features': 3},
+                    {'min_df': 0.3, 'max_features': 2}):
+        vectorizer, matrix = prune_vocabulary(*counts, **pruning)
+        expected_vectorizer, expected_matrix = vectorize_bow(documents, **pruning)
+        assert vectorizer.vocabulary_ == expected_vectorizer.vocabulary_, pruning
+        assert (matrix != expected_matrix).nnz == 0
+    try:
+        prune_vocabulary(*counts, min_df=10)
+        assert False, "Pemangkasan yang membuang semua term harus gagal"
+    except ValueError:
+        pass
+
+    csv_file = str(tmp_path / 'pruning.csv')
+    pd.DataFrame({'title': [f'D{i}' for i in range(len(documents))], 'content': documents}).to_csv(csv_file, index=False)
+    options = {'language': 'en', 'use_spacy': False, 'apply_stemming': False, 'index_dir': None}
+    full = search_documents(csv_file, 'data model jaringan', 'content', 'tfidf', **options)
+    pruned = search_documents(csv_file, 'data model jaringan', 'content', 'tfidf', min_df=2, max_df=0.9, **options)
+    assert pruned['stats']['n_terms'] == 3 < full['stats']['n_terms']
+    assert pruned['stats']['nnz'] < full['stats']['nnz']
+    assert 0 < pruned['stats']['index_bytes'] < full['stats']['index_bytes']
+    # Term 'data' (ada di semua dokumen) dibuang oleh max_df, sehingga dokumen tanpa term lain tidak ditemukan
+    assert {r['original_index'] for r in pruned['results']} == {1, 2, 4}
+    try:
+        search_documents(csv_file, 'data', 'content', 'tfidf', live=True, min_df=2, **options)
+        assert False, "Pemangkasan pada indeks live harus gagal"
+    except ValueError:
+        pass
+
+
+def test_hashing_index(tmp_path):
+    """
+    Memastikan indeks hashing sama saat dibangun dari teks, dari matriks BoW, secara
+    paralel, atau bertahap dengan `append`, dan dapat dipakai dari `search_documents`.
+    """
+    from ir_logic.hashing import HashingIndex, hash_documents
+    from ir_logic.vectorization import vectorize_bow
+
+    documents = ['machine learning for business data', 'deep learning networks', 'data analysis and business',
+                 'quantum computing', '', 'business data networks data'] * 5
+    queries = ['learning data', 'business networks', 'unknown term', '']
+    # Sedikit bucket agar tabrakan hash ikut diuji
+    for fast_tokenizer in (False, True):
+        full = HashingIndex.from_documents(documents, n_buckets=64, fast_tokenizer=fast_tokenizer)
+        from_counts = HashingIndex.from_counts(*vectorize_bow(documents, fast_tokenizer=fast_tokenizer), n_buckets=64)
+        parallel = hash_documents(documents, 64, fast_tokenizer, n_jobs=2, chunk_size=7, min_parallel_size=1)
+        assert (parallel != hash_documents(documents, 64, fast_tokenizer)).nnz == 0
+        incremental = HashingIndex.from_documents(documents[:20], n_buckets=64, fast_tokenizer=fast_tokenizer)
+        incremental.compact_ratio = 10
+        incremental.append(documents[20:25])
+        incremental.append(documents[25:])
+        assert len(incremental._segments) == 2 and incremental.n_docs == full.n_docs == len(documents)
+
+        for index in (from_counts, incremental):
+            assert list(index.doc_freq) == list(full.doc_freq)
+            for query in queries:
+                expected_docs, expected_scores = full.score(full.transform(query))
+                actual_docs, actual_scores = index.score(index.transform(query))
+                assert list(actual_docs) == list(expected_docs)
+                assert np.allclose(actual_scores, expected_scores)
+            assert abs(index.score_many(index.transform_many(queries)) -
+                       full.score_many(full.transform_many(queries))).max() < 1e-6
+        incremental.compact()
+        assert len(incremental._segments) == 1
+        assert abs(incremental.score_many(incremental.transform_many(queries)) -
+                   full.score_many(full.transform_many(queries))).max() < 1e-6
+
+    csv_file = str(tmp_path / 'hashing.csv')
+    pd.DataFrame({'title': [f'D{i}' for i in range(6)], 'content': documents[:6]}).to_csv(csv_file, index=False)
+    options = {'language': 'en', 'use_spacy': False, 'index_dir': str(tmp_path / 'index')}
+    output = search_documents(csv_file, 'business data', 'content', 'hashing', n_buckets=2 ** 12, **options)
+    assert output['stats']['n_terms'] == 2 ** 12
+    assert [r['original_index'] for r in output['results']][:1] == [5]
+    assert {r['original_index'] for r in output['results']} == {0, 2, 5}
+    batch = search_documents_batch(csv_file, ['business data'], 'content', 'hashing', n_buckets=2 ** 12, **options)
+    assert batch[0]['results'] == output['results']
+    try:
+        search_documents(csv_file, 'data', 'content', 'hashing', min_df=2, **options)
+        assert False, "Pemangkasan pada indeks hashing harus gagal"
+    except ValueError:
+        pass
+
+
+def test_sharded_index_matches_single_index(tmp_path):
+    """
+    Memastikan indeks ber-shard memberi skor dan top-k yang sama dengan indeks tunggal,
+    baik per query maupun batch, dan dapat dipakai dari `search_documents`.
+    """
+    from ir_logic.indexing import ShardedIndex, select_top_k
+    from ir_logic.vectorization import build_scoring_index, compact_index, vectorize_bow
+
+    words = ['data', 'bisnis', 'analisis', 'model', 'jaringan', 'saraf', 'pasar', 'sistem']
+    documents = [' '.join(words[(i * j) % len(words)] for j in range(i % 7)) + f' dok{i}' for i in range(50)]
+    queries = ['data bisnis', 'jaringan saraf model', 'dok7 pasar', 'tidak ada']
+    counts = vectorize_bow(documents)
+    for model_type in ('bow', 'tfidf', 'bm25'):
+        index = compact_index(build_scoring_index(documents, model_type, counts=counts))
+        for n_shards in (1, 3, 8):
+            sharded = ShardedIndex(index, n_shards)
+            assert sharded.n_shards == n_shards and sharded.nnz == index.nnz
+            for query in queries:
+                expected_docs, expected_scores = index.score(index.transform(query))
+                actual_docs, actual_scores = sharded.score(sharded.transform(query))
+                assert list(actual_docs) == list(expected_docs) and np.array_equal(actual_scores, expected_scores)
+                doc_indices, scores, n_candidates = sharded.score_top_k(sharded.transform(query), top_k=None, min_score=0.0)
+                assert n_candidates == len(expected_docs)
+                expected = select_top_k(expected_docs, expected_scores, top_k=None, min_score=0.0)
+                actual = select_top_k(doc_indices, scores, top_k=None, min_score=0.0)
+                assert list(actual[0]) == list(expected[0]) and np.array_equal(actual[1], expected[1])
+                # Top-k per shard memilih skor yang sama di batas k seperti indeks tunggal
+                doc_indices, scores, _ = sharded.score_top_k(sharded.transform(query), top_k=3, min_score=0.0)
+                expected = select_top_k(expected_docs, expected_scores, top_k=3, min_score=0.0)
+                actual = select_top_k(doc_indices, scores, top_k=3, min_score=0.0)
+                assert list(actual[0]) == list(expected[0]) and np.array_equal(actual[1], expected[1])
+            assert abs(sharded.score_many(sharded.transform_many(queries)) -
+                       index.score_many(index.transform_many(queries))).max() == 0
+
+    csv_file = str(tmp_path / 'sharded.csv')
+    pd.DataFrame({'title': [f'D{i}' for i in range(len(documents))], 'content': documents}).to_csv(csv_file, index=False)
+    options = {'language': 'en', 'use_spacy': False, 'index_dir': None, 'top_k': None}
+    single = search_documents(csv_file, 'data bisnis', 'content', 'tfidf', **options)
+    sharded = search_documents(csv_file, 'data bisnis', 'content', 'tfidf', n_shards=4, **options)
+    assert sharded['results'] == single['results'] and sharded['stats']['nnz'] == single['stats']['nnz']
+    assert search_documents_batch(csv_file, ['data bisnis'], 'content', 'tfidf', n_shards=4, **options)[0]['results'] == single['results']
+    try:
+        search_documents(csv_file, 'data', 'content', 'tfidf', live=True, n_shards=2, **options)
+        assert False, "Sharding pada indeks live harus gagal"
+    except ValueError:
+        pass
+
+
+def test_search_service(tmp_path):
+    """
+    Memastikan layanan HTTP mengembalikan hasil yang sama dengan `search_documents`,
+    melayani permintaan bersamaan, dan menolak dataset di luar direktori data.
+    """
+    import asyncio
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from ir_service import SearchService, ServiceClient, ServiceError
+
+    pd.DataFrame({
+        'title': ['A', 'B', 'C', 'D'],
+        'content': ['machine learning for business data', 'deep learning networks',
+                    'data analysis and business', 'quantum computing']
+    }).to_csv(str(tmp_path / 'service.csv'), index=False)
+    options = {'search_column': 'content', 'language': 'en', 'use_spacy': False, 'model_type': 'tfidf'}
+    service = SearchService(str(tmp_path), options, index_dir=None, workers=2, default_dataset='service.csv')
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(service.warm(['service.csv']))
+    server = loop.run_until_complete(service.start('127.0.0.1', 0))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        client = ServiceClient(f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        assert client.health()['status'] == 'ok'
+
+        expected = search_documents(str(tmp_path / 'service.csv'), 'business data', index_dir=None, **options)
+        output = client.search('business data')
+        assert output['results'] == expected['results'] and output['stats']['cache']['index'] == 'hit'
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outputs = list(executor.map(lambda query: client.search(query, top_k=2)['results'], ['data learning'] * 16))
+        assert all(results == outputs[0] for results in outputs) and len(outputs[0]) == 2
+
+        batch = client.search_batch(['business data', 'quantum'], dataset='service.csv')
+        assert batch[0]['results'] == expected['results'] and batch[1]['results'][0]['title'] == 'D'
+        assert client.fetch_documents([3])[0]['title'] == 'D'
+
+        for request, status in ((dict(dataset='../service.csv'), 404), (dict(model_type='unknown'), 400),
+                                (dict(unknown_option=1), 400)):
+            try:
+                client.search('data', **request)
+                assert False, f"Permintaan {request} harus gagal"
+            except ServiceError as e:
+                assert e.status == status
+        stats = client.stats()
+        assert stats['requests']['/search']['count'] == 20 and stats['requests']['/search']['errors'] == 3
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        server.close()
+        loop.run_until_complete(server.wait_closed())
+        loop.close()
+        service.close()
+
+
+def test_concurrent_cold_index_loads(tmp_path):
+    """
+    Memastikan permintaan bersamaan pada indeks yang belum dimuat hanya membangun indeks
+    satu kali dan tidak gagal, termasuk beberapa penulis indeks dengan kunci yang sama.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from ir_logic.caching import cache, query_cache
+    from ir_logic.preprocessing import stem_cache
+    from ir_logic.storage import read_index, read_stem_table, write_index
+    from ir_logic.vectorization import build_scoring_index
+
+    csv_file = str(tmp_path / 'cold.csv')
+    pd.DataFrame({
+        'title': ['A', 'B', 'C', 'D'],
+        'content': ['machine learning for business data', 'deep learning networks',
+                    'data analysis and business', 'quantum computing']
+    }).to_csv(csv_file, index=False)
+    options = {'language': 'en', 'use_spacy': False, 'index_dir': str(tmp_path / 'index_store')}
+    stem_cache.preload({'unrelated': 'unrel'})
+
+    for model_type in ('tfidf', 'bm25'):
+        cache.clear()
+        query_cache.clear()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            outputs = list(executor.map(lambda query: search_documents(csv_file, query, 'content', model_type, **options),
+                                        ['business data'] * 8))
+        assert all(output['results'] == outputs[0]['results'] for output in outputs)
+        # Hanya satu permintaan yang membangun indeks; sisanya memakai hasil dari cache
+        assert sum(output['stats']['cache']['index'] == 'miss' and 'index_build' in output['timings']
+                   for output in outputs) == 1
+    # Memo stemming yang disimpan hanya berisi stem dari kosakata indeks tersebut
+    for key in os.listdir(options['index_dir']):
+        with open(os.path.join(options['index_dir'], key, 'vocabulary.txt'), encoding='utf-8') as f:
+            vocabulary = set(f.read().split('\n'))
+        stem_table = read_stem_table(options['index_dir'], key)
+        assert stem_table and set(stem_table.values()) <= vocabulary
+
+    documents = ['machine learning data', 'deep learning neural network', 'bisnis data analisis']
+    index = build_scoring_index(documents, 'tfidf')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: write_index(str(tmp_path / 'shared'), 'same-key', index, documents), range(16)))
+    assert read_index(str(tmp_path / 'shared'), 'same-key')[1] == documents
+    assert os.listdir(str(tmp_path / 'shared')) == ['same-key']
+
+
+def test_index_store_roundtrip(tmp_path, monkeypatch):
+    """
+    Memastikan indeks yang disimpan ke disk memberikan skor yang sama setelah dibuka kembali,
+    dan direktori indeks aplikasi dibaca dari `IR_INDEX_DIR` saat dipanggil.
+    """
+    import json
+    from ir_logic.storage import default_index_dir, write_index, read_index
+    from ir_logic.vectorization import build_scoring_index
+
+    # Teks hasil preprocessing dapat berisi baris baru (misalnya lemma spaCy untuk spasi)
+    documents = ['machine learning data', 'deep learning\nneural network', 'bisnis data analisis', '', '\n']
+    for model_type in ('bow', 'tfidf'):
+        index = build_scoring_index(documents, model_type)
+        write_index(str(tmp_path), model_type, index, documents)
+        loaded, processed_text = read_index(str(tmp_path), model_type)
+
+        assert processed_text == documents
+        for query in ['data learning', 'neural', 'tidak ada']:
+            expected = index.score(index.transform(query))
+            actual = loaded.score(loaded.transform(query))
+            assert np.array_equal(expected[0], actual[0])
+            assert np.allclose(expected[1], actual[1])
+
+    assert read_index(str(tmp_path), 'tidak-ada') is None
+    # Teks yang jumlahnya tidak sama dengan jumlah dokumen tidak dipakai
+    with open(str(tmp_path / 'tfidf' / 'processed_text.json'), 'w', encoding='utf-8') as f:
+        json.dump(documents + ['ekstra'], f)
+    assert read_index(str(tmp_path), 'tfidf') is None
+
+    monkeypatch.setenv('IR_INDEX_DIR', str(tmp_path))
+    assert default_index_dir() == str(tmp_path)
+    monkeypatch.setenv('IR_INDEX_DIR', '')
+    assert default_index_dir() is None
+    monkeypatch.delenv('IR_INDEX_DIR')
+    assert default_index_dir() == os.path.join(os.getcwd(), 'index_store')
+
+
+def test_stem_cache_matches_porter_stemmer():
+    """
+    Memastikan memo stemming memberikan hasil yang sama dengan PorterStemmer
+    dan mencatat hit untuk token yang berulang.
+    """
+    from nltk.stem import PorterStemmer
+    from ir_logic.preprocessing import TokenNormalizationCache
+
+    stemmer = PorterStemmer()
+    memo = TokenNormalizationCache(stemmer.stem, max_size=3)
+    tokens = ['running', 'runs', 'running', 'studies', 'learning', 'running', 'learning']
+
+    assert memo.normalize_tokens(tokens) == [stemmer.stem(t) for t in tokens]
+    stats = memo.stats()
+    assert stats['size'] == 3 and stats['lookups'] == len(tokens)
+    assert stats['misses'] == 5 and stats['hits'] == 2
+    assert memo.snapshot() == memo.table and memo.snapshot() is not memo.table
+    assert memo.snapshot({'run'}) == {'running': 'run', 'runs': 'run'}
+
+
+def test_preprocessor_fast_path_matches_details():
+    """
+    Memastikan jalur cepat Preprocessor menghasilkan teks akhir yang sama dengan
+    jalur detail, dan process_many mengalirkan hasil sesuai urutan input.
+    """
+    import types
+    from ir_logic.preprocessing import Preprocessor
+
+    texts = ['<p>Machine Learning untuk analisis data!</p>', 'The models are running fast.', None, '', 'dan yang']
+    for language in ('id', 'en'):
+        for apply_stemming in (True, False):
+            preprocessor = Preprocessor(language=language, use_spacy=False, apply_stemming=apply_stemming)
+            expected = [preprocessor.process(t, return_details=True)['final_text'] for t in texts]
+            assert [preprocessor.process(t) for t in texts] == expected
+
+            streamed = preprocessor.process_many(iter(texts))
+            assert isinstance(streamed, types.GeneratorType)
+            assert list(streamed) == expected
+
+
+def test_fast_tokenizer_matches_word_tokenize():
+    """
+    Memastikan tokenizer cepat menghasilkan token yang sama dengan word_tokenize NLTK
+    untuk teks bersih, dan analyzer cepat vectorizer sama dengan pola default sklearn.
+    """
+    import re
+    from nltk.tokenize import word_tokenize
+    from sklearn.feature_extraction.text import CountVectorizer
+    from ir_logic.preprocessing import Preprocessor, fast_tokenize
+    from ir_logic.vectorization import fast_word_tokens
+
+    texts = [
+        'Artificial intelligence adalah teknologi yang memungkinkan mesin untuk belajar.',
+        'Data science menggabungkan statistik, programming, dan domain knowledge!',
+        "I cannot believe we're gonna win, gimme a sec; you WANNA go? Lemme know, gotta run. wanna",
+        'cannotx dcannot x_cannot Cannot2 snake_case 12_3 ünïcödé straße ２３ a\u00a0b\tc\nd',
+        '<p>HTML <b>tag</b> &amp; 100% angka 3.14</p>', '', '   '
+    ]
+    preprocessor = Preprocessor(language='en', use_spacy=False)
+    for text in texts:
+        cleaned = preprocessor.clean(text)
+        assert fast_tokenize(cleaned) == word_tokenize(cleaned, preserve_line=True)
+
+    for language in ('id', 'en'):
+        nltk_mode = Preprocessor(language=language, use_spacy=False, tokenizer='nltk')
+        fast_mode = Preprocessor(language=language, use_spacy=False, tokenizer='fast')
+        for text in texts:
+            assert fast_mode.process(text, return_details=True) == nltk_mode.process(text, return_details=True)
+
+    documents = [Preprocessor(use_spacy=False).process(t) for t in texts] + ['x y ab c-d e.f', 'A Bc']
+    analyzer = CountVectorizer().build_analyzer()
+    for document in documents:
+        assert fast_word_tokens(document.lower()) == analyzer(document)
+    assert re.search(r'[^\w\s]', documents[-2])
+
+
+def test_preprocess_corpus_parallel_matches_serial(tmp_path):
+    """
+    Memastikan jalur paralel `preprocess_corpus` (process pool) memberikan hasil yang sama
+    dengan jalur serial, dan `n_jobs` dapat diteruskan dari `search_documents`.
+    """
+    from ir_logic.preprocessing import preprocess_corpus, stem_cache
+
+    texts = ['<p>Machine Learning untuk analisis data!</p>', 'The models are running fast.', None, '',
+             'Deep learning networks and studies', 'Sistem informasi dan basis data'] * 3
+    for language in ('id', 'en'):
+        for return_details in (False, True):
+            expected = preprocess_corpus(texts, language=language, use_spacy=False, return_details=return_details, n_jobs=1)
+            lookups = stem_cache.lookups
+            actual = preprocess_corpus(texts, language=language, use_spacy=False, return_details=return_details,
+                                       n_jobs=2, min_parallel_size=1, chunk_size=4)
+            assert actual == expected
+            # Statistik memo stemming dari worker digabung ke proses induk
+            assert stem_cache.lookups > lookups
+
+    csv_file = str(tmp_path / 'jobs.csv')
+    pd.DataFrame({'title': ['A', 'B'], 'content': ['machine learning data', 'deep learning']}).to_csv(csv_file, index=False)
+    options = {'language': 'en', 'use_spacy': False, 'index_dir': None}
+    single = search_documents(csv_file, 'learning', 'content', 'tfidf', n_jobs=2, **options)['results']
+    live = search_documents_batch(csv_file, ['learning'], 'content', 'tfidf', n_jobs=2, live=True, **options)[0]['results']
+    assert [(r['original_index'], round(r['score'], 6)) for r in single] == \
+           [(r['original_index'], round(r['score'], 6)) for r in live]
+
+
+def test_preprocess_pool_reused_across_calls():
+    """
+    Memastikan satu process pool dari `preprocess_pool` dapat dipakai untuk beberapa
+    pemanggilan `preprocess_corpus` dengan hasil yang sama dengan pemrosesan serial.
+    """
+    from ir_logic.preprocessing import preprocess_corpus, preprocess_pool
+
+    chunks = [['Machine learning untuk analisis data!', None, 'The models are running fast.'] * 3,
+              ['Deep learning networks', '', 'Sistem informasi dan basis data'] * 3]
+    with preprocess_pool(2) as executor:
+        for texts in chunks:
+            expected = preprocess_corpus(texts, language='en', use_spacy=False, n_jobs=1)
+            actual = preprocess_corpus(texts, language='en', use_spacy=False, n_jobs=2, min_parallel_size=1,
+                                       executor=executor)
+            assert actual == expected
+
+
+def test_batch_lemmatization_matches_preprocess_text():
+    """
+    Memastikan lemmatization batch (nlp.pipe) menghasilkan teks yang sama per baris
+    dengan preprocess_text, dan komponen yang tidak dibutuhkan dimatikan.
+    """
+    import spacy
+    from spacy.language import Language
+    from ir_logic import preprocessing
+
+    calls = {'extra': 0}
+
+    @Language.component('test_suffix_lemmatizer')
+    def suffix_lemmatizer(doc):
+        for token in doc:
+            token.lemma_ = token.text[:-1] if token.text.endswith('s') else token.text
+        return doc
+
+    @Language.component('test_extra_component')
+    def extra_component(doc):
+        calls['extra'] += 1
+        return doc
+
+    nlp = spacy.blank('en')
+    nlp.add_pipe('test_extra_component')
+    nlp.add_pipe('test_suffix_lemmatizer', name='lemmatizer')
+
+    texts = ['Cats and dogs are running', 'The <b>models</b> learns patterns!', None, '', 'the of and']
+    original_model = preprocessing.get_nlp('en')
+    preprocessing.nlp_models['en'] = nlp
+    try:
+        for apply_stemming in (True, False):
+            expected = [preprocessing.preprocess_text(t, language='en', apply_stemming=apply_stemming,
+                                                      apply_lemmatization=True, return_details=True)
+                        for t in texts]
+            calls['extra'] = 0
+            actual = preprocessing.preprocess_corpus(texts, language='en', apply_stemming=apply_stemming,
+                                                     apply_lemmatization=True, return_details=True, n_jobs=1)
+            assert actual == expected
+            assert calls['extra'] == 0
+    finally:
+        preprocessing.nlp_models['en'] = original_model
+
+
+def test_lru_cache_evicts_within_budget(tmp_path):
+    """
+    Memastikan cache LRU membuang entri terlama saat anggaran terlampaui
+    dan dapat memuatnya kembali dari tier disk.
+    """
+    from ir_logic.caching import LRUCache, estimate_size
+
+    entry = pd.DataFrame({'text': ['dokumen contoh'] * 100})
+    size = estimate_size({'df': entry})
+    lru = LRUCache(max_bytes=size * 2, disk_dir=str(tmp_path))
+
+    for key in ('a', 'b', 'c'):
+        lru.put(key, {'df': entry.copy()})
+    assert 'a' not in lru and 'b' in lru and 'c' in lru
+    assert lru.current_bytes <= lru.max_bytes
+
+    # Entri 'a' sudah dibuang ke disk dan dapat dimuat kembali
+    assert lru.get('a') is not None
+    assert lru.get('tidak-ada') is None
+    stats = lru.stats()
+    assert stats['evictions'] >= 2 and stats['disk_hits'] == 1 and stats['misses'] == 1
+
+    # Entri yang melebihi anggaran ditahan di memori, bukan di-pickle ke disk
+    big = {'df': pd.concat([entry] * 4, ignore_index=True)}
+    disk_files = sorted(os.listdir(tmp_path))
+    lru.put('besar', big)
+    assert 'besar' in lru and lru.get('besar') is big
+    assert lru.size_of('besar') > lru.max_bytes and lru.stats()['pinned_bytes'] > 0
+    assert sorted(os.listdir(tmp_path)) == disk_files
+    lru.put('besar-2', {'df': big['df'].copy()})
+    assert 'besar' not in lru and lru.get('besar') is None and 'besar-2' in lru
+
+    # Array memory-map tidak dihitung sebagai memori resident
+    path = tmp_path / 'array.npy'
+    np.save(path, np.arange(10000, dtype=np.float64))
+    mapped = np.load(path, mmap_mode='r')
+    assert estimate_size(mapped) == 0 and estimate_size(mapped[10:]) == 0
+    assert estimate_size(np.array(mapped)) == mapped.nbytes
+
+
 if __name__ == "__main__":
     success = test_ir_system()
     if success: